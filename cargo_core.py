@@ -0,0 +1,3553 @@
+import csv
+import gzip
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, deque
+from contextlib import contextmanager
+from itertools import dropwhile, islice, product
+from operator import itemgetter
+
+##############################################################################
+#                           GENEL AYARLAR
+##############################################################################
+
+# Gönderim geçmişi ekranında bir sayfada gösterilen gönderi sayısı
+HISTORY_PAGE_SIZE = 50
+
+# İşlem geçmişinin bellekte tutulan son kayıt sayısı (ring buffer) ve
+# diske sıkıştırılmış segment olarak yazılan kayıt grubu boyu
+HISTORY_CAPACITY = 1000
+HISTORY_SPILL_CHUNK = 1000
+
+# Toplu yüklemede bir seferde yapılara aktarılan satır sayısı
+LOAD_BATCH_SIZE = 10000
+# Toplu yükleme raporunda örnek olarak saklanan en fazla hata sayısı
+MAX_LOAD_ERRORS = 20
+
+# Kalıcı depolama dizini ve fsync politikaları
+DATA_DIR = "kargo_data"
+FSYNC_ALWAYS = "always"      # her kayıtta fsync (en güvenli, en yavaş)
+FSYNC_INTERVAL = "interval"  # en fazla fsync_interval saniyede bir fsync
+FSYNC_NEVER = "never"        # yalnızca işletim sistemine flush
+# Log bu kadar kayda ulaşınca otomatik snapshot alınıp log kısaltılır
+SNAPSHOT_EVERY = 50000
+# Group commit: bir fsync'te en fazla kaç kayıt ve eşzamanlı yazarlar için bekleme penceresi (sn)
+GROUP_COMMIT_SIZE = 512
+GROUP_COMMIT_WINDOW = 0.002
+# p99 hesabı için saklanan son commit gecikmesi sayısı
+LATENCY_SAMPLES = 10000
+
+# En uzun / en kısa teslimat sorguları için sürekli güncel tutulan kayıt sayısı (K üst sınırı)
+TOPK_CAPACITY = 1000
+
+# Teslim süresi tahmini: güzergah, müşteri ve genel ortalama için dikkate alınan son teslimat sayısı
+PREDICTION_WINDOW = 100
+PREDICT_ROUTE = "route"        # aynı çıkış -> varış şubesi çiftinin geçmişi
+PREDICT_CUSTOMER = "customer"  # müşterinin geçmişi
+PREDICT_ALL = "all"            # tüm teslimatlar
+
+# Müşteri ismi aramasında döndürülen en fazla sonuç sayısı
+NAME_SEARCH_LIMIT = 50
+# İsim index'inde bir kelimenin müşteri ID listesinde bloktaki hedef ID sayısı
+POSTING_BLOCK = 512
+# Müşteri gönderim geçmişinde bir bloktaki hedef kayıt sayısı (blok 2 katına ulaşınca bölünür)
+HISTORY_BLOCK = 512
+# İsme göre sıralı müşteri görünümünde bir bloktaki hedef kayıt sayısı (blok 2 katına ulaşınca bölünür)
+NAME_ORDER_BLOCK = 512
+
+# Türk alfabesi sırası (q, w, x yabancı isimler için Latin alfabesindeki yerlerinde)
+TURKISH_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+# Sıralama anahtarında her harf alfabe sırasını koruyan bir özel kullanım alanı karakterine
+# çevrilir; harf olmayan karakterler (boşluk, rakam, tire) böylece harflerden önce gelir.
+# Şapkalı harfler (â, î, û) şapkasız karşılıklarıyla aynı sıradadır.
+TURKISH_COLLATION = {ord(ch): 0xE000 + i for i, ch in enumerate(TURKISH_ALPHABET)}
+TURKISH_COLLATION.update({ord("â"): 0xE000, ord("î"): 0xE000 + TURKISH_ALPHABET.index("i"),
+                          ord("û"): 0xE000 + TURKISH_ALPHABET.index("u")})
+
+# Teslim edilmemiş kargoları sıralama yöntemleri:
+# - SORT_CACHED: son sıralı liste öncelik kuyruğunun sürüm sayacıyla saklanır;
+#   kuyruk (dolayısıyla teslim edilmemiş kargolar) değişmediyse yeniden sıralanmaz
+# - SORT_INPLACE: liste yerinde, ek dilimleme olmadan sıralanır (list.sort, kararlı)
+# - SORT_REFERENCE: her seviyede dilim kopyalayan özyinelemeli merge sort (karşılaştırma için)
+SORT_CACHED = "cached"
+SORT_INPLACE = "inplace"
+SORT_REFERENCE = "merge"
+
+# Kargo durumlarının görünen adları; PQ'daki kargolar STATE_PROCESSING ile listelenir
+STATE_UNDELIVERED = "Teslim Edilmedi"
+STATE_DELIVERED = "Teslim Edildi"
+STATE_REMOVED = "Silindi"
+STATE_PROCESSING = "İşleme Alındı"
+
+# Rota ağı: yeni şehrin ebeveynine varsayılan uzaklığı (saat) ve en kısa yol yöntemleri
+# - ROUTE_DIJKSTRA: ikili heap ile Dijkstra
+# - ROUTE_ASTAR: A*; konumu bilinen şubelerde büyük daire mesafesi / ROUTE_MAX_SPEED_KMH
+#   alt sınırıyla hedefe yönelir (hiçbir yol bu hızdan hızlı olmamalı)
+DEFAULT_ROUTE_HOURS = 6
+ROUTE_MAX_SPEED_KMH = 120
+EARTH_RADIUS_KM = 6371.0
+ROUTE_DIJKSTRA = "dijkstra"
+ROUTE_ASTAR = "astar"
+# ROUTE_CACHED: rota önbelleğinden (bkz. RouteCache); önbellekte en fazla ROUTE_CACHE_SOURCES
+# kaynak şubenin tablosu tutulur, ROUTE_CACHE_PATCH_LIMIT'ten fazla yamalı şehir birikince
+# LCA tabloları yeniden kurulur
+ROUTE_CACHED = "cached"
+ROUTE_CACHE_SOURCES = 256
+ROUTE_CACHE_PATCH_LIMIT = 256
+
+# Kargo sütunları (array "q") ve müşteri ID'leri için geçerli tamsayı aralığı
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
+# ShipmentStore satır numaralarını tutan array'lerin tipi (32 bit; -1/-2 işaretleri için işaretli)
+# ve depodaki en fazla satır sayısı
+ROW_TYPECODE = "i"
+MAX_ROWS = 2 ** 31 - 1
+
+def is_int64(value):
+    """
+    Değer array("q") sütununa yazılabilen bir tamsayı mı (bool ve float kabul edilmez)
+    """
+    return type(value) is int and INT64_MIN <= value <= INT64_MAX
+
+def is_route_hours(hours):
+    """
+    Değer geçerli bir yol süresi mi: sonlu ve negatif olmayan sayı (NaN ve sonsuz kabul edilmez)
+    """
+    try:
+        return math.isfinite(hours) and hours >= 0
+    except (TypeError, OverflowError):
+        return False
+
+##############################################################################
+#                           VERİ YAPISI SINIFLARI
+##############################################################################
+
+class ShipmentState:
+    """
+    Kargo durum makinesi. Durumlar tamsayı kodlarıdır (ShipmentStore.states sütununda bir bayt);
+    metin karşılaştırması yapılmaz. Kargo UNDELIVERED ya da DELIVERED olarak eklenir,
+    geçerli geçişler yalnızca TRANSITIONS'ta listelenenlerdir:
+    UNDELIVERED -> DELIVERED (teslimat), UNDELIVERED -> REMOVED (temizleme).
+    REMOVED: ID index'inde olmayan (temizlenmiş ya da yalnızca müşteri geçmişinde kalan) satır.
+    """
+    UNDELIVERED = 0
+    DELIVERED = 1
+    REMOVED = 2
+    ALL = (UNDELIVERED, DELIVERED, REMOVED)
+    LABELS = (STATE_UNDELIVERED, STATE_DELIVERED, STATE_REMOVED)
+    INITIAL = (UNDELIVERED, DELIVERED)
+    # Kullanıcı girdisinde kabul edilen durum adları
+    INPUT_NAMES = (
+        (STATE_UNDELIVERED, UNDELIVERED),
+        (STATE_DELIVERED, DELIVERED),
+        (STATE_PROCESSING, UNDELIVERED),
+    )
+    # Sorgularda kabul edilen durum adları (temizlenmiş kargolar dahil)
+    QUERY_NAMES = INPUT_NAMES + ((STATE_REMOVED, REMOVED),)
+    TRANSITIONS = {
+        UNDELIVERED: (DELIVERED, REMOVED),
+        DELIVERED: (),
+        REMOVED: (),
+    }
+
+    @staticmethod
+    def label(state):
+        return ShipmentState.LABELS[state]
+
+    @staticmethod
+    def can_transition(current, new):
+        return new in ShipmentState.TRANSITIONS[current]
+
+def parse_shipment_state(text, names=ShipmentState.INPUT_NAMES):
+    """
+    Kullanıcının girdiği durum metnini başlangıç durumu koduna çevirir; büyük/küçük harf ve
+    fazla boşluk önemsizdir, STATE_PROCESSING teslim edilmemiş sayılır. Tanınmazsa None.
+    Sorgular için names=ShipmentState.QUERY_NAMES verilir.
+    """
+    folded = " ".join(turkish_fold(str(text)).split())
+    for name, state in names:
+        if folded == turkish_fold(name):
+            return state
+    return None
+
+def stored_shipment_state(status):
+    """
+    Kayıtlı (log/snapshot) durum metninin durumu: yalnızca tam olarak STATE_DELIVERED
+    teslim edilmiş sayılır. Eski kayıtların yeniden oynatılması bu kurala dayanır.
+    """
+    return ShipmentState.DELIVERED if status == STATE_DELIVERED else ShipmentState.UNDELIVERED
+
+class ShipmentIdIndex:
+    """
+    shipment_id -> satır eşlemesi için açık adresli (linear probing) hash tablosu.
+    Anahtarlar ve satırlar iki array'de tutulur; dict'teki kayıt başına anahtar/değer int
+    nesneleri ve giriş yükü olmadığından kargo başına 18-36 bayt yer kaplar (8 bayt anahtar,
+    4 bayt satır; bkz. ROW_TYPECODE).
+    Yük faktörü 2/3'ü geçince tablo iki katına büyütülür; silinen yerlere mezar taşı konur.
+    """
+    EMPTY = -1
+    DELETED = -2
+    # Fibonacci hashing çarpanı: ardışık ya da aynı kalanı veren ID'leri tabloya dağıtır
+    MULTIPLIER = 0x9E3779B97F4A7C15
+
+    def __init__(self, capacity=8):
+        self._allocate(capacity)
+        self.size = 0
+
+    def _allocate(self, capacity):
+        self.keys = array("q", [0]) * capacity
+        self.rows = array(ROW_TYPECODE, [self.EMPTY]) * capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.mask = capacity - 1
+        # Dolu + mezar taşlı yuva sayısı
+        self.used = 0
+
+    def __len__(self):
+        return self.size
+
+    def _slot(self, key):
+        return ((key * self.MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    def get(self, key):
+        """
+        Anahtarın satırı; yoksa None (beklenen O(1))
+        """
+        keys = self.keys
+        rows = self.rows
+        i = self._slot(key)
+        while True:
+            row = rows[i]
+            if row == self.EMPTY:
+                return None
+            if row >= 0 and keys[i] == key:
+                return row
+            i = (i + 1) & self.mask
+
+    def set(self, key, row):
+        """
+        Anahtarı satıra eşler; anahtar varsa satırı güncellenir (beklenen O(1))
+        """
+        if (self.used + 1) * 3 > len(self.rows) * 2:
+            self._resize()
+        keys = self.keys
+        rows = self.rows
+        i = self._slot(key)
+        free = None
+        while True:
+            current = rows[i]
+            if current == self.EMPTY:
+                break
+            if current == self.DELETED:
+                if free is None:
+                    free = i
+            elif keys[i] == key:
+                rows[i] = row
+                return
+            i = (i + 1) & self.mask
+        if free is None:
+            free = i
+            self.used += 1
+        keys[free] = key
+        rows[free] = row
+        self.size += 1
+
+    def pop(self, key):
+        """
+        Anahtarı çıkarıp satırını döndürür; yoksa None
+        """
+        keys = self.keys
+        rows = self.rows
+        i = self._slot(key)
+        while True:
+            row = rows[i]
+            if row == self.EMPTY:
+                return None
+            if row >= 0 and keys[i] == key:
+                rows[i] = self.DELETED
+                self.size -= 1
+                return row
+            i = (i + 1) & self.mask
+
+    def _resize(self):
+        """
+        Canlı kayıtları yeni tabloya taşır (O(n)); tablo çoğunlukla mezar taşıysa boyutu korunur.
+        """
+        old_keys = self.keys
+        old_rows = self.rows
+        capacity = len(old_rows)
+        if (self.size + 1) * 3 > capacity:
+            capacity *= 2
+        self._allocate(capacity)
+        self.size = 0
+        for key, row in zip(old_keys, old_rows):
+            if row >= 0:
+                self.set(key, row)
+
+class ShipmentStore:
+    """
+    Tüm kargoların tek kopyasını tutan sütun bazlı (columnar) kayıt deposu.
+    Her kargo bir satırdır: ID, tarih, teslim süresi ve müşteri ID'si tamsayı array'lerinde,
+    durum metni tekil metin tablosunda bir kod olarak, güncel durum (ShipmentState) ise bir
+    bayt olarak tutulur.
+    Müşteri geçmişi, son 5 gönderi ve teslim edilmiş index kargonun kendisini değil satır
+    numarasını saklar; (ID, tarih, durum, süre) tuple'ları yalnızca sorgu sonucunda üretilir.
+    Satırlar silinmez: temizlenen kargolar müşteri geçmişinde görünmeye devam eder.
+    Her durumun satırları next_rows/prev_rows sütunlarıyla çift yönlü bir listeye bağlıdır ve
+    durum başına sayaç tutulur: "X durumunda kaç kargo var" O(1), "X durumundakiler" O(k).
+    """
+    def __init__(self):
+        self.ids = array("q")
+        self.dates = array("q")
+        self.delivery_times = array("q")
+        self.customer_ids = array("q")
+        # satır -> (çıkış şubesi, varış şubesi); yalnızca rotası girilmiş kargolar için (seyrek),
+        # rotasız kargo bu sütunlar için yer kaplamaz
+        self.routes = {}
+        # Kargo eklenirken girilen durum metninin kodu (geçmişte bu metin gösterilir)
+        self.statuses = array("H")
+        self.states = bytearray()
+        # Teslim süresi girilmeyip tahminle atanan kargolarda 1 (tahmin ortalamalarına katılmazlar)
+        self.predicted = bytearray()
+        self.status_texts = []
+        self.status_codes = {}
+        # shipment_id -> satır; yalnızca kayıtlı (temizlenmemiş) kargolar (O(1) erişim)
+        self.index = ShipmentIdIndex()
+        # Durum listeleri: satırın listedeki komşuları (-1: yok), durum başına baş/son ve sayaç
+        self.next_rows = array(ROW_TYPECODE)
+        self.prev_rows = array(ROW_TYPECODE)
+        self.heads = [-1] * len(ShipmentState.ALL)
+        self.tails = [-1] * len(ShipmentState.ALL)
+        self.counts = [0] * len(ShipmentState.ALL)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, shipment_id):
+        return self.index.get(shipment_id) is not None
+
+    def status_code(self, status):
+        """
+        Durum metnini tekil tablodaki koduna çevirir; ilk kez görülen metin tabloya eklenir.
+        """
+        code = self.status_codes.get(status)
+        if code is None:
+            code = self.status_codes[status] = len(self.status_texts)
+            self.status_texts.append(status)
+        return code
+
+    @staticmethod
+    def fits(shipment_id, date, delivery_time, customer_id):
+        """
+        Alanlar array sütunlarına yazılabilir mi (sayılar int64 aralığında olmalı).
+        Çağıranlar depoya dokunmadan önce bununla doğrular.
+        """
+        return all(is_int64(value) for value in (shipment_id, date, delivery_time, customer_id))
+
+    def add(self, shipment_id, date, status, delivery_time, customer_id, state,
+            origin_id=None, destination_id=None, predicted=False):
+        """
+        Yeni satır ekler ve satır numarasını döndürür (O(1) amortize).
+        state REMOVED değilse kargo ID index'ine alınır. Alanlar sütunlara sığmıyorsa
+        hiçbir sütun değiştirilmeden ValueError fırlatılır (bkz. fits); aksi halde sütunlar
+        farklı uzunlukta kalır.
+        """
+        if not self.fits(shipment_id, date, delivery_time, customer_id):
+            raise ValueError(f"Kargo alanları int64 aralığı dışında (ID={shipment_id})")
+        if len(self.ids) >= MAX_ROWS:
+            raise ValueError("Kargo deposu satır sınırına ulaştı")
+        row = len(self.ids)
+        self.ids.append(shipment_id)
+        self.dates.append(date)
+        self.delivery_times.append(delivery_time)
+        self.customer_ids.append(customer_id)
+        if origin_id is not None:
+            self.routes[row] = (origin_id, destination_id)
+        self.statuses.append(self.status_code(status))
+        self.states.append(state)
+        self.predicted.append(predicted)
+        self.next_rows.append(-1)
+        self.prev_rows.append(-1)
+        self._link(row, state)
+        if state != ShipmentState.REMOVED:
+            self.index.set(shipment_id, row)
+        return row
+
+    def _link(self, row, state):
+        """
+        Satırı durum listesinin sonuna bağlar (O(1))
+        """
+        tail = self.tails[state]
+        self.prev_rows[row] = tail
+        self.next_rows[row] = -1
+        if tail == -1:
+            self.heads[state] = row
+        else:
+            self.next_rows[tail] = row
+        self.tails[state] = row
+        self.counts[state] += 1
+
+    def _unlink(self, row, state):
+        """
+        Satırı durum listesinden çıkarır (O(1))
+        """
+        prev, nxt = self.prev_rows[row], self.next_rows[row]
+        if prev == -1:
+            self.heads[state] = nxt
+        else:
+            self.next_rows[prev] = nxt
+        if nxt == -1:
+            self.tails[state] = prev
+        else:
+            self.prev_rows[nxt] = prev
+        self.counts[state] -= 1
+
+    def transition(self, row, state):
+        """
+        Satırı yeni duruma geçirir; ShipmentState.TRANSITIONS'ta olmayan geçişte
+        hiçbir şey değiştirmeden False döner (O(1)).
+        """
+        current = self.states[row]
+        if not ShipmentState.can_transition(current, state):
+            return False
+        self._unlink(row, current)
+        self._link(row, state)
+        self.states[row] = state
+        if state == ShipmentState.REMOVED:
+            self.index.pop(self.ids[row])
+        return True
+
+    def find(self, shipment_id):
+        return self.index.get(shipment_id)
+
+    def state(self, row):
+        return self.states[row]
+
+    def count(self, state):
+        """
+        Güncel durumu state olan kargo sayısı (O(1))
+        """
+        return self.counts[state]
+
+    def iter_state(self, state):
+        """
+        Güncel durumu state olan satırlar, o duruma giriş sırasıyla (generator, O(k))
+        """
+        next_rows = self.next_rows
+        row = self.heads[state]
+        while row != -1:
+            yield row
+            row = next_rows[row]
+
+    def rows_in_state(self, state):
+        return list(self.iter_state(state))
+
+    def registered_rows(self):
+        """
+        ID index'indeki satırları ekleme sırasıyla üretir (generator, O(toplam satır))
+        """
+        removed = ShipmentState.REMOVED
+        for row, state in enumerate(self.states):
+            if state != removed:
+                yield row
+
+    def deliver(self, row):
+        return self.transition(row, ShipmentState.DELIVERED)
+
+    def drop(self, shipment_id):
+        """
+        Kargoyu ID index'inden çıkarır; satırı geçmiş için yerinde kalır.
+        """
+        row = self.index.get(shipment_id)
+        return row is not None and self.transition(row, ShipmentState.REMOVED)
+
+    def route(self, row):
+        """
+        (çıkış şubesi, varış şubesi) ya da kargonun rotası girilmemişse None
+        """
+        return self.routes.get(row)
+
+    def as_created(self, row):
+        """
+        Kargonun eklendiği andaki hali (müşteri geçmişindeki görünümü): (ID, tarih, durum, süre)
+        """
+        return (self.ids[row], self.dates[row], self.status_texts[self.statuses[row]],
+                self.delivery_times[row])
+
+    def shipment(self, row):
+        """
+        Kargonun güncel hali: teslim edildiyse durum STATE_DELIVERED olur.
+        """
+        if self.states[row] == ShipmentState.DELIVERED:
+            return (self.ids[row], self.dates[row], STATE_DELIVERED, self.delivery_times[row])
+        return self.as_created(row)
+
+    def record(self, row):
+        state = STATE_DELIVERED if self.states[row] == ShipmentState.DELIVERED else STATE_UNDELIVERED
+        return ShipmentRecord(self.shipment(row), self.customer_ids[row], state)
+
+class ShipmentHistory:
+    """
+    Müşterinin tarihe göre sıralı gönderi geçmişi. Kargolar ShipmentStore satır numarası
+    olarak, tarihleriyle birlikte paralel array'lerde tutulur (kargo başına 12 bayt).
+    Array'ler en fazla 2 * block_size uzunluğunda sıralı bloklara bölünür; maxes her bloğun
+    son tarihidir (bkz. CustomerNameOrder). Tarih araması bisect ile O(log n); ekleme bloğu
+    bisect ile bulur ve yalnızca o bloğu kaydırır (O(log n + blok boyu)), geçmiş ne kadar
+    uzun olursa olsun tek ekleme bütün array'i taşımaz.
+    """
+    def __init__(self, store, block_size=HISTORY_BLOCK):
+        self.store = store
+        self.block_size = block_size
+        self.date_blocks = []
+        self.row_blocks = []
+        self.maxes = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert_sorted(self, row, date):
+        """
+        Yeni gönderiyi tarih bazında sıralı ekler.
+        Sıralama eski bağlı liste eklemesiyle birebir aynıdır: yeni gönderi, tarihi kendisinden
+        küçük gönderilerin hemen arkasına (baştaki gönderi her zaman önde kalacak şekilde) girer.
+        Tarih sondaki gönderiden büyükse doğrudan sona eklenir.
+        """
+        if not self.maxes or date > self.maxes[-1]:
+            self.append(row, date)
+            return
+        b = bisect_left(self.maxes, date)
+        dates = self.date_blocks[b]
+        i = bisect_left(dates, date)
+        if b == 0 and i == 0 and dates[0] == date:
+            i = 1
+        dates.insert(i, date)
+        self.row_blocks[b].insert(i, row)
+        self.maxes[b] = dates[-1]
+        self.size += 1
+        if len(dates) > 2 * self.block_size:
+            self._split(b)
+
+    def _split(self, b):
+        half = self.block_size
+        dates = self.date_blocks[b]
+        rows = self.row_blocks[b]
+        self.date_blocks.insert(b + 1, dates[half:])
+        self.row_blocks.insert(b + 1, rows[half:])
+        del dates[half:]
+        del rows[half:]
+        self.maxes.insert(b, dates[-1])
+
+    def append(self, row, date):
+        """
+        Gönderiyi tarih kontrolü yapmadan sona ekler (O(1) amortize).
+        Snapshot'tan sıralı geçmişi aynen geri yüklerken ve tarih sondakinden büyükken kullanılır.
+        """
+        if not self.date_blocks or len(self.date_blocks[-1]) >= 2 * self.block_size:
+            self.date_blocks.append(array("q"))
+            self.row_blocks.append(array(ROW_TYPECODE))
+            self.maxes.append(date)
+        self.date_blocks[-1].append(date)
+        self.row_blocks[-1].append(row)
+        self.maxes[-1] = date
+        self.size += 1
+
+    def _iter_from(self, date=None):
+        """
+        Tarihi date'ten küçük olmayan ilk gönderiden (date None ise baştan) başlayarak
+        (tarih, satır) çiftlerini sırayla üretir; başlangıç O(log n)
+        """
+        if date is None:
+            b, i = 0, 0
+        else:
+            b = bisect_left(self.maxes, date)
+            if b == len(self.maxes):
+                return
+            i = bisect_left(self.date_blocks[b], date)
+        for dates, rows in zip(islice(self.date_blocks, b, None), islice(self.row_blocks, b, None)):
+            yield from zip(islice(dates, i, None), islice(rows, i, None))
+            i = 0
+
+    def iter_range(self, start_date=None, end_date=None, cursor=None):
+        """
+        start_date <= tarih <= end_date aralığındaki gönderileri sırayla üretir (generator).
+        cursor, get_page'in döndürdüğü (tarih, kargo ID) konumudur; verilirse oradan devam edilir.
+        """
+        store = self.store
+        if cursor is not None:
+            cursor_date, cursor_id = cursor
+            # Aynı tarihli gönderiler arasında cursor'daki ID aranır; yoksa o tarihin sonundan devam edilir
+            entries = dropwhile(
+                lambda entry: entry[0] == cursor_date and store.ids[entry[1]] != cursor_id,
+                self._iter_from(cursor_date)
+            )
+        else:
+            entries = self._iter_from(start_date)
+        for date, row in entries:
+            if end_date is not None and date > end_date:
+                break
+            yield store.as_created(row)
+
+    def get_page(self, start_date=None, end_date=None, page_size=HISTORY_PAGE_SIZE, cursor=None):
+        """
+        Aralıktaki gönderilerden bir sayfa döndürür (O(log n + sayfa boyu)).
+        Dönüş: (sayfa, sonraki cursor); son sayfadaysa cursor None olur.
+        """
+        page = []
+        for shipment in self.iter_range(start_date, end_date, cursor):
+            if len(page) == page_size:
+                return page, (shipment[1], shipment[0])
+            page.append(shipment)
+        return page, None
+
+    def iter_pages(self, start_date=None, end_date=None, page_size=HISTORY_PAGE_SIZE):
+        """
+        Aralıktaki gönderileri page_size'lık listeler halinde üretir (generator).
+        """
+        page = []
+        for shipment in self.iter_range(start_date, end_date):
+            page.append(shipment)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def get_all_shipments(self):
+        """
+        Tüm gönderileri liste olarak döndürür (O(n))
+        """
+        as_created = self.store.as_created
+        return [as_created(row) for rows in self.row_blocks for row in rows]
+
+class CustomerNode:
+    def __init__(self, customer_id, name, surname, store):
+        self.customer_id = customer_id
+        self.name = name
+        self.surname = surname
+        self.shipment_history = ShipmentHistory(store)
+        # Son 5 gönderinin ShipmentStore satır numaraları
+        self.last_shipments_stack = []
+        self.next = None
+        self.prev = None
+
+    def push_last_shipment(self, row):
+        """
+        Son 5 gönderiyi stack (liste) mantığıyla tutar.
+        """
+        self.last_shipments_stack.append(row)
+        if len(self.last_shipments_stack) > 5:
+            self.last_shipments_stack.pop(0)
+
+    def last_shipments(self):
+        """
+        Son 5 gönderiyi en yeniden eskiye (stack sırası) döndürür (O(1))
+        """
+        store = self.shipment_history.store
+        return [store.as_created(row) for row in reversed(self.last_shipments_stack)]
+
+def turkish_fold(text):
+    """
+    Türkçe kurallarıyla küçük harfe çevirir: I -> ı, İ -> i (str.lower bunu yanlış yapar).
+    """
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+def turkish_collation_key(text):
+    """
+    Türkçe alfabetik sıralama anahtarı: ç c'den, ğ g'den, ı i'den, ö o'dan, ş s'den,
+    ü u'dan sonra gelir; büyük/küçük harf farkı yoktur.
+    """
+    return turkish_fold(text).translate(TURKISH_COLLATION)
+
+def name_tokens(text):
+    return turkish_fold(text).split()
+
+def trigrams(token):
+    """
+    Başına ve sonuna birer dolgu karakteri eklenmiş kelimenin tekil 3-gramları.
+    """
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def bounded_edit_distance(a, b, max_dist):
+    """
+    Yer değiştirmeli edit distance (Damerau, optimal string alignment): ekleme, silme,
+    değiştirme ve yan yana iki harfin yer değiştirmesi birer hata sayılır.
+    max_dist'i aşacağı anlaşılınca erken çıkıp max_dist + 1 döner.
+    Yalnızca köşegene en fazla max_dist uzaklıktaki hücreler hesaplanır (O(len * d)).
+    """
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    over = max_dist + 1
+    before = None
+    previous = [j if j <= max_dist else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        current = [i if i <= max_dist else over] + [over] * len(b)
+        row_min = current[0]
+        for j in range(max(1, i - max_dist), min(len(b), i + max_dist) + 1):
+            cb = b[j - 1]
+            cost = previous[j - 1] + (ca != cb)
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and before[j - 2] + 1 < cost:
+                cost = before[j - 2] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_dist:
+            return over
+        before, previous = previous, current
+    return min(previous[-1], over)
+
+def fuzzy_distance_limit(token):
+    """
+    Kelime uzunluğuna göre izin verilen yazım hatası sayısı.
+    """
+    if len(token) < 3:
+        return 0
+    return 1 if len(token) < 10 else 2
+
+class PostingList:
+    """
+    Bir kelimenin geçtiği müşteri ID'leri, artan sırada. ID'ler en fazla 2 * block_size
+    uzunluğunda sıralı array bloklarındadır (bkz. CustomerNameOrder); ekleme/silme
+    O(log n + blok boyu). En küçük k ID baştan okunur (O(k)), ceiling ile bir ID'den
+    sonraki ilk ID'ye O(log n) atlanır; kesişimler listeleri baştan sona taramaz.
+    """
+    __slots__ = ("block_size", "blocks", "maxes", "size")
+
+    def __init__(self, block_size=POSTING_BLOCK):
+        self.block_size = block_size
+        self.blocks = []
+        self.maxes = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def add(self, customer_id):
+        if not self.blocks:
+            self.blocks.append(array("q", [customer_id]))
+            self.maxes.append(customer_id)
+            self.size = 1
+            return
+        b = bisect_left(self.maxes, customer_id)
+        if b == len(self.blocks):
+            b -= 1
+            self.blocks[b].append(customer_id)
+            self.maxes[b] = customer_id
+        else:
+            block = self.blocks[b]
+            i = bisect_left(block, customer_id)
+            if block[i] == customer_id:
+                return
+            block.insert(i, customer_id)
+        self.size += 1
+        block = self.blocks[b]
+        if len(block) > 2 * self.block_size:
+            self.blocks.insert(b + 1, block[self.block_size:])
+            del block[self.block_size:]
+            self.maxes.insert(b, block[-1])
+
+    def discard(self, customer_id):
+        b = bisect_left(self.maxes, customer_id)
+        if b == len(self.blocks):
+            return
+        block = self.blocks[b]
+        i = bisect_left(block, customer_id)
+        if block[i] != customer_id:
+            return
+        del block[i]
+        self.size -= 1
+        if not block:
+            del self.blocks[b]
+            del self.maxes[b]
+        elif i == len(block):
+            self.maxes[b] = block[-1]
+
+    def ceiling(self, customer_id):
+        """
+        customer_id'den küçük olmayan ilk ID; yoksa None (O(log n))
+        """
+        b = bisect_left(self.maxes, customer_id)
+        if b == len(self.blocks):
+            return None
+        block = self.blocks[b]
+        return block[bisect_left(block, customer_id)]
+
+class PostingUnion:
+    """
+    Birkaç PostingList'in birleşimi üzerinde ileri yönlü imleç. Her listenin sıradaki ID'si
+    bir heap'te tutulur; ceiling yalnızca artan ID'lerle çağrılır ve yalnızca geride kalan
+    listeleri ilerletir (liste başına O(log n) atlama).
+    """
+    def __init__(self, postings):
+        self.heap = [(posting.blocks[0][0], k, posting) for k, posting in enumerate(postings) if posting]
+        heapq.heapify(self.heap)
+
+    def ceiling(self, customer_id):
+        heap = self.heap
+        while heap and heap[0][0] < customer_id:
+            _, k, posting = heap[0]
+            found = posting.ceiling(customer_id)
+            if found is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (found, k, posting))
+        return heap[0][0] if heap else None
+
+def intersect_postings(groups):
+    """
+    Her grup bir PostingList listesidir; her gruptaki listelerden en az birinde geçen
+    ID'leri artan sırada üretir (generator). Leapfrog: aday ID her gruba ceiling ile
+    sorulur, daha büyük bir ID dönerse aday o olur. Yalnızca üretilen sonuçlar ve
+    atlamalar kadar iş yapılır.
+    """
+    unions = [PostingUnion(group) for group in groups]
+    candidate = unions[0].ceiling(INT64_MIN)
+    while candidate is not None:
+        for union in unions:
+            found = union.ceiling(candidate)
+            if found is None:
+                return
+            if found != candidate:
+                candidate = found
+                break
+        else:
+            yield candidate
+            candidate = unions[0].ceiling(candidate + 1)
+
+class CustomerNameIndex:
+    """
+    Müşteri ad ve soyadları için ters (inverted) index. Kelimeler Türkçe küçük harfe çevrilir.
+    - postings: kelime -> sıralı müşteri ID listesi (PostingList); ilk k sonuç dilim olarak okunur
+    - tokens: sıralı tekil kelime dizisi; önek araması bisect ile (O(log k + eşleşen))
+    - grams: 3-gram -> kelime kümesi; yazım hatası toleranslı aramada aday kelimeler
+      ortak 3-gram sayısıyla elenir, yalnızca adaylara edit distance hesaplanır.
+    """
+    # Sonuç sıralaması: tam eşleşme < önek < yazım hatalı (1 + mesafe)
+    EXACT = 0
+    PREFIX = 1
+
+    def __init__(self):
+        self.postings = {}
+        self.tokens = []
+        self.grams = {}
+
+    def add(self, customer_id, name, surname):
+        for token in set(name_tokens(f"{name} {surname}")):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = PostingList()
+                insort(self.tokens, token)
+                for gram in trigrams(token):
+                    self.grams.setdefault(gram, set()).add(token)
+            ids.add(customer_id)
+
+    def remove(self, customer_id, name, surname):
+        for token in set(name_tokens(f"{name} {surname}")):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(customer_id)
+            if not ids:
+                del self.postings[token]
+                del self.tokens[bisect_left(self.tokens, token)]
+                for gram in trigrams(token):
+                    tokens = self.grams[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.grams[gram]
+
+    def prefix_tokens(self, prefix):
+        """
+        prefix ile başlayan kelimeleri alfabetik sırayla üretir (generator).
+        """
+        for i in range(bisect_left(self.tokens, prefix), len(self.tokens)):
+            token = self.tokens[i]
+            if not token.startswith(prefix):
+                return
+            yield token
+
+    def fuzzy_tokens(self, token):
+        """
+        token'a en fazla fuzzy_distance_limit kadar uzak kelimeler: [(mesafe, kelime)].
+        Her hata en fazla 4 tekil 3-gramı bozar, yani mesafesi d olan kelime token'ın
+        G 3-gramından en az T = G - 4d tanesini içerir (d, uzunluğa göre T >= 1 kalacak
+        şekilde seçilir, bkz. fuzzy_distance_limit). Ortak 3-gram sayısı T'nin altında
+        kalan ya da uzunluğu d'den fazla farklı olan kelimeler edit distance hesaplanmadan elenir.
+        """
+        max_dist = fuzzy_distance_limit(token)
+        if max_dist == 0:
+            return []
+        grams = trigrams(token)
+        threshold = max(1, len(grams) - 4 * max_dist)
+        # Sayım Counter.update ile C seviyesinde yapılır
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+        result = []
+        for candidate, count in shared.items():
+            if count < threshold or candidate == token or abs(len(candidate) - len(token)) > max_dist:
+                continue
+            dist = bounded_edit_distance(token, candidate, max_dist)
+            if dist <= max_dist:
+                result.append((dist, candidate))
+        result.sort()
+        return result
+
+    def token_vocabulary(self, token, fuzzy=True):
+        """
+        Bir sorgu kelimesine uyan index kelimeleri ve skorları: {kelime: skor}.
+        """
+        matches = {}
+        if token in self.postings:
+            matches[token] = self.EXACT
+        for candidate in self.prefix_tokens(token):
+            matches.setdefault(candidate, self.PREFIX)
+        if fuzzy:
+            for dist, candidate in self.fuzzy_tokens(token):
+                matches.setdefault(candidate, self.PREFIX + dist)
+        return matches
+
+    def search(self, query, limit=NAME_SEARCH_LIMIT, fuzzy=True):
+        """
+        Sorgudaki her kelimeyle (ad ya da soyad; tam, önek ya da yazım hatalı) eşleşen
+        müşterilerin ID'lerini en iyi eşleşme önce olacak şekilde en fazla limit kadar döndürür.
+        """
+        tokens = name_tokens(query)
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            return self._search_single(tokens[0], limit, fuzzy)
+        result = self._search_multi(tokens, limit, False)
+        if fuzzy and len(result) < limit:
+            # Tam/önek eşleşmeler limiti doldurmadıysa yazım hatalı eşleşmeler de eklenir
+            result = self._search_multi(tokens, limit, True)
+        return result
+
+    def _search_multi(self, tokens, limit, fuzzy):
+        """
+        Müşterinin skoru, her sorgu kelimesi için uyduğu en iyi index kelimesinin skorlarının
+        toplamıdır; sonuçlar (skor, ID) sırasındadır. Kelime başına skor seviyeleri az olduğu
+        için (tam, önek, 1-2 hata) skor birleşimleri toplam skora göre sırayla denenir; her
+        birleşimde ilgili ID listeleri sıralı olarak kesiştirilir ve limit dolunca durulur.
+        Müşteri ilk göründüğü (en küçük) toplam skorla alınır.
+        """
+        levels = []
+        for token in tokens:
+            by_score = {}
+            for candidate, score in self.token_vocabulary(token, fuzzy).items():
+                by_score.setdefault(score, []).append(self.postings[candidate])
+            if not by_score:
+                return []
+            levels.append(sorted(by_score.items()))
+        combos = sorted((
+            (sum(score for score, _ in combo), [group for _, group in combo])
+            for combo in product(*levels)
+        ), key=itemgetter(0))
+        result = []
+        seen = set()
+        i = 0
+        while i < len(combos) and len(result) < limit:
+            # Aynı toplam skorlu birleşimlerin sonuçları ID sırasıyla birleştirilir
+            total = combos[i][0]
+            streams = []
+            while i < len(combos) and combos[i][0] == total:
+                streams.append(intersect_postings(combos[i][1]))
+                i += 1
+            for cid in heapq.merge(*streams):
+                if cid in seen:
+                    continue
+                seen.add(cid)
+                result.append(cid)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def _search_single(self, token, limit, fuzzy):
+        # Tek kelimede katmanlar sırayla doldurulur; limit dolunca sonraki katmanlara bakılmaz.
+        # ID listeleri sıralı olduğundan her kelimeden yalnızca ilk (limit - dolu) yeni ID okunur.
+        result = list(islice(self.postings.get(token, ()), limit))
+        seen = set(result)
+
+        def take(candidates):
+            for candidate in candidates:
+                if len(result) >= limit:
+                    return
+                for cid in self.postings[candidate]:
+                    if cid in seen:
+                        continue
+                    result.append(cid)
+                    seen.add(cid)
+                    if len(result) >= limit:
+                        return
+
+        take(c for c in self.prefix_tokens(token) if c != token)
+        if fuzzy and len(result) < limit:
+            take(c for _, c in self.fuzzy_tokens(token))
+        return result
+
+class CustomerNameOrder:
+    """
+    Müşterilerin (ad, soyad, ID) Türkçe alfabetik sırasına göre tutulduğu ikincil index.
+    Kayıtlar en fazla 2 * block_size uzunluğunda sıralı bloklardadır; maxes her bloğun son
+    anahtarıdır. Ekleme/silme bloğu bisect ile bulur ve yalnızca o bloğu kaydırır
+    (O(log n + blok boyu)); liste her açılışta yeniden sıralanmaz.
+    """
+    def __init__(self, block_size=NAME_ORDER_BLOCK):
+        self.block_size = block_size
+        self.blocks = []
+        self.maxes = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def sort_key(customer_id, name, surname):
+        return (turkish_collation_key(name), turkish_collation_key(surname), customer_id)
+
+    def add(self, customer_id, name, surname):
+        key = self.sort_key(customer_id, name, surname)
+        self.size += 1
+        if not self.blocks:
+            self.blocks.append([key])
+            self.maxes.append(key)
+            return
+        b = bisect_left(self.maxes, key)
+        if b == len(self.blocks):
+            # Tüm anahtarlardan büyük: son bloğun sonuna eklenir
+            b -= 1
+            self.blocks[b].append(key)
+            self.maxes[b] = key
+        else:
+            insort(self.blocks[b], key)
+        block = self.blocks[b]
+        if len(block) > 2 * self.block_size:
+            self.blocks.insert(b + 1, block[self.block_size:])
+            del block[self.block_size:]
+            self.maxes.insert(b, block[-1])
+
+    def remove(self, customer_id, name, surname):
+        key = self.sort_key(customer_id, name, surname)
+        b = bisect_left(self.maxes, key)
+        if b == len(self.blocks):
+            return False
+        block = self.blocks[b]
+        i = bisect_left(block, key)
+        if i == len(block) or block[i] != key:
+            return False
+        del block[i]
+        self.size -= 1
+        if not block:
+            del self.blocks[b]
+            del self.maxes[b]
+        elif i == len(block):
+            self.maxes[b] = block[-1]
+        return True
+
+    def iter_from(self, key=None):
+        """
+        key'den küçük olmayan anahtarları sırayla üretir (generator); key None ise baştan.
+        """
+        if key is None:
+            b, i = 0, 0
+        else:
+            b = bisect_left(self.maxes, key)
+            if b == len(self.blocks):
+                return
+            i = bisect_left(self.blocks[b], key)
+        for block in islice(self.blocks, b, None):
+            yield from islice(block, i, None)
+            i = 0
+
+    def get_page(self, page_size=HISTORY_PAGE_SIZE, cursor=None):
+        """
+        Sıralı listeden bir sayfa müşteri ID'si döndürür (O(log n + sayfa boyu)).
+        Dönüş: (ID listesi, sonraki cursor); cursor sonraki sayfanın ilk kaydının
+        (customer_id, ad, soyad) üçlüsüdür, son sayfadaysa None olur.
+        Cursor'daki müşteri bu arada silinse bile sayfalama onu izleyen kayıttan devam eder.
+        """
+        start = self.sort_key(*cursor) if cursor is not None else None
+        page = []
+        for key in self.iter_from(start):
+            if len(page) == page_size:
+                return page, key
+            page.append(key[2])
+        return page, None
+
+class CustomerLinkedList:
+    def __init__(self, store):
+        self.head = None
+        # Müşteri geçmişlerinin satır numaralarıyla başvurduğu kargo deposu
+        self.store = store
+        # ID -> CustomerNode sözlüğü; bağlı listeyle her adımda birlikte güncellenir
+        self.index = {}
+        # Ad/soyad arama index'i (önek ve yazım hatası toleranslı)
+        self.name_index = CustomerNameIndex()
+        # Türkçe alfabetik (ad, soyad, ID) sırasıyla tutulan ikincil index
+        self.name_order = CustomerNameOrder()
+
+    def add_customer(self, customer_id, name, surname):
+        """
+        Müşteri eklemeden önce ID var mı diye index üzerinden kontrol ediyoruz (O(1)).
+        ID zaten varsa False döner.
+        """
+        if customer_id in self.index:
+            return False
+        new_customer = CustomerNode(customer_id, name, surname, self.store)
+        new_customer.next = self.head
+        if self.head is not None:
+            self.head.prev = new_customer
+        self.head = new_customer
+        self.index[customer_id] = new_customer
+        self.name_index.add(customer_id, name, surname)
+        self.name_order.add(customer_id, name, surname)
+        return True
+
+    def find_customer(self, customer_id):
+        """
+        ID'ye göre müşteri aramak, index sayesinde (O(1))
+        """
+        return self.index.get(customer_id)
+
+    def remove_customer(self, customer_id):
+        """
+        Bağlı listeden müşteri silmek; düğüm index'ten bulunur,
+        prev/next bağlantıları güncellenir (O(1)). Müşteri yoksa False döner.
+        """
+        node = self.index.pop(customer_id, None)
+        if node is None:
+            return False
+        self.name_index.remove(customer_id, node.name, node.surname)
+        self.name_order.remove(customer_id, node.name, node.surname)
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        node.next = node.prev = None
+        return True
+
+    def __len__(self):
+        return len(self.index)
+
+    def get_all_customers(self):
+        """
+        Tüm müşteri düğümlerini listeye atıp döndürür (O(n))
+        """
+        customers = []
+        current = self.head
+        while current:
+            customers.append(current)
+            current = current.next
+        return customers
+
+class CargoPriorityQueue:
+    """
+    Konum haritalı (indexed) min-heap.
+    heap elemanları (delivery_time, shipment_id, status) biçimindedir,
+    position ise shipment_id -> heap içindeki indeks eşlemesini tutar.
+    """
+    def __init__(self):
+        self.heap = []
+        self.position = {}
+        # Her değişiklikte artar; sıralı görünüm önbelleği (version, liste) buna göre geçersiz olur
+        self.version = 0
+        self.sorted_cache = None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, shipment_id):
+        """
+        Kargo kuyrukta mı? (O(1))
+        """
+        return shipment_id in self.position
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i][1]] = i
+        self.position[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        heap = self.heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i] < heap[parent]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    def _sift_down(self, i):
+        heap = self.heap
+        n = len(heap)
+        while True:
+            smallest = i
+            left = 2 * i + 1
+            right = left + 1
+            if left < n and heap[left] < heap[smallest]:
+                smallest = left
+            if right < n and heap[right] < heap[smallest]:
+                smallest = right
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+    def add_cargo(self, shipment_id, delivery_time, status):
+        """
+        Heap kullanarak O(log n) ekleme.
+        Aynı ID zaten kuyruktaysa önceliği güncellenir.
+        """
+        if shipment_id in self.position:
+            self.update_priority(shipment_id, delivery_time, status)
+            return
+        self.heap.append((delivery_time, shipment_id, status))
+        self.position[shipment_id] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        self.version += 1
+
+    def pop_cargo(self):
+        if not self.heap:
+            return None
+        return self._remove_at(0)
+
+    def _remove_at(self, i):
+        """
+        i. indeksteki elemanı son elemanla yer değiştirip çıkarır (O(log n))
+        """
+        heap = self.heap
+        last = len(heap) - 1
+        if i != last:
+            self._swap(i, last)
+        item = heap.pop()
+        del self.position[item[1]]
+        if i < len(heap):
+            self._sift_down(i)
+            self._sift_up(i)
+        self.version += 1
+        return item
+
+    def remove_cargo_by_id(self, shipment_id):
+        """
+        Konum haritasından indeksi bulup silme (O(log n))
+        """
+        i = self.position.get(shipment_id)
+        if i is None:
+            return False
+        self._remove_at(i)
+        return True
+
+    def update_priority(self, shipment_id, delivery_time, status=None):
+        """
+        Kargonun teslim süresini (önceliğini) günceller (O(log n))
+        """
+        i = self.position.get(shipment_id)
+        if i is None:
+            return False
+        old = self.heap[i]
+        if status is None:
+            status = old[2]
+        self.heap[i] = (delivery_time, shipment_id, status)
+        if self.heap[i] < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+        self.version += 1
+        return True
+
+    def add_many(self, items):
+        """
+        (shipment_id, delivery_time, status) listesini topluca ekler.
+        Grup heap'ten büyükse heap bir kez yeniden kurulur (O(n)),
+        değilse elemanlar tek tek eklenir (k * O(log n)).
+        """
+        if len(items) <= len(self.heap):
+            for shipment_id, delivery_time, status in items:
+                self.add_cargo(shipment_id, delivery_time, status)
+            return
+        heap = self.heap
+        for shipment_id, delivery_time, status in items:
+            heap.append((delivery_time, shipment_id, status))
+        heapq.heapify(heap)
+        self.position = {item[1]: i for i, item in enumerate(heap)}
+        self.version += 1
+
+    def remove_many(self, shipment_ids):
+        """
+        Verilen ID kümesindeki kargoları tek geçişte çıkarır ve heap'i
+        bir kez yeniden kurar (O(n)); çıkarılan ID'leri döndürür.
+        """
+        removed = set()
+        kept = []
+        for item in self.heap:
+            if item[1] in shipment_ids:
+                removed.add(item[1])
+            else:
+                kept.append(item)
+        heapq.heapify(kept)
+        self.heap = kept
+        self.position = {item[1]: i for i, item in enumerate(kept)}
+        self.version += 1
+        return removed
+
+    def clear(self):
+        """
+        Kuyruğu tamamen boşaltır; yeni boş yapılar atanır (O(1))
+        """
+        self.heap = []
+        self.position = {}
+        self.version += 1
+
+    def sorted_view(self):
+        """
+        Heap'teki kargoların teslim süresine göre sıralı listesi; salt okunurdur.
+        Kuyruk son sıralamadan beri değişmediyse önbellekteki liste döner (O(1)),
+        değiştiyse bir kez yeniden sıralanır (O(n log n)).
+        """
+        cache = self.sorted_cache
+        if cache is None or cache[0] != self.version:
+            # Aynı anda okuyan thread'ler aynı sonucu hesaplar; atama tek adımdır
+            cache = self.sorted_cache = (self.version, sorted(self.heap, key=itemgetter(0)))
+        return cache[1]
+
+    def sorted_items(self):
+        """
+        Heap'teki tüm kargoları teslim süresine göre artan sırada döndürür (kopya, O(n))
+        """
+        return list(self.sorted_view())
+
+class CityNode:
+    """
+    Rota ağacındaki şehir. Aynı ağaçtaki düğümler tek bir city_id -> CityNode index'ini
+    paylaşır; add_child bu index'i ve parent işaretçisini günceller, böylece ağaçta
+    şehir araması BFS yerine O(1) yapılır.
+    depth (kökün derinliği 0) eklenirken atanır. size (düğüm dahil alt ağaçtaki şehir sayısı)
+    her eklemede bütün atalar boyunca güncellenmez; compute_subtree_sizes ile tek geçişte hesaplanır.
+    """
+    def __init__(self, city_id, city_name):
+        self.city_id = city_id
+        self.city_name = city_name
+        self.children = []
+        self.parent = None
+        self.index = {city_id: self}
+        self.depth = 0
+        self.size = 1
+
+    def add_child(self, child_node):
+        """
+        Bir şehri (henüz bir ağaca bağlanmamış düğüm ya da alt ağacı) diğerinin altına ekler.
+        Eklenenlerden birinin ID'si ağaçta zaten varsa hiçbir şey değiştirmeden False döner.
+        Yaprak eklemek O(1); alt ağaç eklemek alt ağaç boyunca O(k).
+        """
+        added = child_node.index
+        if any(city_id in self.index for city_id in added):
+            return False
+        for node in added.values():
+            node.index = self.index
+        self.index.update(added)
+        child_node.parent = self
+        self.children.append(child_node)
+        # Alt ağaç eklendiyse derinlikler yukarıdan aşağı yeniden atanır
+        stack = [child_node]
+        while stack:
+            node = stack.pop()
+            node.depth = node.parent.depth + 1
+            stack.extend(node.children)
+        return True
+
+    def find(self, city_id):
+        """
+        Bu düğümün bulunduğu ağaçta city_id'li şehir; yoksa None (O(1))
+        """
+        return self.index.get(city_id)
+
+def compute_subtree_sizes(root):
+    """
+    Her düğümün size alanını (alt ağaçtaki şehir sayısı) özyinelemesiz tek geçişte atar (O(n))
+    """
+    order = [root]
+    for node in order:
+        order.extend(node.children)
+    # BFS sırasının tersinde çocuklar ebeveynden önce gelir
+    for node in reversed(order):
+        node.size = 1 + sum(child.size for child in node.children)
+
+def iter_tree_lines(root, max_depth=None, expanded=None):
+    """
+    root'tan başlayarak ağacı satır satır üreten generator; özyineleme yerine açık yığın
+    kullanır, derin zincirlerde de özyineleme sınırına takılmaz. Yalnızca üretilen satırlar
+    kadar iş yapılır (ilk sayfa için bütün ağaç dolaşılmaz).
+    max_depth: root'a göre en fazla bu derinliğe kadar inilir; expanded: verilirse yalnızca bu
+    ID'lerdeki şehirlerin çocukları açılır. Açılmayan şehrin yanında alt şehir sayısı yazılır,
+    bunun için size alanları güncel olmalıdır (bkz. compute_subtree_sizes).
+    """
+    stack = [(root, 0)]
+    while stack:
+        node, level = stack.pop()
+        line = "    " * level + f"{node.city_name} (ID: {node.city_id})"
+        if not node.children:
+            yield line
+            continue
+        if ((max_depth is not None and level >= max_depth)
+                or (expanded is not None and node.city_id not in expanded)):
+            yield line + f" [+{node.size - 1} alt şehir]"
+            continue
+        yield line
+        stack.extend((child, level + 1) for child in reversed(node.children))
+
+def print_tree(root):
+    """
+    Ağaçtaki düğümleri hiyerarşik biçimde satır listesi olarak döndürür (O(n))
+    """
+    return list(iter_tree_lines(root))
+
+def shortest_route_depth(root):
+    """
+    BFS ile ağacın en kısa rota derinliğini bulur (O(n))
+    """
+    q = deque([(root, 1)])
+    while q:
+        node, depth = q.popleft()
+        if not node.children:
+            return depth
+        for c in node.children:
+            q.append((c, depth+1))
+    return 1
+
+class RouteGraph:
+    """
+    Şubeler arası ağırlıklı, yönsüz yol ağı; kenar ağırlığı iki şube arasındaki yol
+    süresidir (saat). Rota ağacındaki her ebeveyn-çocuk bağı bir kenardır, connect ile
+    ağaç dışı (doğrudan) yollar da eklenir. Komşuluk city_id -> {komşu_id: saat}
+    dict'lerinde, konumu bilinen şubelerin (enlem, boylam) değeri locations'ta tutulur.
+    """
+    def __init__(self):
+        self.adjacency = {}
+        self.locations = {}
+        self.edge_count = 0
+
+    def __contains__(self, city_id):
+        return city_id in self.adjacency
+
+    def add_city(self, city_id, location=None):
+        """
+        Şubeyi (bağlantısız olarak) ağa ekler; location (enlem, boylam) verilirse saklanır (O(1))
+        """
+        self.adjacency.setdefault(city_id, {})
+        if location is not None:
+            self.locations[city_id] = (float(location[0]), float(location[1]))
+
+    def connect(self, city_a, city_b, hours):
+        """
+        İki şube arasına hours saatlik yol ekler ya da yolun süresini günceller (O(1)).
+        Şubelerden biri ağda yoksa, şubeler aynıysa ya da süre geçersizse (negatif, NaN,
+        sonsuz) False döner.
+        """
+        adjacency = self.adjacency
+        if (city_a == city_b or not is_route_hours(hours)
+                or city_a not in adjacency or city_b not in adjacency):
+            return False
+        if city_b not in adjacency[city_a]:
+            self.edge_count += 1
+        adjacency[city_a][city_b] = hours
+        adjacency[city_b][city_a] = hours
+        return True
+
+    def edges(self):
+        """
+        Her yolu bir kez (şube, şube, saat) olarak üretir (generator, O(V + E))
+        """
+        for city_a, neighbors in self.adjacency.items():
+            for city_b, hours in neighbors.items():
+                if city_a < city_b:
+                    yield city_a, city_b, hours
+
+    def estimator(self, target):
+        """
+        A* için target'a kalan sürenin alt sınırını veren fonksiyon: büyük daire (haversine)
+        mesafesi / ROUTE_MAX_SPEED_KMH. Konumu bilinmeyen şube için 0 (Dijkstra gibi davranır).
+        """
+        locations = self.locations
+        if target not in locations:
+            return lambda city_id: 0
+        lat2, lon2 = map(math.radians, locations[target])
+        cos_lat2 = math.cos(lat2)
+        scale = 2 * EARTH_RADIUS_KM / ROUTE_MAX_SPEED_KMH
+
+        def estimate(city_id):
+            point = locations.get(city_id)
+            if point is None:
+                return 0
+            lat1, lon1 = math.radians(point[0]), math.radians(point[1])
+            a = (math.sin((lat2 - lat1) / 2) ** 2
+                 + math.cos(lat1) * cos_lat2 * math.sin((lon2 - lon1) / 2) ** 2)
+            return scale * math.asin(min(1.0, math.sqrt(a)))
+        return estimate
+
+    def shortest_path(self, source, target, method=ROUTE_ASTAR):
+        """
+        source'tan target'a en kısa süreli rota: (toplam saat, [şube ID'leri]); yol yoksa None.
+        İkili heap (heapq) ile Dijkstra, O((V + E) log V); ROUTE_ASTAR'da heap önceliği
+        süre + alt sınır olur ve hedefe yönelmeyen şubeler daha az açılır.
+        Daha iyi süre bulunan şube yeniden kuyruğa girer, eski kayıtları atlanır;
+        hedef kuyruktan ilk çıktığında aramaya son verilir.
+        """
+        adjacency = self.adjacency
+        if source not in adjacency or target not in adjacency:
+            return None
+        if method == ROUTE_ASTAR:
+            estimate = self.estimator(target)
+        elif method == ROUTE_DIJKSTRA:
+            estimate = None
+        else:
+            raise ValueError(f"Bilinmeyen rota yöntemi: {method}")
+        best = {source: 0}
+        previous = {}
+        heap = [(0, 0, source)]
+        while heap:
+            _, cost, city_id = heapq.heappop(heap)
+            if city_id == target:
+                break
+            if cost > best[city_id]:
+                continue
+            for neighbor, hours in adjacency[city_id].items():
+                new_cost = cost + hours
+                if new_cost < best.get(neighbor, math.inf):
+                    best[neighbor] = new_cost
+                    previous[neighbor] = city_id
+                    priority = new_cost if estimate is None else new_cost + estimate(neighbor)
+                    heapq.heappush(heap, (priority, new_cost, neighbor))
+        else:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return cost, path
+
+    def shortest_path_tree(self, source):
+        """
+        source'tan ulaşılabilen tüm şubelere en kısa süreler ve rota ağacı:
+        ({şube: saat}, {şube: önceki şube}). Hedefsiz Dijkstra, O((V + E) log V)
+        """
+        adjacency = self.adjacency
+        best = {source: 0}
+        previous = {}
+        heap = [(0, source)]
+        while heap:
+            cost, city_id = heapq.heappop(heap)
+            if cost > best[city_id]:
+                continue
+            for neighbor, hours in adjacency[city_id].items():
+                new_cost = cost + hours
+                if new_cost < best.get(neighbor, math.inf):
+                    best[neighbor] = new_cost
+                    previous[neighbor] = city_id
+                    heapq.heappush(heap, (new_cost, neighbor))
+        return best, previous
+
+    def to_snapshot(self):
+        return {
+            "edges": [list(edge) for edge in self.edges()],
+            "locations": [[city_id, lat, lon] for city_id, (lat, lon) in self.locations.items()],
+        }
+
+class RouteCache:
+    """
+    Şubeler arası rota sorguları için ön hesaplı önbellek. Tablolar ilk sorguda kurulur.
+    - Yol ağı ağacın kendisiyse (ağaç dışı yol yoksa) LCA: Euler turu + sparse table
+      (O(n log n) kurulum, array'lerde). İki şubenin ortak atası O(1) bulunur, aradaki süre
+      kökten ağırlıklı derinliklerle hours[a] + hours[b] - 2 * hours[lca] olarak O(1) hesaplanır.
+    - Ağaç dışı yollar varsa kaynak şube başına hedefsiz Dijkstra sonucu (süre ve önceki şube
+      tabloları) saklanır; aynı şubeden çıkan sonraki sorgular O(1). En son kullanılan
+      ROUTE_CACHE_SOURCES kaynak tutulur.
+    add_leaf (add_city) tabloları yeniden kurmadan yamar: yeni yaprak hiçbir rotayı kısaltamaz,
+    süresi ebeveyninkinden türetilir. invalidate (connect_cities) tabloları atar.
+    Sorgular "cities" okuma kilidi altında eşzamanlı gelebildiği için tablolar kendi kilidiyle korunur.
+    """
+    def __init__(self, root, graph):
+        self.root = root
+        self.graph = graph
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        # tree: LCA tabloları geçerli mi (None: henüz kurulmadı/geçersiz)
+        self.tree = None
+        self.euler = None
+        self.levels = None
+        self.first = None
+        self.table = None
+        # city_id -> kökten ağırlıklı derinlik (saat); yamalı şehirler dahil
+        self.hours = None
+        # Tablolar kurulduktan sonra eklenen şehir -> ebeveyn
+        self.pending = {}
+        self.sources = {}
+
+    def add_leaf(self, city_id, parent_id, hours):
+        """
+        Yeni yaprak şehri tabloları yeniden kurmadan ekler (O(önbellekteki kaynak sayısı))
+        """
+        with self.lock:
+            if self.tree:
+                self.pending[city_id] = parent_id
+                self.hours[city_id] = self.hours[parent_id] + hours
+                if len(self.pending) > ROUTE_CACHE_PATCH_LIMIT:
+                    self.tree = None
+            for best, previous in self.sources.values():
+                if parent_id in best:
+                    best[city_id] = best[parent_id] + hours
+                    previous[city_id] = parent_id
+
+    def _build(self):
+        """
+        Yol ağı ağaçsa LCA tablolarını kurar; değilse kaynak tablolarına geçer (çağıran kilidi tutar)
+        """
+        graph = self.graph
+        self.pending = {}
+        self.tree = graph.edge_count == len(graph.adjacency) - 1
+        if not self.tree:
+            return
+        adjacency = graph.adjacency
+        root_id = self.root.city_id
+        euler = array("q", [root_id])
+        levels = array("i", [0])
+        first = {root_id: 0}
+        hours = {root_id: 0}
+        # Özyinelemesiz DFS: yığında (düğüm, seviye, kalan çocuklar)
+        stack = [(self.root, 0, iter(self.root.children))]
+        while stack:
+            node, level, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if stack:
+                    euler.append(stack[-1][0].city_id)
+                    levels.append(stack[-1][1])
+                continue
+            hours[child.city_id] = hours[node.city_id] + adjacency[node.city_id][child.city_id]
+            first[child.city_id] = len(euler)
+            euler.append(child.city_id)
+            levels.append(level + 1)
+            stack.append((child, level + 1, iter(child.children)))
+        # table[k][i]: euler[i:i + 2^k] aralığında seviyesi en küçük konum
+        table = [array("i", range(len(euler)))]
+        k = 1
+        while (1 << k) <= len(euler):
+            prev = table[-1]
+            half = 1 << (k - 1)
+            table.append(array("i", [a if levels[a] <= levels[b] else b
+                                     for a, b in zip(prev, prev[half:])]))
+            k += 1
+        self.euler, self.levels, self.first, self.table, self.hours = euler, levels, first, table, hours
+
+    def _anchor(self, city_id):
+        """
+        Şehrin tablolarda bulunan en yakın atası ve oraya kadarki yamalı şehirler
+        """
+        chain = []
+        pending = self.pending
+        while city_id in pending:
+            chain.append(city_id)
+            city_id = pending[city_id]
+        return city_id, chain
+
+    def _lca(self, city_a, city_b):
+        """
+        İki şehrin en yakın ortak atası (yamalı şehir yoksa O(1))
+        """
+        anchor_a, chain_a = self._anchor(city_a)
+        anchor_b, chain_b = self._anchor(city_b)
+        if anchor_a == anchor_b and chain_a and chain_b:
+            seen = set(chain_a)
+            for city_id in chain_b:
+                if city_id in seen:
+                    return city_id
+        left, right = self.first[anchor_a], self.first[anchor_b]
+        if left > right:
+            left, right = right, left
+        k = (right - left + 1).bit_length() - 1
+        a, b = self.table[k][left], self.table[k][right - (1 << k) + 1]
+        return self.euler[a if self.levels[a] <= self.levels[b] else b]
+
+    def route(self, source, target):
+        """
+        (toplam saat, [şube ID'leri]) ya da şubelerden biri yoksa/aralarında yol yoksa None.
+        Süre O(1) (ağaçta LCA, değilse önbellekteki kaynak tablosu); rota, uzunluğu kadar sürede
+        önceki şube işaretçilerinden çıkarılır. Önbellekte olmayan kaynak için bir kez Dijkstra çalışır.
+        """
+        if source not in self.graph or target not in self.graph:
+            return None
+        with self.lock:
+            if self.tree is None:
+                self._build()
+            if self.tree:
+                return self._tree_route(source, target)
+            cached = self.sources.pop(source, None)
+            if cached is not None:
+                # Sona taşınır: sözlük sırası en eskiden en yeniye kullanım sırasıdır
+                self.sources[source] = cached
+        if cached is None:
+            cached = self.graph.shortest_path_tree(source)
+            with self.lock:
+                if self.tree is False:
+                    self.sources[source] = cached
+                    while len(self.sources) > ROUTE_CACHE_SOURCES:
+                        del self.sources[next(iter(self.sources))]
+        best, previous = cached
+        if target not in best:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return best[target], path
+
+    def _tree_route(self, source, target):
+        lca = self._lca(source, target)
+        hours = self.hours
+        index = self.root.index
+        up = [source]
+        while up[-1] != lca:
+            up.append(index[up[-1]].parent.city_id)
+        down = [target]
+        while down[-1] != lca:
+            down.append(index[down[-1]].parent.city_id)
+        down.pop()
+        down.reverse()
+        return hours[source] + hours[target] - 2 * hours[lca], up + down
+
+def date_after(date, days):
+    """
+    YYYYMMDD tarihinden days gün sonrası (YYYYMMDD); tarih takvimde yoksa ya da sonuç
+    desteklenen tarih aralığının (9999 yılı) dışına taşıyorsa None
+    """
+    try:
+        start = datetime.strptime(str(date), "%Y%m%d")
+        return int((start + timedelta(days=days)).strftime("%Y%m%d"))
+    except (ValueError, OverflowError):
+        return None
+
+def binary_search_delivered(ids, target_id):
+    """
+    Teslim edilmiş kargoların sıralı ID dizisinde binary search (O(log n)); konumu ya da None döndürür
+    """
+    low, high = 0, len(ids) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if ids[mid] == target_id:
+            return mid
+        elif ids[mid] < target_id:
+            low = mid + 1
+        else:
+            high = mid - 1
+    return None
+
+class BoundedTopK:
+    """
+    Verilen anahtara göre en büyük `capacity` kaydı boyutu sınırlı bir min-heap'te tutar.
+    Ekleme O(log K); kök en küçük tutulan kayıt olduğu için ondan küçük kayıtlar O(1)'de elenir.
+    Anahtarlar tekil olmalıdır (eşitlikte kayıtların kendisi karşılaştırılmasın).
+    """
+    def __init__(self, capacity, key):
+        self.capacity = capacity
+        self.key = key
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item):
+        entry = (self.key(item), item)
+        if len(self.heap) < self.capacity:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def top(self, k):
+        """
+        En büyük k kaydı büyükten küçüğe döndürür (O(K log k)); k <= capacity olmalı.
+        """
+        return [item for _, item in heapq.nlargest(k, self.heap)]
+
+def slowest_key(shipment):
+    # Uzun süre önce; eşitlikte küçük ID önce
+    return (shipment[3], -shipment[0])
+
+def fastest_key(shipment):
+    # Kısa süre önce; eşitlikte küçük ID önce
+    return (-shipment[3], -shipment[0])
+
+class DeliveryStats:
+    """
+    Teslim edilmiş kargoların teslim süreleri için artımlı istatistikler.
+    Her eklemede O(1) güncellenir: adet, toplam, min, max ve en uzun süreli kargo.
+    Yüzdelikler için süre -> adet histogramı (sketch) tutulur; teslim süreleri tam sayı
+    gün olduğundan sonuç kesindir ve bellek farklı süre sayısıyla (k) sınırlıdır.
+    Histogramın anahtarları ayrıca sıralı listede tutulur (yeni süre ilk görüldüğünde
+    bisect ile yerleşir, O(k) kaydırma; süreler gün sayısı olduğundan k küçüktür).
+    Her yüzdelik için (anahtar sırası, o anahtara kadar kümülatif adet) imleci tutulur;
+    bir eklemede hedef sıra ve kümülatif adet en fazla 1 değiştiğinden imleç en fazla bir
+    anahtar kayar. Böylece yüzdelikler her eklemede O(1) (+ yeni süre için O(log k))
+    güncellenir ve sorgu O(1)'dir; histogram hiç yeniden sıralanmaz.
+    """
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        # En uzun süreli kargo; eşitlikte en küçük ID (ID sırasındaki ilk kayıt) tutulur
+        self.longest = None
+        self.histogram = {}
+        # Histogram anahtarları artan sırada
+        self.keys = []
+        # QUANTILES sırasıyla [anahtar sırası, kümülatif adet] imleçleri
+        self.cursors = [[0, 0] for _ in self.QUANTILES]
+        # En uzun ve en kısa TOPK_CAPACITY teslimat (sınırlı heap'ler)
+        self.slowest = BoundedTopK(TOPK_CAPACITY, slowest_key)
+        self.fastest = BoundedTopK(TOPK_CAPACITY, fastest_key)
+
+    def add(self, shipment):
+        delivery_time = shipment[3]
+        self.count += 1
+        self.total += delivery_time
+        if self.min is None or delivery_time < self.min:
+            self.min = delivery_time
+        if (self.longest is None or delivery_time > self.max
+                or (delivery_time == self.max and shipment[0] < self.longest[0])):
+            self.max = delivery_time
+            self.longest = shipment
+        self._add_to_histogram(delivery_time)
+        self.slowest.push(shipment)
+        self.fastest.push(shipment)
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @staticmethod
+    def rank(q, count):
+        # Yüzdeliğin sırası (1 tabanlı, nearest-rank); round float hatasını giderir
+        return max(1, math.ceil(round(q * count, 9)))
+
+    def _add_to_histogram(self, value):
+        """
+        Süreyi histograma ekler ve yüzdelik imleçlerini kaydırır.
+        İmleç değişmezi: cum, keys[index] dahil kümülatif adettir ve
+        cum - histogram[keys[index]] < hedef sıra <= cum.
+        """
+        histogram = self.histogram
+        keys = self.keys
+        # Yeni sürenin sıralı listedeki yeri; mevcut süre için None
+        position = None
+        if value not in histogram:
+            position = bisect_left(keys, value)
+            keys.insert(position, value)
+        histogram[value] = histogram.get(value, 0) + 1
+        for q, cursor in zip(self.QUANTILES, self.cursors):
+            index, cum = cursor
+            if self.count == 1:
+                index, cum = 0, 1
+            else:
+                # İmlecin soluna yeni anahtar eklendiyse imlecin anahtarı bir sağa kaymıştır
+                if position is not None and position <= index:
+                    index += 1
+                if value <= keys[index]:
+                    cum += 1
+            target = self.rank(q, self.count)
+            while cum < target:
+                index += 1
+                cum += histogram[keys[index]]
+            while cum - histogram[keys[index]] >= target:
+                cum -= histogram[keys[index]]
+                index -= 1
+            cursor[0] = index
+            cursor[1] = cum
+
+    def quantiles(self):
+        """
+        {0.5: p50, 0.95: p95, 0.99: p99} (nearest-rank); kayıt yoksa değerler None
+        """
+        if not self.count:
+            return dict.fromkeys(self.QUANTILES)
+        return {q: self.keys[index] for q, (index, _) in zip(self.QUANTILES, self.cursors)}
+
+class RollingMean:
+    """
+    Son window değerin ortalaması; toplam ayrıca tutulur. Değerler array("q") üzerinde
+    halka tampon olarak saklanır (değer başına 8 bayt; deque bloklarından ve int
+    nesnelerinden küçük), tampon pencere dolana kadar gerektiği kadar büyür.
+    Ekleme ve ortalama O(1), bellek window ile sınırlı.
+    """
+    __slots__ = ("window", "values", "start", "total")
+
+    def __init__(self, window=PREDICTION_WINDOW):
+        self.window = window
+        self.values = array("q")
+        # Pencere doluyken en eski değerin konumu
+        self.start = 0
+        self.total = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, value):
+        values = self.values
+        if len(values) < self.window:
+            values.append(value)
+        else:
+            self.total -= values[self.start]
+            values[self.start] = value
+            self.start = (self.start + 1) % self.window
+        self.total += value
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else None
+
+    def ordered(self):
+        """
+        Penceredeki değerler eskiden yeniye
+        """
+        return self.values[self.start:].tolist() + self.values[:self.start].tolist()
+
+class DeliveryTimePredictor:
+    """
+    Teslim edilmiş kargoların teslim sürelerinden beklenen teslim süresini tahmin eder.
+    (çıkış, varış) şube çifti, müşteri ve tüm teslimatlar için ayrı RollingMean tutulur;
+    her teslimatta yalnızca ilgili üç ortalama güncellenir, geçmiş yeniden taranmaz.
+    """
+    def __init__(self, store, window=PREDICTION_WINDOW):
+        self.store = store
+        self.window = window
+        self.by_route = {}
+        self.by_customer = {}
+        self.overall = RollingMean(window)
+
+    def add(self, row):
+        """
+        Teslim edilen satırı ilgili ortalamalara ekler (O(1)). Teslim süresi tahminle atanmış
+        satırlar atlanır; aksi halde ortalamalar kendi tahminlerini öğrenip kendini besler.
+        """
+        store = self.store
+        if store.predicted[row]:
+            return
+        delivery_time = store.delivery_times[row]
+        route = store.route(row)
+        if route is not None:
+            rolling = self.by_route.get(route)
+            if rolling is None:
+                rolling = self.by_route[route] = RollingMean(self.window)
+            rolling.add(delivery_time)
+        customer_id = store.customer_ids[row]
+        rolling = self.by_customer.get(customer_id)
+        if rolling is None:
+            rolling = self.by_customer[customer_id] = RollingMean(self.window)
+        rolling.add(delivery_time)
+        self.overall.add(delivery_time)
+
+    def to_snapshot(self):
+        """
+        Pencere içerikleri teslim sırasıyla; restore aynı sırayla doldurduğu için yeniden
+        başlatma tahminleri değiştirmez.
+        """
+        return {
+            "routes": [[origin_id, destination_id, rolling.ordered()]
+                       for (origin_id, destination_id), rolling in self.by_route.items()],
+            "customers": [[customer_id, rolling.ordered()]
+                          for customer_id, rolling in self.by_customer.items()],
+            "all": self.overall.ordered(),
+        }
+
+    def restore(self, data):
+        for origin_id, destination_id, values in data["routes"]:
+            rolling = self.by_route[(origin_id, destination_id)] = RollingMean(self.window)
+            for value in values:
+                rolling.add(value)
+        for customer_id, values in data["customers"]:
+            rolling = self.by_customer[customer_id] = RollingMean(self.window)
+            for value in values:
+                rolling.add(value)
+        for value in data["all"]:
+            self.overall.add(value)
+
+    def predict(self, customer_id, origin_id=None, destination_id=None):
+        """
+        (tahmini gün, kaynak, örnek sayısı) ya da hiç teslimat yoksa None (O(1)).
+        Önce şube çiftinin, yoksa müşterinin, o da yoksa tüm teslimatların ortalaması kullanılır.
+        """
+        candidates = (
+            (PREDICT_ROUTE, self.by_route.get((origin_id, destination_id))),
+            (PREDICT_CUSTOMER, self.by_customer.get(customer_id)),
+            (PREDICT_ALL, self.overall),
+        )
+        for source, rolling in candidates:
+            if rolling:
+                return round(rolling.mean()), source, len(rolling)
+        return None
+
+class DeliveredIndex:
+    """
+    Teslim edilmiş kargoları ID'ye göre sıralı tutan kalıcı index.
+    Kargolar ShipmentStore satır numarası olarak, ID'leriyle birlikte iki paralel array'de tutulur.
+    Her teslimatta bisect ile doğru yere eklenir, sorgu başına sıralama gerekmez.
+    Teslim süresi istatistikleri (DeliveryStats) ve tahmin ortalamaları (DeliveryTimePredictor)
+    her eklemede birlikte güncellenir.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.ids = array("q")
+        self.rows = array(ROW_TYPECODE)
+        self.stats = DeliveryStats()
+        self.predictor = DeliveryTimePredictor(store)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        shipment = self.store.shipment
+        return (shipment(row) for row in self.rows)
+
+    def insert(self, row):
+        """
+        Satırı kargo ID'sine göre sıralı konumuna ekler (O(log n) arama + array kaydırma)
+        """
+        shipment_id = self.store.ids[row]
+        i = bisect_right(self.ids, shipment_id)
+        self.ids.insert(i, shipment_id)
+        self.rows.insert(i, row)
+        self.stats.add(self.store.shipment(row))
+        self.predictor.add(row)
+
+    def insert_many(self, rows, learn=True):
+        """
+        Birden çok satırı ekleyip index'i tek bir sıralamayla yeniden düzenler.
+        Mevcut dizi zaten sıralı olduğu için Timsort bunu birleştirme olarak yapar;
+        yeni kayıtlar sona düşüyorsa sıralama hiç yapılmaz.
+        """
+        store = self.store
+        # Tahmin ortalamaları teslim sırasıyla beslenir (pencere en son teslimatları tutar).
+        # learn=False: pencereler ayrıca (ör. snapshot'tan) doldurulacak
+        if learn:
+            for row in rows:
+                self.predictor.add(row)
+        entries = sorted((store.ids[row], row) for row in rows)
+        if not entries:
+            return
+        for _, row in entries:
+            self.stats.add(store.shipment(row))
+        if self.ids and entries[0][0] < self.ids[-1]:
+            entries = sorted(list(zip(self.ids, self.rows)) + entries, key=itemgetter(0))
+            self.ids = array("q")
+            self.rows = array(ROW_TYPECODE)
+        # Yeni ID'ler hepsi sondakilerden büyükse sadece sona eklenir
+        self.ids.extend(shipment_id for shipment_id, _ in entries)
+        self.rows.extend(row for _, row in entries)
+
+    def find(self, shipment_id):
+        """
+        ID'ye göre nokta sorgusu (O(log n))
+        """
+        i = binary_search_delivered(self.ids, shipment_id)
+        return None if i is None else self.store.shipment(self.rows[i])
+
+    def range(self, low_id, high_id):
+        """
+        low_id <= ID <= high_id aralığındaki kargoları sırayla döndürür (O(log n + k))
+        """
+        start = bisect_left(self.ids, low_id)
+        end = bisect_right(self.ids, high_id)
+        for i in range(start, end):
+            yield self.store.shipment(self.rows[i])
+
+def merge_sort_shipments(arr):
+    """
+    Teslim edilmemiş kargoları teslim süresine göre merge sort (O(n log n)).
+    Her seviyede dilim kopyaladığı için referans yöntem olarak tutulur; bkz. sort_shipments.
+    """
+    if len(arr) > 1:
+        mid = len(arr)//2
+        left = arr[:mid]
+        right = arr[mid:]
+        merge_sort_shipments(left)
+        merge_sort_shipments(right)
+        i = j = k = 0
+        while i < len(left) and j < len(right):
+            if left[i][3] < right[j][3]:
+                arr[k] = left[i]
+                i += 1
+            else:
+                arr[k] = right[j]
+                j += 1
+            k += 1
+        while i < len(left):
+            arr[k] = left[i]
+            i += 1
+            k += 1
+        while j < len(right):
+            arr[k] = right[j]
+            j += 1
+            k += 1
+
+def sort_shipments(arr, method=SORT_INPLACE):
+    """
+    Kargo listesini teslim süresine göre yerinde sıralar.
+    SORT_INPLACE: list.sort (kararlı merge tabanlı Timsort) özyineleme ve seviye başına
+    dilimleme yapmaz, ek bellek en fazla n/2 referanstır; zaten sıralı parçaları (run) kullanır.
+    SORT_REFERENCE: merge_sort_shipments.
+    """
+    if method == SORT_REFERENCE:
+        merge_sort_shipments(arr)
+    elif method == SORT_INPLACE:
+        arr.sort(key=itemgetter(3))
+    else:
+        raise ValueError(f"Bilinmeyen sıralama yöntemi: {method}")
+
+def decode_lines(f, bad):
+    """
+    İkili dosyanın satırlarını UTF-8 olarak çözer (generator). Çözülemeyen satır hatalı
+    karakterler yerine U+FFFD konarak üretilir ve bad listesine işaret eklenir; böylece tek
+    bir bozuk bayt bütün yüklemeyi durdurmaz.
+    """
+    for raw in f:
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError:
+            bad.append(raw)
+            yield raw.decode("utf-8", "replace")
+
+def iter_shipment_rows(path):
+    """
+    CSV veya JSONL dosyasını satır satır okuyup her kaydı dict olarak üretir (generator).
+    Dosyanın tamamı belleğe alınmaz. Beklenen alanlar:
+    customer_id, shipment_id, date, status, delivery_time
+    UTF-8 olmayan ya da CSV olarak ayrıştırılamayan kayıtlar için None üretilir
+    (parse_shipment_row bunları reddeder, yükleme sonraki satırla sürer).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    bad = []
+    with open(path, "rb") as f:
+        lines = decode_lines(f, bad)
+        if ext in (".jsonl", ".ndjson"):
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    bad.clear()
+                    continue
+                if bad:
+                    bad.clear()
+                    yield None
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+        else:
+            reader = csv.DictReader(lines)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error:
+                    row = None
+                # Kaydın satırlarından biri çözülemediyse kayıt reddedilir
+                if bad:
+                    bad.clear()
+                    row = None
+                yield row
+
+def row_int(value):
+    """
+    Satır alanını tamsayıya çevirir. JSON'dan gelen değer gerçekten int olmalıdır (3.9 ya da
+    true sessizce 3/1'e dönmez); yalnızca CSV'den gelen metinler int() ile çözülür.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        return int(value)
+    raise TypeError(f"Tamsayı bekleniyordu: {value!r}")
+
+def parse_shipment_row(row):
+    """
+    Ham satırı doğrular ve (customer_id, shipment_id, date, status, delivery_time,
+    origin_id, destination_id) olarak döndürür; geçersizse ValueError fırlatır.
+    status durumun standart adına çevrilir. Çıkış/varış şubesi isteğe bağlıdır (yoksa None)
+    ama ikisi birlikte verilmelidir.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Satır çözümlenemedi")
+    try:
+        customer_id = row_int(row["customer_id"])
+        shipment_id = row_int(row["shipment_id"])
+        date = row_int(row["date"])
+        delivery_time = row_int(row["delivery_time"])
+        status = str(row["status"]).strip()
+        origin_id, destination_id = (
+            None if row.get(name) in (None, "") else row_int(row[name])
+            for name in ("origin_id", "destination_id")
+        )
+    except KeyError as e:
+        raise ValueError(f"Eksik alan: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise ValueError("Sayısal alanlar geçersiz")
+    if not all(value is None or is_int64(value)
+               for value in (customer_id, shipment_id, delivery_time, origin_id, destination_id)):
+        raise ValueError("Sayısal alanlar int64 aralığı dışında")
+    if not 10000101 <= date <= 99991231:
+        raise ValueError("Tarih YYYYMMDD formatında olmalı")
+    if delivery_time < 0:
+        raise ValueError("Teslim süresi negatif olamaz")
+    if not status:
+        raise ValueError("Durum boş olamaz")
+    state = parse_shipment_state(status)
+    if state is None:
+        raise ValueError(f"Geçersiz durum: {status} ({STATE_DELIVERED}/{STATE_UNDELIVERED} olmalı)")
+    if (origin_id is None) != (destination_id is None):
+        raise ValueError("Çıkış ve varış şubesi birlikte verilmeli")
+    return (customer_id, shipment_id, date, ShipmentState.label(state), delivery_time,
+            origin_id, destination_id)
+
+class TransactionHistory:
+    """
+    Sabit boyutlu ring buffer'da tutulan işlem geçmişi.
+    Kayıtlar (no, zaman, mesaj) biçimindedir. Buffer dolunca en eski kayıt taşar;
+    taşan kayıtlar HISTORY_SPILL_CHUNK'lık gruplar halinde spill_dir altına gzip'li
+    JSONL segmentleri olarak yazılır (spill_dir yoksa atılır). Bellek kullanımı sabittir.
+    """
+    def __init__(self, capacity=HISTORY_CAPACITY, spill_dir=None, spill_chunk=HISTORY_SPILL_CHUNK):
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.spill_chunk = spill_chunk
+        self.buffer = [None] * capacity
+        self.start = 0
+        self.count = 0
+        self.next_no = 1
+        # Taşmış ama henüz segmente yazılmamış kayıtlar
+        self.spill_pending = []
+
+    def __len__(self):
+        """
+        Şimdiye kadar eklenen toplam kayıt sayısı (diske taşanlar dahil)
+        """
+        return self.next_no - 1
+
+    def append(self, message, timestamp=None):
+        """
+        Yeni kaydı ekler; buffer doluysa en eski kaydı taşırır (O(1) amortize)
+        """
+        entry = (self.next_no, time.time() if timestamp is None else timestamp, message)
+        self.next_no += 1
+        if self.count < self.capacity:
+            self.buffer[(self.start + self.count) % self.capacity] = entry
+            self.count += 1
+            return entry
+        self._spill(self.buffer[self.start])
+        self.buffer[self.start] = entry
+        self.start = (self.start + 1) % self.capacity
+        return entry
+
+    def _spill(self, entry):
+        if self.spill_dir is None:
+            return
+        self.spill_pending.append(entry)
+        if len(self.spill_pending) >= self.spill_chunk:
+            first, last = self.spill_pending[0][0], self.spill_pending[-1][0]
+            path = os.path.join(self.spill_dir, f"history-{first:012d}-{last:012d}.jsonl.gz")
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                for e in self.spill_pending:
+                    f.write(json.dumps(e, ensure_ascii=False) + "\n")
+            self.spill_pending = []
+
+    def _segments_newest_first(self):
+        if self.spill_dir is None or not os.path.isdir(self.spill_dir):
+            return []
+        names = [n for n in os.listdir(self.spill_dir) if n.startswith("history-") and n.endswith(".jsonl.gz")]
+        return sorted(names, reverse=True)
+
+    def iter_newest(self):
+        """
+        Kayıtları en yeniden en eskiye üretir (generator); disk segmentleri
+        yalnızca o kadar geriye gidilirse okunur.
+        """
+        for i in range(self.count - 1, -1, -1):
+            yield self.buffer[(self.start + i) % self.capacity]
+        for entry in reversed(self.spill_pending):
+            yield entry
+        for name in self._segments_newest_first():
+            with gzip.open(os.path.join(self.spill_dir, name), "rt", encoding="utf-8") as f:
+                entries = [tuple(json.loads(line)) for line in f]
+            for entry in reversed(entries):
+                yield entry
+
+    def get_page(self, page_no, page_size=HISTORY_PAGE_SIZE):
+        """
+        En yeni kayıtlardan başlayarak page_no. sayfayı döndürür (O(sayfa_no * sayfa boyu)).
+        Dönüş: (kayıtlar, sonraki sayfa var mı)
+        """
+        start = page_no * page_size
+        entries = list(islice(self.iter_newest(), start, start + page_size + 1))
+        return entries[:page_size], len(entries) > page_size
+
+    def to_snapshot(self):
+        ring = [self.buffer[(self.start + i) % self.capacity] for i in range(self.count)]
+        return {"next_no": self.next_no, "pending": self.spill_pending, "ring": ring}
+
+    def restore(self, data):
+        """
+        to_snapshot çıktısını geri yükler; spill_dir ayarı korunur.
+        """
+        self.buffer = [None] * self.capacity
+        self.start = 0
+        self.count = 0
+        self.spill_pending = [tuple(e) for e in data["pending"]]
+        ring = [tuple(e) for e in data["ring"]]
+        # Kapasite küçülmüşse fazla kayıtlar taşma yoluna gider
+        for entry in ring[:max(0, len(ring) - self.capacity)]:
+            self._spill(entry)
+        for entry in ring[max(0, len(ring) - self.capacity):]:
+            self.buffer[self.count] = entry
+            self.count += 1
+        self.next_no = data["next_no"]
+
+class ShipmentRecord:
+    """
+    Kargo sorgusunun sonucu: kargo bilgisi, güncel durumu ve sahibi müşteri.
+    Kalıcı olarak tutulmaz; ShipmentStore.record ile istendiğinde üretilir.
+    """
+    __slots__ = ("shipment", "customer_id", "state")
+
+    def __init__(self, shipment, customer_id, state):
+        self.shipment = shipment
+        self.customer_id = customer_id
+        self.state = state
+
+##############################################################################
+#                           EŞZAMANLILIK
+##############################################################################
+
+class ReadWriteLock:
+    """
+    Çok okuyucu / tek yazar kilidi. Okuyucular birbirini beklemez; yazar tek başına girer.
+    Bekleyen bir yazar varken yeni okuyucu alınmaz, böylece okuma yoğun paneller
+    yazarları (kargo kabulü, teslimat) aç bırakmaz. Kilit reentrant değildir.
+    """
+    def __init__(self):
+        self.cond = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    def acquire_read(self):
+        with self.cond:
+            while self.writing or self.waiting_writers:
+                self.cond.wait()
+            self.readers += 1
+
+    def release_read(self):
+        with self.cond:
+            self.readers -= 1
+            if self.readers == 0:
+                self.cond.notify_all()
+
+    def acquire_write(self):
+        with self.cond:
+            self.waiting_writers += 1
+            while self.writing or self.readers:
+                self.cond.wait()
+            self.waiting_writers -= 1
+            self.writing = True
+
+    def release_write(self):
+        with self.cond:
+            self.writing = False
+            self.cond.notify_all()
+
+##############################################################################
+#                          CARGO SYSTEM SINIFI
+##############################################################################
+
+class CargoSystem:
+    """
+    Tüm çekirdek işlemler thread-safe'tir. Her yapının kendi okuyucu/yazar kilidi vardır;
+    birden çok yapıya dokunan işlemler kilitleri LOCK_ORDER sırasıyla alır (deadlock olmaz).
+    Log kaydı kilitler tutulurken yazılır, böylece log sırası uygulama sırasıyla aynıdır.
+    """
+    # Kilitlerin alınma sırası
+    LOCK_ORDER = ("customers", "shipments", "pq", "delivered", "cities", "history")
+
+    def __init__(self):
+        self.locks = {name: ReadWriteLock() for name in self.LOCK_ORDER}
+        # Thread'in son yazdığı log kaydının seq'i; diske inmesi kilitler bırakılınca beklenir
+        self.pending_log = threading.local()
+        # Tüm kargoların tek kopyası; diğer yapılar satır numarası tutar.
+        # Teslim edilmemiş kargolar ayrıca tutulmaz: hepsi öncelik kuyruğundadır.
+        self.shipment_store = ShipmentStore()
+        self.customers = CustomerLinkedList(self.shipment_store)
+        self.priority_queue = CargoPriorityQueue()
+        self.delivered_shipments = DeliveredIndex(self.shipment_store)
+        # ((öncelik kuyruğu, sürüm), teslim süresine göre sıralı teslim edilmemişler); bkz. sorted_cargos
+        self.undelivered_sorted = None
+        self.transaction_history = TransactionHistory()
+        # Bağlıysa her değişiklik CargoStore log'una yazılır (bkz. CargoStore.load)
+        self.storage = None
+        self.root_city = CityNode(0, "Merkez")
+        c1 = CityNode(1, "İstanbul")
+        c2 = CityNode(2, "Ankara")
+        c3 = CityNode(3, "İzmir")
+        c4 = CityNode(4, "Bursa")
+        self.root_city.add_child(c1)
+        self.root_city.add_child(c2)
+        c2.add_child(c3)
+        c3.add_child(c4)
+        # Ağaçtaki bağlar yol ağının kenarlarıdır (süreler saat); Merkez'in konumu yok
+        self.route_graph = RouteGraph()
+        self.route_graph.add_city(0)
+        self.route_graph.add_city(1, (41.01, 28.98))
+        self.route_graph.add_city(2, (39.93, 32.86))
+        self.route_graph.add_city(3, (38.42, 27.14))
+        self.route_graph.add_city(4, (40.19, 29.06))
+        self.route_graph.connect(0, 1, 2)
+        self.route_graph.connect(0, 2, 2)
+        self.route_graph.connect(2, 3, 8)
+        self.route_graph.connect(3, 4, 5)
+        self.route_cache = RouteCache(self.root_city, self.route_graph)
+        # Şehir eklendikçe CityNode.size alanları eskir; ilk ağaç görünümünde yeniden hesaplanır
+        self.city_sizes_stale = True
+        self.city_sizes_lock = threading.Lock()
+
+    @contextmanager
+    def guard(self, read=(), write=()):
+        """
+        İstenen yapıların kilitlerini LOCK_ORDER sırasıyla alır, ters sırayla bırakır.
+        Yazma bloğundan çıkınca (kilitler bırakıldıktan sonra) log kaydının diske inmesi
+        beklenir ve gerekiyorsa snapshot alınır; böylece fsync beklerken kimse bloklanmaz.
+        """
+        plan = sorted(
+            [(self.LOCK_ORDER.index(name), name, False) for name in read]
+            + [(self.LOCK_ORDER.index(name), name, True) for name in write]
+        )
+        acquired = []
+        try:
+            for _, name, exclusive in plan:
+                lock = self.locks[name]
+                if exclusive:
+                    lock.acquire_write()
+                else:
+                    lock.acquire_read()
+                acquired.append((lock, exclusive))
+            yield
+        finally:
+            for lock, exclusive in reversed(acquired):
+                if exclusive:
+                    lock.release_write()
+                else:
+                    lock.release_read()
+        if write:
+            self._after_write()
+
+    def _after_write(self):
+        seq = getattr(self.pending_log, "seq", None)
+        storage = self.storage
+        if seq is None or storage is None:
+            return
+        self.pending_log.seq = None
+        storage.wait(seq)
+        storage.maybe_checkpoint(self)
+
+    def add_history(self, message, timestamp=None):
+        """
+        İşlem geçmişine yeni bir kayıt ekler.
+        """
+        with self.guard(write=("history",)):
+            entry = self.transaction_history.append(message, timestamp)
+            self._log({"op": "history", "message": message, "ts": entry[1]})
+
+    def _log(self, record):
+        """
+        Değişikliği (varsa) kalıcı depolamanın log'una ekler; ilgili yazma kilidi tutulurken çağrılır.
+        """
+        if self.storage is not None:
+            self.pending_log.seq = self.storage.append(record, wait=False)
+
+    def create_customer(self, customer_id, name, surname):
+        """
+        Yeni müşteri ekler; ID zaten varsa ya da int64 aralığında değilse False döner (O(1))
+        """
+        if not is_int64(customer_id):
+            return False
+        with self.guard(write=("customers",)):
+            if not self.customers.add_customer(customer_id, name, surname):
+                return False
+            self._log({"op": "add_customer", "customer_id": customer_id, "name": name, "surname": surname})
+        return True
+
+    def delete_customer(self, customer_id):
+        """
+        Müşteriyi siler; bulunamazsa False döner (O(1))
+        """
+        with self.guard(write=("customers",)):
+            if not self.customers.remove_customer(customer_id):
+                return False
+            self._log({"op": "remove_customer", "customer_id": customer_id})
+        return True
+
+    def insert_city(self, parent_id, city_id, city_name, hours=DEFAULT_ROUTE_HOURS, location=None):
+        """
+        Yeni şehri parent_id'li şehrin altına ekler ve ebeveyn şehrin adını döndürür;
+        ebeveyn yoksa, city_id zaten kayıtlıysa ya da süre geçersizse (negatif, NaN, sonsuz)
+        None döner (O(1)).
+        Ebeveyne uzaklık (hours saat) yol ağına kenar olarak, location (enlem, boylam) A*
+        için eklenir.
+        """
+        if not is_route_hours(hours):
+            return None
+        with self.guard(write=("cities",)):
+            parent_node = self.find_city_by_id(self.root_city, parent_id)
+            if parent_node is None:
+                return None
+            if not parent_node.add_child(CityNode(city_id, city_name)):
+                return None
+            self.route_graph.add_city(city_id, location)
+            self.route_graph.connect(parent_id, city_id, hours)
+            self.route_cache.add_leaf(city_id, parent_id, hours)
+            self.city_sizes_stale = True
+            record = {"op": "add_city", "parent_id": parent_id, "city_id": city_id, "name": city_name,
+                      "hours": hours}
+            if location is not None:
+                record["location"] = list(location)
+            self._log(record)
+        return parent_node.city_name
+
+    def connect_cities(self, city_a, city_b, hours):
+        """
+        İki şube arasına ağaç dışı (doğrudan) yol ekler ya da yolun süresini günceller.
+        Şubelerden biri yoksa, aynıysa ya da süre geçersizse (negatif, NaN, sonsuz) False döner (O(1)).
+        """
+        with self.guard(write=("cities",)):
+            if not self.route_graph.connect(city_a, city_b, hours):
+                return False
+            # Yeni yol herhangi iki şube arasındaki rotayı kısaltabilir
+            self.route_cache.invalidate()
+            self._log({"op": "connect_cities", "city_a": city_a, "city_b": city_b, "hours": hours})
+        return True
+
+    def drop_undelivered_shipments(self):
+        """
+        Tüm teslim edilmemiş kargoları siler ve silinen sayıyı döndürür.
+        """
+        with self.guard(write=("shipments", "pq")):
+            count = len(self.priority_queue)
+            for item in self.priority_queue.heap:
+                self.shipment_store.drop(item[1])
+            # PQ yalnızca teslim edilmemiş kargoları tuttuğu için topluca boşaltılır (O(1))
+            self.priority_queue.clear()
+            self._log({"op": "clear_undelivered"})
+        return count
+
+    def find_shipment(self, shipment_id):
+        """
+        Global index'ten kargo kaydını (ShipmentRecord) döndürür; yoksa None (O(1))
+        """
+        with self.guard(read=("shipments",)):
+            row = self.shipment_store.find(shipment_id)
+            return None if row is None else self.shipment_store.record(row)
+
+    def _register_shipment(self, customer, shipment_id, date, status, delivery_time, state,
+                           origin_id=None, destination_id=None, predicted=False):
+        """
+        Kargoyu müşteri geçmişine, PQ'ya, ilgili listeye ve global index'e ekler.
+        predicted: teslim süresi tahminden geldi. Aynı ID zaten kayıtlıysa False döner.
+        Çağıran tüm ilgili yazma kilitlerini tutar.
+        """
+        store = self.shipment_store
+        if shipment_id in store or not store.fits(shipment_id, date, delivery_time, customer.customer_id):
+            return False
+        row = store.add(shipment_id, date, status, delivery_time, customer.customer_id, state,
+                        origin_id, destination_id, predicted)
+        customer.shipment_history.insert_sorted(row, date)
+        customer.push_last_shipment(row)
+        if state == ShipmentState.UNDELIVERED:
+            self.priority_queue.add_cargo(shipment_id, delivery_time, STATE_PROCESSING)
+        else:
+            self.delivered_shipments.insert(row)
+        record = {
+            "op": "add_shipment", "customer_id": customer.customer_id, "shipment_id": shipment_id,
+            "date": date, "status": status, "delivery_time": delivery_time
+        }
+        if origin_id is not None:
+            record["origin_id"] = origin_id
+            record["destination_id"] = destination_id
+        if predicted:
+            record["predicted"] = True
+        self._log(record)
+        return True
+
+    def _route_known(self, origin_id, destination_id):
+        """
+        Kargonun rotası ya hiç verilmemiş ya da iki şubesi de yol ağında kayıtlı mı.
+        Çağıran "cities" kilidini tutar.
+        """
+        if origin_id is None and destination_id is None:
+            return True
+        return origin_id in self.route_graph and destination_id in self.route_graph
+
+    def _apply_shipment_batch(self, rows):
+        """
+        Biçimi doğrulanmış (customer_id, shipment_id, date, status, delivery_time, origin_id,
+        destination_id) grubunu yapılara aktarır; PQ ve teslim edilmiş index'e toplu ekleme yapılır.
+        Müşteri/ID/şube kontrolleri kilit altında yapılır. Dönüş: {satır sırası: neden} (reddedilenler)
+        """
+        rejected = {}
+        with self.guard(read=("cities",), write=("customers", "shipments", "pq", "delivered")):
+            batch = []
+            seen = set()
+            for i, (customer_id, shipment_id, date, status, delivery_time,
+                    origin_id, destination_id) in enumerate(rows):
+                customer = self.customers.find_customer(customer_id)
+                if customer is None:
+                    rejected[i] = f"Müşteri bulunamadı (ID={customer_id})"
+                elif not ShipmentStore.fits(shipment_id, date, delivery_time, customer_id):
+                    rejected[i] = f"Sayısal alanlar int64 aralığı dışında (ID={shipment_id})"
+                elif shipment_id in self.shipment_store or shipment_id in seen:
+                    rejected[i] = f"Kargo ID zaten mevcut (ID={shipment_id})"
+                elif not self._route_known(origin_id, destination_id):
+                    rejected[i] = f"Şube bulunamadı (ID={origin_id}/{destination_id})"
+                else:
+                    seen.add(shipment_id)
+                    batch.append((customer, shipment_id, date, status, delivery_time,
+                                  origin_id, destination_id))
+            if batch:
+                self._insert_shipments(batch)
+        return rejected
+
+    def _insert_shipments(self, batch):
+        """
+        Doğrulanmış grubu yapılara ekler. Satırlar _apply_shipment_batch'te (ShipmentStore.fits
+        dahil) önceden kontrol edildiği için store.add burada başarısız olmaz; grup ya tamamen
+        eklenir ya da hiç dokunulmaz.
+        """
+        store = self.shipment_store
+        pq_items = []
+        delivered = []
+        for customer, shipment_id, date, status, delivery_time, origin_id, destination_id in batch:
+            state = stored_shipment_state(status)
+            row = store.add(shipment_id, date, status, delivery_time, customer.customer_id, state,
+                            origin_id, destination_id)
+            customer.shipment_history.insert_sorted(row, date)
+            customer.push_last_shipment(row)
+            if state == ShipmentState.UNDELIVERED:
+                pq_items.append((shipment_id, delivery_time, STATE_PROCESSING))
+            else:
+                delivered.append(row)
+        self.priority_queue.add_many(pq_items)
+        self.delivered_shipments.insert_many(delivered)
+        self._log({
+            "op": "add_shipments",
+            "rows": [[c.customer_id, *rest] for c, *rest in batch]
+        })
+
+    def load_shipments_from_file(self, path, batch_size=LOAD_BATCH_SIZE):
+        """
+        CSV/JSONL dosyasından kargoları akış halinde yükler.
+        Satırlar generator ile okunur, doğrulanır ve batch_size'lık gruplar halinde
+        yapılara eklenir. Dönüş: yükleme istatistikleri (dict)
+        """
+        loaded = 0
+        rejected = 0
+        errors = []
+        batch = []
+        line_nos = []
+        start = time.perf_counter()
+
+        def apply_batch():
+            nonlocal loaded, rejected
+            failed = self._apply_shipment_batch(batch)
+            loaded += len(batch) - len(failed)
+            rejected += len(failed)
+            for i, reason in failed.items():
+                if len(errors) < MAX_LOAD_ERRORS:
+                    errors.append(f"Satır {line_nos[i]}: {reason}")
+
+        for line_no, row in enumerate(iter_shipment_rows(path), start=1):
+            try:
+                batch.append(parse_shipment_row(row))
+            except ValueError as e:
+                rejected += 1
+                if len(errors) < MAX_LOAD_ERRORS:
+                    errors.append(f"Satır {line_no}: {e}")
+                continue
+            line_nos.append(line_no)
+            if len(batch) >= batch_size:
+                apply_batch()
+                batch = []
+                line_nos = []
+        if batch:
+            apply_batch()
+        elapsed = time.perf_counter() - start
+        return {
+            "loaded": loaded,
+            "rejected": rejected,
+            "errors": errors,
+            "seconds": elapsed,
+            "rows_per_sec": (loaded + rejected) / elapsed if elapsed > 0 else 0.0,
+        }
+
+    def deliver_shipment(self, shipment_id):
+        """
+        Teslim edilmemiş kargoyu teslim edildi durumuna geçirir.
+        Index üzerinden bulunur, liste kaydırması yapılmaz (O(1) + PQ O(log n)).
+        Dönüş: (teslim edilen kargo, PQ'dan çıkarıldı mı); bulunamazsa (None, False)
+        """
+        with self.guard(write=("shipments", "pq", "delivered")):
+            store = self.shipment_store
+            row = store.find(shipment_id)
+            if row is None or not store.deliver(row):
+                return None, False
+            removed = self.priority_queue.remove_cargo_by_id(shipment_id)
+            self.delivered_shipments.insert(row)
+            self._log({"op": "deliver", "shipment_id": shipment_id})
+            return store.shipment(row), removed
+
+    def deliver_shipments_batch(self, shipment_ids):
+        """
+        Birden çok kargoyu tek geçişte teslim edildi durumuna geçirir.
+        PQ bir kez yeniden kurulur, teslim edilenler index'e topluca eklenir.
+        Dönüş: (teslim edilen kargolar, {bulunamayan_id: neden})
+        """
+        rows = []
+        failed = {}
+        with self.guard(write=("shipments", "pq", "delivered")):
+            store = self.shipment_store
+            for shipment_id in shipment_ids:
+                row = store.find(shipment_id)
+                if row is None:
+                    failed[shipment_id] = "Kargo bulunamadı"
+                    continue
+                if not store.deliver(row):
+                    failed[shipment_id] = "Kargo zaten teslim edilmiş"
+                    continue
+                rows.append(row)
+            delivered = [store.shipment(row) for row in rows]
+            if rows:
+                self.priority_queue.remove_many({sh[0] for sh in delivered})
+                self.delivered_shipments.insert_many(rows)
+                self._log({"op": "deliver_batch", "shipment_ids": [sh[0] for sh in delivered]})
+        return delivered, failed
+
+    def apply_record(self, record):
+        """
+        Log kaydını sisteme yeniden uygular (replay).
+        """
+        op = record["op"]
+        if op == "history":
+            self.add_history(record["message"], record.get("ts"))
+        elif op == "add_customer":
+            self.create_customer(record["customer_id"], record["name"], record["surname"])
+        elif op == "remove_customer":
+            self.delete_customer(record["customer_id"])
+        elif op == "add_shipment":
+            # Eski loglardaki serbest durum metinleri de kaydedildikleri kurala göre uygulanır
+            self._add_shipment(
+                record["customer_id"], record["shipment_id"], record["date"],
+                record["status"], record["delivery_time"], stored_shipment_state(record["status"]),
+                record.get("origin_id"), record.get("destination_id"), record.get("predicted", False)
+            )
+        elif op == "add_shipments":
+            # Rota alanlarından önceki kayıtlarda satırlar 5 elemanlıdır
+            self._apply_shipment_batch([(tuple(row) + (None, None))[:7] for row in record["rows"]])
+        elif op == "deliver":
+            self.deliver_shipment(record["shipment_id"])
+        elif op == "deliver_batch":
+            self.deliver_shipments_batch(record["shipment_ids"])
+        elif op == "add_city":
+            self.insert_city(record["parent_id"], record["city_id"], record["name"],
+                             record.get("hours", DEFAULT_ROUTE_HOURS), record.get("location"))
+        elif op == "connect_cities":
+            self.connect_cities(record["city_a"], record["city_b"], record["hours"])
+        elif op == "clear_undelivered":
+            self.drop_undelivered_shipments()
+        else:
+            raise ValueError(f"Bilinmeyen log kaydı: {op}")
+
+    def to_snapshot(self):
+        """
+        Sistemin tüm durumunu JSON'a yazılabilir bir dict olarak döndürür.
+        Çağıran tüm kilitleri (en az okuma modunda) tutmalıdır; bkz. CargoStore.checkpoint.
+        """
+        store = self.shipment_store
+        customers = []
+        # Bir müşterinin geçmişinde bulunan satırlar (satır başına 1 bayt)
+        in_history = bytearray(len(store.ids))
+        for c in self.customers.get_all_customers():
+            for rows in c.shipment_history.row_blocks:
+                for row in rows:
+                    in_history[row] = 1
+            customers.append({
+                "customer_id": c.customer_id,
+                "name": c.name,
+                "surname": c.surname,
+                "shipments": c.shipment_history.get_all_shipments(),
+                "last_shipments": [store.as_created(row) for row in c.last_shipments_stack],
+            })
+        shipments = []
+        for row in store.registered_rows():
+            r = store.record(row)
+            origin_id, destination_id = store.route(row) or (None, None)
+            shipments.append([r.shipment[0], r.customer_id, r.shipment[1], r.shipment[2], r.shipment[3],
+                              r.state, origin_id, destination_id, store.predicted[row]])
+        # Silinmiş kargolar müşteri geçmişinden geri kurulur; müşterisi silinmiş olanlar
+        # hiçbir geçmişte olmadığından ayrıca saklanır, yoksa Silindi sayacı açılışta azalır
+        removed = []
+        for row in store.iter_state(ShipmentState.REMOVED):
+            if not in_history[row]:
+                sid, date, status, delivery_time = store.as_created(row)
+                origin_id, destination_id = store.route(row) or (None, None)
+                removed.append([sid, store.customer_ids[row], date, status, delivery_time,
+                                origin_id, destination_id, store.predicted[row]])
+        cities = [[None, self.root_city.city_id, self.root_city.city_name]]
+        q = deque([self.root_city])
+        while q:
+            node = q.popleft()
+            for c in node.children:
+                cities.append([node.city_id, c.city_id, c.city_name])
+                q.append(c)
+        return {
+            "customers": customers,
+            "shipments": shipments,
+            "removed": removed,
+            "cities": cities,
+            "routes": self.route_graph.to_snapshot(),
+            "predictor": self.delivered_shipments.predictor.to_snapshot(),
+            "history": self.transaction_history.to_snapshot(),
+        }
+
+    def restore_snapshot(self, data):
+        """
+        to_snapshot çıktısından tüm yapıları yeniden kurar.
+        """
+        with self.guard(write=self.LOCK_ORDER):
+            self._restore_snapshot(data)
+
+    def _restore_snapshot(self, data):
+        store = self.shipment_store = ShipmentStore()
+        self.priority_queue = CargoPriorityQueue()
+        self.delivered_shipments = DeliveredIndex(store)
+        # Kayıtlı kargolar önce, ekleme sırasıyla satır alır (sorted_cargos eşitlikte bu sırayı kullanır)
+        index_rows = {}
+        pq_items = []
+        delivered = []
+        for entry in data["shipments"]:
+            # Rota alanlarından önceki snapshot'larda kayıtlar 6, tahmin bayrağından öncekilerde 8 elemanlıdır
+            sid, customer_id, date, status, delivery_time, state, origin_id, destination_id, predicted = \
+                (entry + [None, None, 0])[:9]
+            state = ShipmentState.UNDELIVERED if state == STATE_UNDELIVERED else ShipmentState.DELIVERED
+            row = store.add(sid, date, status, delivery_time, customer_id, state, origin_id, destination_id,
+                            bool(predicted))
+            index_rows[(customer_id, sid, date, delivery_time)] = row
+            if state == ShipmentState.UNDELIVERED:
+                pq_items.append((sid, delivery_time, STATE_PROCESSING))
+            else:
+                delivered.append(row)
+        self.priority_queue.add_many(pq_items)
+        # Tahmin pencereleri teslim sırasıyla kaydedilmiştir; satır sırasıyla doldurmak sırayı
+        # bozar. Tahmin verisinden önceki snapshot'larda satır sırası kullanılır.
+        predictor = data.get("predictor")
+        self.delivered_shipments.insert_many(delivered, learn=predictor is None)
+        if predictor is not None:
+            self.delivered_shipments.predictor.restore(predictor)
+        self.customers = CustomerLinkedList(store)
+        # Başa ekleme yapıldığı için ters sırayla eklenir, böylece liste sırası korunur
+        for c in reversed(data["customers"]):
+            customer_id = c["customer_id"]
+            self.customers.add_customer(customer_id, c["name"], c["surname"])
+            node = self.customers.find_customer(customer_id)
+            own_rows = {}
+            for sid, date, status, delivery_time in c["shipments"]:
+                # Geçmişteki gönderi kayıtlı kargonun satırını paylaşır; eklenirken girilen
+                # durum metni geçmişten alınır. Temizlenmiş kargolar ayrı satır alır.
+                row = index_rows.pop((customer_id, sid, date, delivery_time), None)
+                if row is None:
+                    row = store.add(sid, date, status, delivery_time, customer_id, ShipmentState.REMOVED)
+                else:
+                    store.statuses[row] = store.status_code(status)
+                node.shipment_history.append(row, date)
+                own_rows[(sid, date, status, delivery_time)] = row
+            node.last_shipments_stack = [own_rows[tuple(sh)] for sh in c["last_shipments"]]
+        # Müşterisi silinmiş, silinmiş kargolar (bu alandan önceki snapshot'larda yoktur)
+        for sid, customer_id, date, status, delivery_time, origin_id, destination_id, predicted \
+                in data.get("removed", ()):
+            store.add(sid, date, status, delivery_time, customer_id, ShipmentState.REMOVED,
+                      origin_id, destination_id, bool(predicted))
+        # Şehirler ebeveynleri önce gelecek sırayla (BFS) kaydedilmiştir
+        self.route_graph = RouteGraph()
+        routes = data.get("routes")
+        for parent_id, city_id, city_name in data["cities"]:
+            node = CityNode(city_id, city_name)
+            if parent_id is None:
+                self.root_city = node
+            elif not self.root_city.find(parent_id).add_child(node):
+                continue
+            self.route_graph.add_city(city_id)
+            # Yol ağından önceki snapshot'larda ağaç bağları varsayılan süreyi alır
+            if routes is None and parent_id is not None:
+                self.route_graph.connect(parent_id, city_id, DEFAULT_ROUTE_HOURS)
+        if routes is not None:
+            for city_id, lat, lon in routes["locations"]:
+                self.route_graph.add_city(city_id, (lat, lon))
+            for city_a, city_b, hours in routes["edges"]:
+                self.route_graph.connect(city_a, city_b, hours)
+        self.route_cache = RouteCache(self.root_city, self.route_graph)
+        self.city_sizes_stale = True
+        self.transaction_history.restore(data["history"])
+
+    def find_city_by_id(self, root, city_id):
+        """
+        root'un ağacında city_id'li şehri ID index'inden döndürür; yoksa None (O(1))
+        """
+        return root.find(city_id)
+
+    # ------------------------------------------------------------------
+    # Sorgular: arayüzden bağımsız, sadece veri döndüren metodlar
+    # ------------------------------------------------------------------
+
+    def get_customer(self, customer_id):
+        """
+        (customer_id, name, surname) ya da müşteri yoksa None (O(1))
+        """
+        with self.guard(read=("customers",)):
+            c = self.customers.find_customer(customer_id)
+            if c is None:
+                return None
+            return (c.customer_id, c.name, c.surname)
+
+    def add_shipment(self, customer_id, shipment_id, date, status, delivery_time=None,
+                     origin_id=None, destination_id=None):
+        """
+        Müşteri ID'si üzerinden kargo ekler. Durum parse_shipment_state ile tanınan bir ad
+        olmalıdır ve standart adıyla saklanır. Rota (çıkış ve varış şubesi) isteğe bağlıdır.
+        delivery_time verilmezse geçmiş teslimatlardan tahmin edilir (bkz. predict_delivery_time).
+        Durum geçersizse, müşteri ya da şubelerden biri yoksa, tahmin için teslimat yoksa
+        veya kargo ID'si zaten kayıtlıysa False döner.
+        """
+        state = parse_shipment_state(status)
+        if state is None:
+            return False
+        return self._add_shipment(customer_id, shipment_id, date, ShipmentState.label(state),
+                                  delivery_time, state, origin_id, destination_id)
+
+    def _add_shipment(self, customer_id, shipment_id, date, status, delivery_time, state,
+                      origin_id=None, destination_id=None, predicted=False):
+        # Teslim edilmemiş kargo PQ'ya, teslim edilmiş kargo teslim index'ine girer
+        target = "delivered" if state == ShipmentState.DELIVERED else "pq"
+        # Tahmin gerekiyorsa teslim index'i de (en az okuma modunda) kilitlenir
+        read = ("cities",) if delivery_time is not None or target == "delivered" else ("cities", "delivered")
+        with self.guard(read=read, write=("customers", "shipments", target)):
+            customer = self.customers.find_customer(customer_id)
+            if customer is None or not self._route_known(origin_id, destination_id):
+                return False
+            if delivery_time is None:
+                prediction = self.delivered_shipments.predictor.predict(customer_id, origin_id, destination_id)
+                if prediction is None:
+                    return False
+                delivery_time = prediction[0]
+                predicted = True
+            return self._register_shipment(customer, shipment_id, date, status, delivery_time, state,
+                                           origin_id, destination_id, predicted)
+
+    def predict_delivery_time(self, customer_id, origin_id=None, destination_id=None):
+        """
+        Yeni kargo için beklenen teslim süresi: (gün, kaynak, örnek sayısı); kaynak PREDICT_ROUTE,
+        PREDICT_CUSTOMER ya da PREDICT_ALL'dır. Hiç teslimat yoksa None (O(1))
+        """
+        with self.guard(read=("delivered",)):
+            return self.delivered_shipments.predictor.predict(customer_id, origin_id, destination_id)
+
+    def search_delivered(self, shipment_id):
+        """
+        Teslim edilmiş kargolar arasında ID ile arama (O(log n))
+        """
+        with self.guard(read=("delivered",)):
+            return self.delivered_shipments.find(shipment_id)
+
+    def shipment_history_page(self, customer_id, start_date=None, end_date=None,
+                              page_size=HISTORY_PAGE_SIZE, cursor=None):
+        """
+        Müşterinin gönderim geçmişinden bir sayfa: (sayfa, sonraki cursor); müşteri yoksa None
+        """
+        with self.guard(read=("customers",)):
+            customer = self.customers.find_customer(customer_id)
+            if customer is None:
+                return None
+            return customer.shipment_history.get_page(start_date, end_date, page_size, cursor)
+
+    def last_shipments(self, customer_id):
+        """
+        Müşterinin son 5 gönderisi (en yeni önce); müşteri yoksa None
+        """
+        with self.guard(read=("customers",)):
+            customer = self.customers.find_customer(customer_id)
+            if customer is None:
+                return None
+            return customer.last_shipments()
+
+    def sorted_cargos(self, method=SORT_CACHED):
+        """
+        (ID'ye göre teslim edilmişler, teslim süresine göre teslim edilmemişler)
+        Kopya kilit altında alınır, sıralama kilit dışında sort_shipments ile yapılır.
+        SORT_CACHED: teslim edilmemiş kargolardaki her değişiklik öncelik kuyruğunu da
+        değiştirdiğinden, kuyruk (nesne, sürüm) aynı kaldıkça son sıralı liste kopyalanıp
+        döndürülür (O(n)); değiştiyse bir kez yerinde sıralanır.
+        """
+        with self.guard(read=("shipments", "pq", "delivered")):
+            delivered = list(self.delivered_shipments)
+            stamp = (self.priority_queue, self.priority_queue.version)
+            cache = self.undelivered_sorted
+            if method == SORT_CACHED and cache is not None and cache[0] == stamp:
+                return delivered, list(cache[1])
+            # Teslim edilmemişler durum listesinden, ekleme sırasıyla okunur (O(k))
+            store = self.shipment_store
+            undelivered = [store.shipment(row) for row in store.iter_state(ShipmentState.UNDELIVERED)]
+        if method == SORT_CACHED:
+            sort_shipments(undelivered)
+            # Kilit dışında saklanır; eski bir sonuç yazılsa bile damgası uyuşmayacağı için kullanılmaz
+            self.undelivered_sorted = (stamp, undelivered)
+            return delivered, list(undelivered)
+        sort_shipments(undelivered, method)
+        return delivered, undelivered
+
+    def priority_cargos(self):
+        """
+        Öncelik kuyruğundaki kargolar, teslim süresine göre artan
+        """
+        with self.guard(read=("pq",)):
+            return self.priority_queue.sorted_items()
+
+    def get_city(self, city_id):
+        """
+        (city_id, city_name, parent_id) ya da şehir yoksa None (O(1))
+        """
+        with self.guard(read=("cities",)):
+            node = self.root_city.find(city_id)
+            if node is None:
+                return None
+            parent_id = None if node.parent is None else node.parent.city_id
+            return (node.city_id, node.city_name, parent_id)
+
+    def _refresh_city_sizes(self):
+        """
+        Şehir ağacı değiştiyse alt ağaç boylarını yeniden hesaplar. Okuma kilidi altında
+        birden çok okuyucu gelebildiği için hesap ayrı bir kilitle tek seferde yapılır.
+        """
+        with self.city_sizes_lock:
+            if self.city_sizes_stale:
+                compute_subtree_sizes(self.root_city)
+                self.city_sizes_stale = False
+
+    def route_tree_page(self, root_id=None, max_depth=None, expanded=None, offset=0, limit=None):
+        """
+        Rota ağacının root_id'li şehirden (varsayılan: kök) başlayan görünümünden bir dilim:
+        (satırlar, sonraki satır var mı); şehir yoksa None. Satırlar iter_tree_lines ile
+        üretilir ve yalnızca offset + limit satıra kadar ilerlenir.
+        """
+        with self.guard(read=("cities",)):
+            root = self.root_city if root_id is None else self.root_city.find(root_id)
+            if root is None:
+                return None
+            if max_depth is not None or expanded is not None:
+                self._refresh_city_sizes()
+            lines = iter_tree_lines(root, max_depth, expanded)
+            if limit is None:
+                return list(islice(lines, offset, None)), False
+            page = list(islice(lines, offset, offset + limit + 1))
+            return page[:limit], len(page) > limit
+
+    def shortest_route(self):
+        """
+        BFS ile en kısa rota derinliği (O(n))
+        """
+        with self.guard(read=("cities",)):
+            return shortest_route_depth(self.root_city)
+
+    def route_between(self, source_id, target_id, method=ROUTE_CACHED):
+        """
+        İki şube arasındaki en kısa süreli rota: (toplam saat, [(şube ID, ad), ...]);
+        şubelerden biri yoksa ya da aralarında yol yoksa None. ROUTE_CACHED rota önbelleğini
+        kullanır (bkz. RouteCache), diğer yöntemler her seferinde arar (RouteGraph.shortest_path).
+        """
+        with self.guard(read=("cities",)):
+            return self._route_between(source_id, target_id, method)
+
+    def _route_between(self, source_id, target_id, method):
+        if method == ROUTE_CACHED:
+            found = self.route_cache.route(source_id, target_id)
+        else:
+            found = self.route_graph.shortest_path(source_id, target_id, method)
+        if found is None:
+            return None
+        hours, path = found
+        return hours, [(city_id, self.root_city.find(city_id).city_name) for city_id in path]
+
+    def shipment_eta(self, shipment_id, method=ROUTE_CACHED):
+        """
+        Kargonun çıkış şubesinden varış şubesine en kısa rotası ve tahmini varış tarihi:
+        (varış tarihi YYYYMMDD, toplam saat, [(şube ID, ad), ...]). Varış, gönderi tarihine
+        rota süresinin yukarı yuvarlanmış gün sayısı eklenerek bulunur.
+        Kargo yoksa, rotası girilmemişse ya da şubeler arasında yol yoksa None.
+        """
+        with self.guard(read=("shipments", "cities")):
+            store = self.shipment_store
+            row = store.find(shipment_id)
+            if row is None or store.route(row) is None:
+                return None
+            date = store.dates[row]
+            found = self._route_between(*store.route(row), method)
+        if found is None:
+            return None
+        hours, path = found
+        return date_after(date, math.ceil(hours / 24)), hours, path
+
+    def delivery_routes(self):
+        """
+        (ağacın satırları, en kısa rota derinliği)
+        """
+        with self.guard(read=("cities",)):
+            return print_tree(self.root_city), shortest_route_depth(self.root_city)
+
+    def longest_delivered(self):
+        """
+        En uzun teslim süreli teslim edilmiş kargo; yoksa None (O(1))
+        """
+        with self.guard(read=("delivered",)):
+            return self.delivered_shipments.stats.longest
+
+    def top_deliveries(self, k=10, slowest=True):
+        """
+        En uzun (slowest=True) ya da en kısa teslim süreli k teslim edilmiş kargo.
+        k <= TOPK_CAPACITY ise sürekli güncel tutulan heap'ten O(K log k);
+        daha büyük k için tüm liste sıralanmadan heapq.nlargest ile O(n log k).
+        """
+        key = slowest_key if slowest else fastest_key
+        with self.guard(read=("delivered",)):
+            stats = self.delivered_shipments.stats
+            tracker = stats.slowest if slowest else stats.fastest
+            if k <= tracker.capacity:
+                return tracker.top(k)
+            return heapq.nlargest(k, self.delivered_shipments, key=key)
+
+    def customers_by_name_page(self, page_size=HISTORY_PAGE_SIZE, cursor=None):
+        """
+        Ad, soyad ve ID'ye göre Türkçe alfabetik sıralı müşterilerden bir sayfa:
+        ([(customer_id, name, surname)], sonraki cursor). Sıralı index artımlı tutulduğu
+        için O(log n + sayfa boyu); son sayfada cursor None olur.
+        """
+        with self.guard(read=("customers",)):
+            ids, next_key = self.customers.name_order.get_page(page_size, cursor)
+            page = []
+            for cid in ids:
+                c = self.customers.index[cid]
+                page.append((c.customer_id, c.name, c.surname))
+            if next_key is None:
+                return page, None
+            c = self.customers.index[next_key[2]]
+            return page, (c.customer_id, c.name, c.surname)
+
+    def search_customers(self, query, limit=NAME_SEARCH_LIMIT, fuzzy=True):
+        """
+        Ad/soyad araması: büyük/küçük harf duyarsız (Türkçe), önek ve yazım hatası toleranslı.
+        En iyi eşleşmeler önce (customer_id, name, surname) listesi döner.
+        """
+        with self.guard(read=("customers",)):
+            result = []
+            for cid in self.customers.name_index.search(query, limit, fuzzy):
+                c = self.customers.index[cid]
+                result.append((c.customer_id, c.name, c.surname))
+            return result
+
+    def stats(self):
+        """
+        Müşteri/kargo sayıları ve teslim edilmişlerin teslim süresi istatistikleri
+        (ortalama, min, max, p50/p95/p99). Artımlı tutulduğu için O(1).
+        """
+        with self.guard(read=("customers", "shipments", "delivered")):
+            customers = len(self.customers)
+            store = self.shipment_store
+            delivered = store.count(ShipmentState.DELIVERED)
+            undelivered = store.count(ShipmentState.UNDELIVERED)
+            delivery_stats = self.delivered_shipments.stats
+            quantiles = delivery_stats.quantiles()
+            return {
+                "customers": customers,
+                "delivered": delivered,
+                "undelivered": undelivered,
+                "total": delivered + undelivered,
+                "average_delivery_time": delivery_stats.mean(),
+                "min_delivery_time": delivery_stats.min,
+                "max_delivery_time": delivery_stats.max,
+                "p50_delivery_time": quantiles[0.5],
+                "p95_delivery_time": quantiles[0.95],
+                "p99_delivery_time": quantiles[0.99],
+            }
+
+    def state_counts(self):
+        """
+        Durum adı -> o durumdaki kargo sayısı (O(1))
+        """
+        with self.guard(read=("shipments",)):
+            store = self.shipment_store
+            return {ShipmentState.label(state): store.count(state) for state in ShipmentState.ALL}
+
+    def shipments_in_state(self, state, limit=None):
+        """
+        Güncel durumu state (ShipmentState kodu) olan kargolar, o duruma giriş sırasıyla.
+        Durum listesi yürünür, diğer kargolara bakılmaz (O(k), limit verilirse O(limit)).
+        """
+        with self.guard(read=("shipments",)):
+            store = self.shipment_store
+            return [store.shipment(row) for row in islice(store.iter_state(state), limit)]
+
+    def history_page(self, page_no, page_size=HISTORY_PAGE_SIZE):
+        """
+        İşlem geçmişinden en yeni kayıtlardan başlayan bir sayfa: (kayıtlar, sonraki var mı)
+        """
+        with self.guard(read=("history",)):
+            return self.transaction_history.get_page(page_no, page_size)
+
+    def storage_stats(self):
+        """
+        Kalıcı depolama log istatistikleri; depolama bağlı değilse None
+        """
+        if self.storage is None:
+            return None
+        return self.storage.stats()
+
+##############################################################################
+#                           KALICI DEPOLAMA
+##############################################################################
+
+def iter_log_records(path):
+    """
+    Log dosyasındaki geçerli kayıtları (seq dahil) sırayla üretir (generator).
+    Yarım yazılmış son satırda durur; okunan geçerli bayt sayısı generator'ın dönüş değeridir.
+    """
+    valid_end = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            valid_end += len(raw)
+            yield record
+    return valid_end
+
+def replay_log(path, system=None, after_seq=0):
+    """
+    Log'daki after_seq'ten sonraki kayıtları sisteme uygular; sistem verilmezse
+    boş bir CargoSystem kurulur. Dönüş: (sistem, son seq, geçerli bayt sayısı)
+    """
+    if system is None:
+        system = CargoSystem()
+    last_seq = after_seq
+    records = iter_log_records(path)
+    while True:
+        try:
+            record = next(records)
+        except StopIteration as stop:
+            return system, last_seq, stop.value
+        if record["seq"] <= after_seq:
+            continue
+        record = dict(record)
+        last_seq = record.pop("seq")
+        system.apply_record(record)
+
+class GroupCommitLog:
+    """
+    Append-only log yazıcısı. Kayıtlar kuyruğa alınır; arka plandaki yazıcı thread
+    biriken kayıtları tek seferde yazıp tek fsync ile diske indirir (group commit).
+    - FSYNC_ALWAYS: append, kaydı fsync edilene kadar bekler; eşzamanlı yazarlar aynı fsync'i paylaşır.
+    - FSYNC_INTERVAL: append beklemez; grup, GROUP_COMMIT_SIZE kayda ya da fsync_interval süresine ulaşınca yazılır.
+    - FSYNC_NEVER: gruplar yazılır ama fsync yapılmaz.
+    flush() beklenen seq'i flush_seq olarak bildirir; yazıcı bu durumda grubun dolmasını
+    ya da pencerenin kapanmasını beklemeden hemen yazar.
+    """
+    def __init__(self, path, fsync_policy=FSYNC_INTERVAL, fsync_interval=1.0,
+                 group_size=GROUP_COMMIT_SIZE, group_window=GROUP_COMMIT_WINDOW, start_seq=0):
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.group_size = group_size
+        self.window = group_window if fsync_policy == FSYNC_ALWAYS else fsync_interval
+        self.file = open(path, "a", encoding="utf-8")
+        self.cond = threading.Condition()
+        self.pending = []
+        # Sıra numaraları kilit altında verilir, böylece kuyruk sırası = seq sırası olur
+        self.enqueued_seq = start_seq
+        self.durable_seq = start_seq
+        # flush() ile hemen yazılması istenen son seq
+        self.flush_seq = start_seq
+        self.closing = False
+        self.error = None
+        # Ölçümler
+        self.started = time.perf_counter()
+        self.committed = 0
+        self.fsyncs = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.writer = threading.Thread(target=self._run, name="oplog-writer", daemon=True)
+        self.writer.start()
+
+    def append(self, record, wait=True):
+        """
+        Kayda sıra numarası verip kuyruğa ekler ve seq'i döndürür;
+        FSYNC_ALWAYS politikasında (wait=False değilse) kayıt diske inene kadar bekler.
+        """
+        with self.cond:
+            if self.error is not None:
+                raise self.error
+            seq = self.enqueued_seq + 1
+            line = json.dumps({"seq": seq, **record}, ensure_ascii=False) + "\n"
+            self.pending.append((seq, line, time.perf_counter()))
+            self.enqueued_seq = seq
+            self.cond.notify_all()
+            if wait and self.fsync_policy == FSYNC_ALWAYS:
+                self._wait_for(seq)
+        return seq
+
+    def wait_durable(self, seq):
+        """
+        FSYNC_ALWAYS politikasında seq'e kadar olan kayıtların diske inmesini bekler.
+        """
+        if self.fsync_policy == FSYNC_ALWAYS:
+            with self.cond:
+                self._wait_for(seq)
+
+    def flush(self):
+        """
+        O ana kadar kuyruğa alınmış tüm kayıtlar diske inene kadar bekler.
+        """
+        with self.cond:
+            self.flush_seq = max(self.flush_seq, self.enqueued_seq)
+            self._wait_for(self.enqueued_seq)
+
+    def _wait_for(self, seq):
+        self.cond.notify_all()
+        while self.durable_seq < seq and self.error is None:
+            self.cond.wait()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                # Grup dolana, pencere kapanana ya da biri kuyruktaki bir kaydı flush
+                # isteyene kadar kayıt topla
+                deadline = self.pending[0][2] + self.window
+                while (len(self.pending) < self.group_size and not self.closing
+                       and self.flush_seq < self.pending[0][0]):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                batch = self.pending[:self.group_size]
+                del self.pending[:self.group_size]
+            try:
+                self.file.write("".join(line for _, line, _ in batch))
+                self.file.flush()
+                if self.fsync_policy != FSYNC_NEVER:
+                    os.fsync(self.file.fileno())
+                    self.fsyncs += 1
+            except OSError as e:
+                with self.cond:
+                    self.error = e
+                    self.cond.notify_all()
+                return
+            done = time.perf_counter()
+            with self.cond:
+                self.durable_seq = batch[-1][0]
+                self.committed += len(batch)
+                self.latencies.extend(done - t for _, _, t in batch)
+                self.cond.notify_all()
+
+    def truncate(self):
+        """
+        Bekleyen kayıtları yazdıktan sonra log dosyasını boşaltır (snapshot sonrası).
+        """
+        self.flush()
+        with self.cond:
+            self.file.truncate(0)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def stats(self):
+        """
+        Saniyedeki kayıt sayısı ve p99 commit gecikmesi (ms).
+        """
+        with self.cond:
+            samples = sorted(self.latencies)
+            elapsed = time.perf_counter() - self.started
+            committed = self.committed
+            fsyncs = self.fsyncs
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000 if samples else 0.0
+        return {
+            "records": committed,
+            "fsyncs": fsyncs,
+            "records_per_sec": committed / elapsed if elapsed > 0 else 0.0,
+            "p99_commit_ms": p99,
+        }
+
+    def close(self):
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.writer.join()
+        self.file.close()
+
+class CargoStore:
+    """
+    Snapshot dosyası + append-only operasyon log'u (WAL) ile yerel kalıcı depolama.
+    - Her değişiklik log'a tek satır JSON olarak eklenir (tüm durum yeniden yazılmaz);
+      yazma ve fsync GroupCommitLog ile gruplar halinde yapılır.
+    - Açılışta snapshot yüklenir, ardından log'un snapshot'tan sonraki kısmı replay edilir.
+    - Kayıtlar sıra numarası (seq) taşır; snapshot kendi seq'ini saklar, böylece
+      snapshot ile log kısaltma arasında çökme olsa bile kayıtlar iki kez uygulanmaz.
+    - Snapshot, sistemin tüm kilitleri okuma modunda tutulurken alınır; bu sırada
+      okuyucular çalışmaya devam eder, yazarlar snapshot ve log kısaltma bitene kadar bekler.
+    """
+    def __init__(self, directory=DATA_DIR, fsync_policy=FSYNC_INTERVAL, fsync_interval=1.0,
+                 snapshot_every=SNAPSHOT_EVERY, group_size=GROUP_COMMIT_SIZE):
+        if fsync_policy not in (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER):
+            raise ValueError(f"Geçersiz fsync politikası: {fsync_policy}")
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "snapshot.json")
+        self.log_path = os.path.join(directory, "oplog.jsonl")
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.group_size = group_size
+        self.snapshot_seq = 0
+        self.log = None
+        # Aynı anda yalnızca bir thread snapshot alır
+        self.checkpoint_lock = threading.Lock()
+
+    @property
+    def seq(self):
+        """
+        Log'a verilmiş son sıra numarası.
+        """
+        return self.log.enqueued_seq if self.log is not None else self.snapshot_seq
+
+    def load(self, system):
+        """
+        Snapshot'ı ve log kuyruğunu sisteme yükler, ardından sistemi bu depoya bağlar.
+        Log'un sonundaki yarım yazılmış (çökme sonrası) satır atılır.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        history_dir = os.path.join(self.directory, "history")
+        os.makedirs(history_dir, exist_ok=True)
+        system.storage = None
+        system.transaction_history.spill_dir = history_dir
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+            system.restore_snapshot(data["state"])
+            seq = self.snapshot_seq = data["seq"]
+        if os.path.exists(self.log_path):
+            _, last_seq, valid_end = replay_log(self.log_path, system, self.snapshot_seq)
+            seq = max(seq, last_seq)
+            if valid_end != os.path.getsize(self.log_path):
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(valid_end)
+        self.log = GroupCommitLog(
+            self.log_path, self.fsync_policy, self.fsync_interval, self.group_size, start_seq=seq
+        )
+        system.storage = self
+
+    def append(self, record, wait=True):
+        """
+        Kaydı sıra numarasıyla log'a ekler ve seq'i döndürür; diske indirme fsync politikasına bağlıdır.
+        wait=False ise FSYNC_ALWAYS'te bile beklenmez, bkz. wait().
+        """
+        return self.log.append(record, wait)
+
+    def wait(self, seq):
+        """
+        Politika gerektiriyorsa seq'e kadar olan kayıtların diske inmesini bekler.
+        """
+        self.log.wait_durable(seq)
+
+    def flush(self):
+        """
+        Tüm bekleyen kayıtların diske inmesini bekler.
+        """
+        self.log.flush()
+
+    def needs_checkpoint(self):
+        return self.seq - self.snapshot_seq >= self.snapshot_every
+
+    def maybe_checkpoint(self, system):
+        """
+        Log snapshot_every kayda ulaştıysa snapshot alır; başka bir thread zaten
+        snapshot alıyorsa beklemeden döner.
+        """
+        if not self.needs_checkpoint() or not self.checkpoint_lock.acquire(blocking=False):
+            return
+        try:
+            if self.needs_checkpoint():
+                self._checkpoint(system)
+        finally:
+            self.checkpoint_lock.release()
+
+    def checkpoint(self, system):
+        """
+        Tüm durumu atomik olarak snapshot'a yazar (geçici dosya + os.replace)
+        ve ardından log'u boşaltır.
+        """
+        with self.checkpoint_lock:
+            self._checkpoint(system)
+
+    def _checkpoint(self, system):
+        # Kilitler okuma modunda tutulduğu sürece log'a yeni kayıt eklenemez;
+        # böylece seq, durum ve log kısaltma birbiriyle tutarlıdır
+        with system.guard(read=system.LOCK_ORDER):
+            seq = self.seq
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"seq": seq, "state": system.to_snapshot()}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self.snapshot_seq = seq
+            self.log.truncate()
+
+    def stats(self):
+        return self.log.stats()
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
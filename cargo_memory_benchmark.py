@@ -0,0 +1,94 @@
+import argparse
+import importlib.util
+import random
+import time
+import tracemalloc
+
+import cargo_core
+from cargo_core import STATE_DELIVERED, STATE_UNDELIVERED
+
+##############################################################################
+#                      KARGO BAŞINA BELLEK ÖLÇÜMÜ
+##############################################################################
+# Müşterileri oluşturduktan sonra tracemalloc'u başlatır; kargoları toplu yükleyip
+# bir kısmını teslim eder ve kargo başına düşen bayt sayısını yazdırır. Ölçüme kargo
+# ID/tarih sayılarının kendisi de dahildir (yüklenen satırlar ölçüm içinde üretilir).
+#
+#   python cargo_memory_benchmark.py --shipments 100000 1000000
+#
+# --core ile aynı ölçüm başka bir cargo_core dosyasıyla da yapılır; böylece eski bir sürümle
+# karşılaştırma depodan yeniden üretilebilir, ör. sütun bazlı depodan önceki sürüm için:
+#
+#   git show bacdcdc:cargo_core.py > /tmp/cargo_core_eski.py
+#   python cargo_memory_benchmark.py --shipments 100000 --core /tmp/cargo_core_eski.py
+##############################################################################
+
+def load_core(path):
+    """
+    Verilen dosyadaki cargo_core sürümünü ayrı bir modül olarak yükler.
+    """
+    spec = importlib.util.spec_from_file_location("cargo_core_karsilastirma", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def row_width(core):
+    """
+    Çekirdeğin toplu eklemede beklediği satır uzunluğu (rota alanlarından önceki sürümlerde 5)
+    """
+    sample = {"customer_id": 0, "shipment_id": 0, "date": 20240101,
+              "status": STATE_DELIVERED, "delivery_time": 1}
+    return len(core.parse_shipment_row(sample))
+
+def make_rows(n, customers, rnd):
+    """
+    n adet (customer_id, shipment_id, date, status, delivery_time, origin_id, destination_id)
+    satırı; yarısı teslim edilmiş, rota girilmemiş
+    """
+    return [
+        (rnd.randrange(customers), 1_000_000 + i, 20240101 + rnd.randrange(300),
+         STATE_DELIVERED if rnd.random() < 0.5 else STATE_UNDELIVERED, rnd.randrange(1, 31), None, None)
+        for i in range(n)
+    ]
+
+def measure(n, customers=1000, batch_size=10000, seed=0, core=cargo_core):
+    """
+    (kargo başına bayt, yükleme süresi sn) döndürür. Teslim edilmemişlerin yarısı
+    sonradan teslim edilir; böylece hem öncelik kuyruğu hem teslim edilmiş index dolu olur.
+    """
+    rnd = random.Random(seed)
+    width = row_width(core)
+    system = core.CargoSystem()
+    for cid in range(customers):
+        system.create_customer(cid, f"Müşteri{cid}", "Ölçüm")
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        rows = [row[:width] for row in make_rows(n, customers, rnd)]
+        undelivered = [row[1] for row in rows if row[3] == STATE_UNDELIVERED]
+        start = time.perf_counter()
+        for i in range(0, n, batch_size):
+            system._apply_shipment_batch(rows[i:i + batch_size])
+        system.deliver_shipments_batch(undelivered[::2])
+        elapsed = time.perf_counter() - start
+        # Yalnızca yapılarda kalan bellek sayılır
+        del rows, undelivered
+        used = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    return used / n, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Kargo başına bellek ölçümü (tracemalloc)")
+    parser.add_argument("--shipments", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--core", help="ölçülecek başka bir cargo_core.py dosyası (varsayılan: güncel)")
+    args = parser.parse_args()
+
+    core = load_core(args.core) if args.core else cargo_core
+    for n in args.shipments:
+        per_shipment, elapsed = measure(n, args.customers, core=core)
+        print(f"{n:>9} kargo: {per_shipment:6.0f} bayt/kargo (yükleme {elapsed:.2f} sn, tracemalloc açıkken)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import math
+import random
+import time
+
+from cargo_core import (
+    EARTH_RADIUS_KM, ROUTE_ASTAR, ROUTE_CACHED, ROUTE_DIJKSTRA, ROUTE_MAX_SPEED_KMH, CargoSystem,
+    RouteGraph
+)
+
+##############################################################################
+#                       ŞUBE ROTA ARAMASI KIYASLAMASI
+##############################################################################
+# Türkiye sınırları içinde rastgele konumlanmış şubelerden, her şubeyi en yakın
+# komşularına bağlayan bir yol ağı kurar ve rastgele şube çiftleri için Dijkstra ile
+# A*'ı karşılaştırır: sorgu başına ortalama süreyi yazdırır ve iki yöntemin aynı
+# rota süresini bulduğunu kontrol eder. Ayrıca yalnızca ağaçtan oluşan bir şube ağında
+# rota önbelleğini (LCA) her sorguda Dijkstra çalıştırmakla karşılaştırır.
+#
+#   python cargo_route_benchmark.py --cities 10000 50000 --queries 50
+##############################################################################
+
+def distance_km(a, b):
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+def make_graph(n, neighbors=3, seed=0):
+    """
+    n şubeli bağlantılı yol ağı: şubeler enlem/boylam ızgarasındaki hücrelere dağıtılır, her
+    şube kendi ve komşu hücrelerdeki en yakın `neighbors` şubeye bağlanır; yol süresi
+    mesafenin ROUTE_MAX_SPEED_KMH'nin altındaki rastgele bir hıza bölümüdür. Ağın bağlantılı
+    kalması için şubeler ayrıca oluşturulma sırasıyla bir zincirle birbirine bağlanır.
+    """
+    rnd = random.Random(seed)
+    graph = RouteGraph()
+    cells = {}
+    side = max(1, int(math.sqrt(n / 4)))
+    for city_id in range(n):
+        lat, lon = rnd.uniform(36.0, 42.0), rnd.uniform(26.0, 45.0)
+        graph.add_city(city_id, (lat, lon))
+        cell = (int((lat - 36.0) / 6.0 * side), int((lon - 26.0) / 19.0 * side))
+        cells.setdefault(cell, []).append(city_id)
+
+    def connect(a, b):
+        speed = rnd.uniform(0.5, 1.0) * ROUTE_MAX_SPEED_KMH
+        graph.connect(a, b, distance_km(graph.locations[a], graph.locations[b]) / speed)
+
+    for (row, col), members in cells.items():
+        nearby = [
+            other for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+            for other in cells.get((row + dr, col + dc), ())
+        ]
+        for city_id in members:
+            here = graph.locations[city_id]
+            closest = sorted(
+                (distance_km(here, graph.locations[other]), other)
+                for other in nearby if other != city_id
+            )[:neighbors]
+            for _, other in closest:
+                connect(city_id, other)
+    ordered = sorted(range(n), key=lambda city_id: graph.locations[city_id])
+    for a, b in zip(ordered, ordered[1:]):
+        if b not in graph.adjacency[a]:
+            connect(a, b)
+    return graph
+
+def run_benchmark(n, queries=50, seed=0):
+    """
+    {yöntem: ortalama sorgu süresi (sn)} döndürür; iki yöntemin bulduğu rota süreleri
+    farklıysa AssertionError fırlatır.
+    """
+    graph = make_graph(n, seed=seed)
+    rnd = random.Random(seed + 1)
+    pairs = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(queries)]
+    results = {}
+    costs = {}
+    for method in (ROUTE_DIJKSTRA, ROUTE_ASTAR):
+        start = time.perf_counter()
+        costs[method] = [graph.shortest_path(a, b, method)[0] for a, b in pairs]
+        results[method] = (time.perf_counter() - start) / queries
+    for expected, found in zip(costs[ROUTE_DIJKSTRA], costs[ROUTE_ASTAR]):
+        assert math.isclose(expected, found, rel_tol=1e-9), (expected, found)
+    return graph, results
+
+def run_tree_benchmark(n, queries=50, seed=0):
+    """
+    n şehirli rastgele rota ağacında {yöntem: ortalama sorgu süresi (sn)} ve önbelleğin
+    kurulum süresini döndürür; rota süreleri farklıysa AssertionError fırlatır.
+    """
+    rnd = random.Random(seed)
+    system = CargoSystem()
+    first = len(system.route_graph.adjacency)
+    for city_id in range(first, first + n):
+        system.insert_city(rnd.randrange(city_id), city_id, f"Şube {city_id}", rnd.randrange(1, 12))
+    pairs = [(rnd.randrange(first + n), rnd.randrange(first + n)) for _ in range(queries)]
+    start = time.perf_counter()
+    system.route_between(0, 0, ROUTE_CACHED)
+    build = time.perf_counter() - start
+    results = {}
+    costs = {}
+    for method in (ROUTE_DIJKSTRA, ROUTE_CACHED):
+        start = time.perf_counter()
+        costs[method] = [system.route_between(a, b, method)[0] for a, b in pairs]
+        results[method] = (time.perf_counter() - start) / queries
+    for expected, found in zip(costs[ROUTE_DIJKSTRA], costs[ROUTE_CACHED]):
+        assert math.isclose(expected, found, rel_tol=1e-9), (expected, found)
+    return build, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Şube rota araması kıyaslaması (Dijkstra / A*)")
+    parser.add_argument("--cities", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=50, help="Rastgele şube çifti sayısı")
+    args = parser.parse_args()
+
+    for n in args.cities:
+        graph, results = run_benchmark(n, args.queries)
+        print(f"=== {n} şube, {graph.edge_count} yol ===")
+        base = results[ROUTE_DIJKSTRA]
+        for method, timing in results.items():
+            print(f"{method:10} {timing * 1000:10.2f} ms/sorgu  (x{base / timing:.1f})")
+        build, results = run_tree_benchmark(n, args.queries)
+        print(f"=== {n} şehirli ağaç, önbellek kurulumu {build * 1000:.1f} ms ===")
+        base = results[ROUTE_DIJKSTRA]
+        for method, timing in results.items():
+            print(f"{method:10} {timing * 1000:10.3f} ms/sorgu  (x{base / timing:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,570 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from cargo_core import (
+    CargoStore, CargoSystem, DATA_DIR, HISTORY_PAGE_SIZE, NAME_SEARCH_LIMIT, ROUTE_ASTAR,
+    ROUTE_CACHED, ROUTE_DIJKSTRA, ShipmentState, is_int64, is_route_hours, parse_shipment_row,
+    parse_shipment_state, row_int
+)
+
+##############################################################################
+#                           GENEL AYARLAR
+##############################################################################
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+# Boşta bekleyen keep-alive bağlantısı bu kadar saniye sonra kapatılır
+KEEPALIVE_TIMEOUT = 15
+# İstek satırı + başlıklar ve gövde için üst sınırlar (bayt)
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 8 * 1024 * 1024
+# Tek sayfada istenebilecek en fazla gönderi sayısı
+MAX_PAGE_SIZE = 1000
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+##############################################################################
+#                           YARDIMCI FONKSİYONLAR
+##############################################################################
+
+def shipment_to_dict(sh):
+    return {"shipment_id": sh[0], "date": sh[1], "status": sh[2], "delivery_time": sh[3]}
+
+def parse_int(value, name):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} tamsayı olmalı")
+    if not is_int64(value):
+        raise HTTPError(400, f"{name} int64 aralığı dışında")
+    return value
+
+def body_int(value, name):
+    """
+    JSON gövdesindeki tamsayı alanı; true/false ve 2.7 gibi kesirli sayılar sessizce
+    tamsayıya çevrilmez, parse_shipment_row gibi row_int ile 400 olarak reddedilir.
+    """
+    try:
+        value = row_int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} tamsayı olmalı")
+    if not is_int64(value):
+        raise HTTPError(400, f"{name} int64 aralığı dışında")
+    return value
+
+def query_int(query, name, default=None):
+    if name not in query:
+        return default
+    return parse_int(query[name][-1], name)
+
+def route_method(query):
+    method = query.get("method", [ROUTE_CACHED])[-1]
+    if method not in (ROUTE_CACHED, ROUTE_ASTAR, ROUTE_DIJKSTRA):
+        raise HTTPError(400, f"method {ROUTE_CACHED}, {ROUTE_ASTAR} ya da {ROUTE_DIJKSTRA} olmalı")
+    return method
+
+def prediction_to_dict(prediction):
+    delivery_time, source, samples = prediction
+    return {"delivery_time": delivery_time, "source": source, "samples": samples}
+
+def route_to_dict(hours, path):
+    return {"hours": hours, "path": [{"city_id": city_id, "name": name} for city_id, name in path]}
+
+def encode_cursor(cursor):
+    """
+    Geçmiş sayfası cursor'ı (tarih, kargo ID) URL'de taşınabilir "tarih.id" metnine çevrilir.
+    ID'ler işaretli olduğundan ayraç olarak tamsayıda geçemeyen "." kullanılır.
+    """
+    if cursor is None:
+        return None
+    return f"{cursor[0]}.{cursor[1]}"
+
+def decode_cursor(text):
+    try:
+        date, shipment_id = text.split(".")
+    except ValueError:
+        raise HTTPError(400, "Geçersiz cursor")
+    try:
+        return parse_int(date, "cursor"), parse_int(shipment_id, "cursor")
+    except HTTPError:
+        raise HTTPError(400, "Geçersiz cursor")
+
+def encode_name_cursor(cursor):
+    """
+    İsim sırası cursor'ı (customer_id, ad, soyad) URL-güvenli base64 JSON metnine çevrilir.
+    """
+    if cursor is None:
+        return None
+    raw = json.dumps(list(cursor), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_name_cursor(text):
+    try:
+        cid, name, surname = json.loads(base64.urlsafe_b64decode(text.encode("ascii")))
+        if not isinstance(cid, int) or not isinstance(name, str) or not isinstance(surname, str):
+            raise ValueError
+        return cid, name, surname
+    except (ValueError, TypeError, UnicodeError, binascii.Error):
+        raise HTTPError(400, "Geçersiz cursor")
+
+##############################################################################
+#                           HTTP/JSON SUNUCUSU
+##############################################################################
+
+class CargoServer:
+    """
+    CargoSystem önünde asyncio tabanlı yerel HTTP/JSON sunucusu.
+    - Her bağlantı ayrı bir coroutine'de işlenir; HTTP/1.1 keep-alive desteklenir.
+    - Handler'lar asyncio.to_thread ile thread havuzunda çalışır: yazma işlemleri
+      FSYNC_ALWAYS'te fsync'i bekler ve checkpoint'i tetikleyebilir, bunlar event loop'u
+      bloklamaz. CargoSystem thread-safe olduğundan (okuyucu/yazar kilitleri) eşzamanlı
+      istekler aynı anda işlenebilir; eşzamanlı yazarlar aynı fsync'i paylaşır.
+    """
+    def __init__(self, system):
+        self.system = system
+        # (metot, yol parçaları, handler); "{id}" parçası tamsayı parametre olarak geçilir
+        self.routes = [
+            ("POST", ("customers",), self.create_customer),
+            ("GET", ("customers",), self.search_customers),
+            ("GET", ("customers", "by-name"), self.customers_by_name),
+            ("GET", ("customers", "{id}"), self.get_customer),
+            ("DELETE", ("customers", "{id}"), self.delete_customer),
+            ("GET", ("customers", "{id}", "history"), self.shipment_history),
+            ("GET", ("customers", "{id}", "last"), self.last_shipments),
+            ("POST", ("shipments",), self.add_shipment),
+            ("GET", ("shipments",), self.shipments_in_state),
+            ("GET", ("shipments", "{id}"), self.get_shipment),
+            ("POST", ("shipments", "{id}", "deliver"), self.deliver_shipment),
+            ("GET", ("shipments", "{id}", "eta"), self.shipment_eta),
+            ("POST", ("deliveries",), self.deliver_batch),
+            ("GET", ("deliveries", "top"), self.top_deliveries),
+            ("GET", ("deliveries", "predict"), self.predict_delivery_time),
+            ("GET", ("delivered", "{id}"), self.get_delivered),
+            ("GET", ("priority",), self.priority_cargos),
+            ("GET", ("routes",), self.delivery_routes),
+            ("POST", ("routes",), self.connect_cities),
+            ("GET", ("routes", "path"), self.route_between),
+            ("GET", ("stats",), self.stats),
+        ]
+
+    ######################## Yönlendirme ########################
+
+    def dispatch(self, method, target, body):
+        """
+        İsteği uygun handler'a yönlendirir ve (durum kodu, JSON nesnesi) döndürür.
+        """
+        url = urlsplit(target)
+        parts = tuple(unquote(p) for p in url.path.split("/") if p)
+        query = parse_qs(url.query)
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            if len(pattern) != len(parts):
+                continue
+            args = []
+            for expected, actual in zip(pattern, parts):
+                if expected == "{id}":
+                    args.append(actual)
+                elif expected != actual:
+                    break
+            else:
+                path_matched = True
+                if route_method != method:
+                    continue
+                args = [parse_int(a, "ID") for a in args]
+                if method in ("POST", "PUT"):
+                    return handler(*args, body=body)
+                return handler(*args, query=query)
+        if path_matched:
+            raise HTTPError(405, "Bu yol için metot desteklenmiyor")
+        raise HTTPError(404, "Yol bulunamadı")
+
+    ######################## Müşteri ########################
+
+    def create_customer(self, body):
+        try:
+            cid = body["customer_id"]
+            name = str(body["name"])
+            surname = str(body["surname"])
+        except KeyError as e:
+            raise HTTPError(400, f"Eksik alan: {e.args[0]}")
+        cid = body_int(cid, "customer_id")
+        if not self.system.create_customer(cid, name, surname):
+            raise HTTPError(409, "Bu ID'ye sahip müşteri zaten var")
+        self.system.add_history(f"Yeni müşteri eklendi (ID={cid}, İsim={name} {surname})")
+        return 201, {"customer_id": cid, "name": name, "surname": surname}
+
+    def search_customers(self, query):
+        text = query.get("q", [""])[-1]
+        limit = query_int(query, "limit", NAME_SEARCH_LIMIT)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"limit 1-{MAX_PAGE_SIZE} arasında olmalı")
+        fuzzy = query.get("fuzzy", ["1"])[-1] not in ("0", "false")
+        customers = self.system.search_customers(text, limit, fuzzy)
+        return 200, {
+            "customers": [{"customer_id": c[0], "name": c[1], "surname": c[2]} for c in customers]
+        }
+
+    def customers_by_name(self, query):
+        page_size = query_int(query, "page_size", HISTORY_PAGE_SIZE)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"page_size 1-{MAX_PAGE_SIZE} arasında olmalı")
+        cursor = decode_name_cursor(query["cursor"][-1]) if "cursor" in query else None
+        page, next_cursor = self.system.customers_by_name_page(page_size, cursor)
+        return 200, {
+            "customers": [{"customer_id": c[0], "name": c[1], "surname": c[2]} for c in page],
+            "next_cursor": encode_name_cursor(next_cursor),
+        }
+
+    def get_customer(self, cid, query):
+        customer = self.system.get_customer(cid)
+        if customer is None:
+            raise HTTPError(404, "Müşteri bulunamadı")
+        return 200, {"customer_id": customer[0], "name": customer[1], "surname": customer[2]}
+
+    def delete_customer(self, cid, query):
+        if not self.system.delete_customer(cid):
+            raise HTTPError(404, "Müşteri bulunamadı")
+        self.system.add_history(f"Müşteri silindi (ID={cid})")
+        return 200, {"customer_id": cid, "deleted": True}
+
+    def shipment_history(self, cid, query):
+        start_date = query_int(query, "start")
+        end_date = query_int(query, "end")
+        page_size = query_int(query, "page_size", HISTORY_PAGE_SIZE)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"page_size 1-{MAX_PAGE_SIZE} arasında olmalı")
+        cursor = decode_cursor(query["cursor"][-1]) if "cursor" in query else None
+        result = self.system.shipment_history_page(cid, start_date, end_date, page_size, cursor)
+        if result is None:
+            raise HTTPError(404, "Müşteri bulunamadı")
+        page, next_cursor = result
+        return 200, {
+            "shipments": [shipment_to_dict(sh) for sh in page],
+            "next_cursor": encode_cursor(next_cursor),
+        }
+
+    def last_shipments(self, cid, query):
+        shipments = self.system.last_shipments(cid)
+        if shipments is None:
+            raise HTTPError(404, "Müşteri bulunamadı")
+        return 200, {"shipments": [shipment_to_dict(sh) for sh in shipments]}
+
+    ######################## Kargo ########################
+
+    def add_shipment(self, body):
+        """
+        delivery_time verilmezse geçmiş teslimatlardan tahmin edilir; yanıtta "predicted" alanı bulunur.
+        """
+        predicted = isinstance(body, dict) and body.get("delivery_time") in (None, "")
+        try:
+            cid, shipment_id, date, status, delivery_time, origin_id, destination_id = parse_shipment_row(
+                {**body, "delivery_time": 0} if predicted else body
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if self.system.get_customer(cid) is None:
+            raise HTTPError(404, "Müşteri bulunamadı")
+        if origin_id is not None and (self.system.get_city(origin_id) is None
+                                      or self.system.get_city(destination_id) is None):
+            raise HTTPError(404, "Şube bulunamadı")
+        if predicted:
+            prediction = self.system.predict_delivery_time(cid, origin_id, destination_id)
+            if prediction is None:
+                raise HTTPError(400, "delivery_time gerekli: tahmin için teslimat geçmişi yok")
+            # Süreyi sistem atar ve kargoyu tahminli olarak işaretler
+            delivery_time = None
+        if not self.system.add_shipment(cid, shipment_id, date, status, delivery_time,
+                                        origin_id, destination_id):
+            raise HTTPError(409, "Bu ID'ye sahip kargo zaten kayıtlı")
+        if predicted:
+            delivery_time = self.system.find_shipment(shipment_id).shipment[3]
+            prediction = (delivery_time, *prediction[1:])
+        self.system.add_history(f"Kargo eklendi (MüşteriID={cid}, KargoID={shipment_id}, Durum={status})")
+        payload = {"customer_id": cid, **shipment_to_dict((shipment_id, date, status, delivery_time))}
+        if origin_id is not None:
+            payload["origin_id"] = origin_id
+            payload["destination_id"] = destination_id
+        if predicted:
+            payload["predicted"] = prediction_to_dict(prediction)
+        return 201, payload
+
+    def predict_delivery_time(self, query):
+        cid = query_int(query, "customer_id")
+        if cid is None:
+            raise HTTPError(400, "customer_id parametresi gerekli")
+        origin_id = query_int(query, "origin_id")
+        destination_id = query_int(query, "destination_id")
+        if (origin_id is None) != (destination_id is None):
+            raise HTTPError(400, "origin_id ve destination_id birlikte verilmeli")
+        prediction = self.system.predict_delivery_time(cid, origin_id, destination_id)
+        if prediction is None:
+            raise HTTPError(404, "Tahmin için teslimat geçmişi yok")
+        return 200, prediction_to_dict(prediction)
+
+    def shipments_in_state(self, query):
+        if "state" not in query:
+            raise HTTPError(400, "state parametresi gerekli")
+        state = parse_shipment_state(query["state"][-1], ShipmentState.QUERY_NAMES)
+        if state is None:
+            raise HTTPError(400, "Geçersiz durum")
+        limit = query_int(query, "limit", HISTORY_PAGE_SIZE)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"limit 1-{MAX_PAGE_SIZE} arasında olmalı")
+        shipments = self.system.shipments_in_state(state, limit)
+        return 200, {
+            "state": ShipmentState.label(state),
+            "count": self.system.state_counts()[ShipmentState.label(state)],
+            "shipments": [shipment_to_dict(sh) for sh in shipments],
+        }
+
+    def get_shipment(self, shipment_id, query):
+        record = self.system.find_shipment(shipment_id)
+        if record is None:
+            raise HTTPError(404, "Kargo bulunamadı")
+        return 200, {"customer_id": record.customer_id, **shipment_to_dict(record.shipment)}
+
+    def shipment_eta(self, shipment_id, query):
+        result = self.system.shipment_eta(shipment_id, route_method(query))
+        if result is None:
+            raise HTTPError(404, "Kargo, kargonun rotası ya da şubeler arasında yol bulunamadı")
+        eta, hours, path = result
+        return 200, {"shipment_id": shipment_id, "eta": eta, **route_to_dict(hours, path)}
+
+    def deliver_shipment(self, shipment_id, body):
+        delivered, removed = self.system.deliver_shipment(shipment_id)
+        if delivered is None:
+            raise HTTPError(404, "Bu ID ile teslim edilmemiş kargo bulunamadı")
+        self.system.add_history(f"Kargo teslim edildi (KargoID={shipment_id})")
+        return 200, shipment_to_dict(delivered)
+
+    def deliver_batch(self, body):
+        ids = body.get("shipment_ids")
+        if not isinstance(ids, list):
+            raise HTTPError(400, "shipment_ids listesi gerekli")
+        ids = [body_int(i, "shipment_ids") for i in ids]
+        delivered, failed = self.system.deliver_shipments_batch(ids)
+        self.system.add_history(f"Toplu teslimat yapıldı (Teslim={len(delivered)}, Hatalı={len(failed)})")
+        return 200, {
+            "delivered": [sh[0] for sh in delivered],
+            "failed": {str(k): v for k, v in failed.items()},
+        }
+
+    def get_delivered(self, shipment_id, query):
+        result = self.system.search_delivered(shipment_id)
+        if result is None:
+            raise HTTPError(404, "Bu ID'ye sahip teslim edilmiş kargo bulunamadı")
+        return 200, shipment_to_dict(result)
+
+    def top_deliveries(self, query):
+        k = query_int(query, "k", 10)
+        if not 1 <= k <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"k 1-{MAX_PAGE_SIZE} arasında olmalı")
+        order = query.get("order", ["slowest"])[-1]
+        if order not in ("slowest", "fastest"):
+            raise HTTPError(400, "order slowest ya da fastest olmalı")
+        top = self.system.top_deliveries(k, order == "slowest")
+        return 200, {"order": order, "shipments": [shipment_to_dict(sh) for sh in top]}
+
+    def priority_cargos(self, query):
+        items = self.system.priority_cargos()
+        return 200, {
+            "cargos": [
+                {"shipment_id": item[1], "delivery_time": item[0], "status": item[2]}
+                for item in items
+            ]
+        }
+
+    ######################## Rota ve istatistik ########################
+
+    def delivery_routes(self, query):
+        """
+        Parametresiz istekte bütün ağaç döner. root, depth, expand (virgülle ayrılmış şehir ID'leri),
+        offset ya da limit verilirse yalnızca istenen görünümün bir dilimi üretilir.
+        """
+        if not any(name in query for name in ("root", "depth", "expand", "offset", "limit")):
+            lines, shortest = self.system.delivery_routes()
+            return 200, {"tree": lines, "shortest_depth": shortest}
+        root_id = query_int(query, "root")
+        depth = query_int(query, "depth")
+        if depth is not None and depth < 0:
+            raise HTTPError(400, "depth negatif olamaz")
+        expanded = None
+        if "expand" in query:
+            expanded = {parse_int(part, "expand") for part in query["expand"][-1].split(",") if part.strip()}
+        offset = query_int(query, "offset", 0)
+        if offset < 0:
+            raise HTTPError(400, "offset negatif olamaz")
+        limit = query_int(query, "limit", HISTORY_PAGE_SIZE)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f"limit 1-{MAX_PAGE_SIZE} arasında olmalı")
+        page = self.system.route_tree_page(root_id, depth, expanded, offset, limit)
+        if page is None:
+            raise HTTPError(404, "Şehir bulunamadı")
+        lines, has_next = page
+        return 200, {
+            "tree": lines,
+            "shortest_depth": self.system.shortest_route(),
+            "next_offset": offset + len(lines) if has_next else None
+        }
+
+    def connect_cities(self, body):
+        try:
+            city_a = body_int(body["city_a"], "city_a")
+            city_b = body_int(body["city_b"], "city_b")
+            hours = float(body["hours"])
+        except KeyError as e:
+            raise HTTPError(400, f"Eksik alan: {e.args[0]}")
+        except (TypeError, ValueError):
+            raise HTTPError(400, "hours sayı olmalı")
+        if not is_route_hours(hours):
+            raise HTTPError(400, "hours sonlu ve negatif olmayan bir sayı olmalı")
+        if not self.system.connect_cities(city_a, city_b, hours):
+            raise HTTPError(400, "Şube bulunamadı, şubeler aynı ya da süre negatif")
+        self.system.add_history(f"Şubeler bağlandı ({city_a}<->{city_b}, {hours:g} saat)")
+        return 200, {"city_a": city_a, "city_b": city_b, "hours": hours}
+
+    def route_between(self, query):
+        source_id = query_int(query, "from")
+        target_id = query_int(query, "to")
+        if source_id is None or target_id is None:
+            raise HTTPError(400, "from ve to parametreleri gerekli")
+        result = self.system.route_between(source_id, target_id, route_method(query))
+        if result is None:
+            raise HTTPError(404, "Şube ya da şubeler arasında yol bulunamadı")
+        return 200, route_to_dict(*result)
+
+    def stats(self, query):
+        return 200, {**self.system.stats(), "states": self.system.state_counts()}
+
+    ######################## Bağlantı işleme ########################
+
+    async def read_request(self, reader):
+        """
+        Tek bir HTTP/1.1 isteğini okur; bağlantı kapandıysa None döner.
+        Dönüş: (metot, hedef, sürüm, başlıklar, gövde)
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, "Eksik istek")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Başlıklar çok büyük")
+        except asyncio.TimeoutError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "Geçersiz istek satırı")
+        headers = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise HTTPError(400, "Geçersiz başlık")
+            headers[name.strip().lower()] = value.strip()
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(400, "Chunked gövde desteklenmiyor, Content-Length kullanın")
+        length = parse_int(headers.get("content-length", "0"), "Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Geçersiz Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Gövde çok büyük")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version, headers, body
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, raw_body = request
+                    connection = headers.get("connection", "").lower()
+                    if version == "HTTP/1.1":
+                        keep_alive = connection != "close"
+                    else:
+                        keep_alive = connection == "keep-alive"
+                    try:
+                        body = json.loads(raw_body) if raw_body else {}
+                    except ValueError:
+                        raise HTTPError(400, "Gövde geçerli JSON değil")
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "Gövde bir JSON nesnesi olmalı")
+                    status, payload = await asyncio.to_thread(self.dispatch, method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload = 500, {"error": f"Sunucu hatası: {e}"}
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    f"\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_HEADER_SIZE)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Kargo Takip Sistemi yerel HTTP/JSON sunucusu")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data", default=DATA_DIR, help="Kalıcı depolama dizini")
+    args = parser.parse_args()
+
+    system = CargoSystem()
+    store = CargoStore(args.data)
+    store.load(system)
+    print(f"Sunucu http://{args.host}:{args.port} adresinde dinliyor (Ctrl+C ile çıkış)")
+    try:
+        asyncio.run(CargoServer(system).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.checkpoint(system)
+        store.close()
+
+if __name__ == "__main__":
+    main()
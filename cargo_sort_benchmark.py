@@ -0,0 +1,107 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from cargo_core import (
+    CargoSystem, SORT_CACHED, SORT_INPLACE, SORT_REFERENCE, STATE_UNDELIVERED
+)
+
+##############################################################################
+#                   TESLİM EDİLMEMİŞ KARGO SIRALAMA KIYASLAMASI
+##############################################################################
+# CargoSystem.sorted_cargos'u referans özyinelemeli merge sort, yerinde sıralama ve
+# önbellekli yöntemle (değişiklikten sonraki ilk listeleme ve tekrar listeleme) aynı
+# veri üzerinde karşılaştırır; süreleri ve tracemalloc ile ölçülen en yüksek ek belleği yazdırır.
+#
+#   python cargo_sort_benchmark.py --sizes 10000 100000 1000000
+##############################################################################
+
+def make_system(n, seed=0):
+    """
+    n adet rastgele teslim edilmemiş kargosu olan bir CargoSystem (snapshot'tan toplu kurulur).
+    """
+    rnd = random.Random(seed)
+    system = CargoSystem()
+    data = system.to_snapshot()
+    data["customers"] = [{"customer_id": 1, "name": "Kıyas", "surname": "Müşteri",
+                          "shipments": [], "last_shipments": []}]
+    data["shipments"] = [
+        [sid, 1, 20240101 + rnd.randrange(28), STATE_UNDELIVERED, rnd.randrange(1, 31), STATE_UNDELIVERED]
+        for sid in rnd.sample(range(n * 10), n)
+    ]
+    system.restore_snapshot(data)
+    return system
+
+def measure(func, repeat, memory, before=None):
+    """
+    func'ı repeat kez çalıştırıp en iyi süreyi (sn), istenirse en yüksek ek belleği (bayt)
+    ve son sonucu döndürür. before verilirse her çalıştırmadan önce (ölçüm dışında) çağrılır.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        if before is not None:
+            before()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+def run_benchmark(n, repeat=3, memory=True):
+    """
+    Tek bir boyut için {yöntem: (süre, en yüksek ek bellek)} döndürür; teslim süresi
+    sırası referans merge sort'unkiyle aynı değilse AssertionError fırlatır.
+    """
+    system = make_system(n)
+
+    extra_ids = iter(range(n * 10, n * 20))
+
+    def invalidate():
+        # Kargo ekleyip teslim etmek teslim edilmemişleri aynı bırakır ama önbelleği geçersiz kılar
+        shipment_id = next(extra_ids)
+        system.add_shipment(1, shipment_id, 20240101, STATE_UNDELIVERED, 1)
+        system.deliver_shipment(shipment_id)
+
+    cases = [
+        ("merge (referans)", lambda: system.sorted_cargos(SORT_REFERENCE), None),
+        ("yerinde (list.sort)", lambda: system.sorted_cargos(SORT_INPLACE), None),
+        ("önbellek (ilk)", lambda: system.sorted_cargos(SORT_CACHED), invalidate),
+        ("önbellek (tekrar)", lambda: system.sorted_cargos(SORT_CACHED), None),
+    ]
+    results = {}
+    expected = None
+    for name, func, before in cases:
+        timing, peak, (_, undelivered) = measure(func, repeat, memory, before)
+        times = [sh[3] for sh in undelivered]
+        if expected is None:
+            expected = times
+        assert times == expected, name
+        results[name] = (timing, peak)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Teslim edilmemiş kargo sıralama kıyaslaması")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Her ölçüm için tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc bellek ölçümünü atla")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        print(f"=== {n} kargo ===")
+        results = run_benchmark(n, args.repeat, not args.no_memory)
+        base = results["merge (referans)"][0]
+        for name, (timing, peak) in results.items():
+            memory = f", en yüksek ek bellek {peak / 1024 / 1024:.1f} MB" if peak is not None else ""
+            print(f"{name:20} {timing * 1000:10.1f} ms  (x{base / timing:.1f}){memory}")
+
+if __name__ == "__main__":
+    main()
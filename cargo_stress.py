@@ -0,0 +1,398 @@
+import argparse
+import json
+import math
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+from cargo_core import CargoStore, CargoSystem, ShipmentState, STATE_DELIVERED, STATE_UNDELIVERED
+from cargo_server import CargoServer, HTTPError
+
+##############################################################################
+#                      EŞZAMANLI ERİŞİM STRES TESTİ
+##############################################################################
+# Aynı CargoSystem'i paylaşan kabul (intake), teslimat, temizlik ve okuma (panel)
+# thread'lerini birlikte çalıştırır; sonunda hiçbir güncellemenin kaybolmadığını,
+# yapıların birbiriyle tutarlı olduğunu ve log replay'inin aynı durumu verdiğini doğrular.
+#
+#   python cargo_stress.py --writers 8 --readers 4 --ops 2000
+##############################################################################
+
+class Counters:
+    """
+    Thread'lerin başarılı işlem sayılarını toplar (kendi kilidiyle).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def add(self, name, amount=1):
+        with self.lock:
+            self.values[name] = self.values.get(name, 0) + amount
+
+    def get(self, name):
+        return self.values.get(name, 0)
+
+def intake_worker(system, worker_no, ops, counters, delivered_queue):
+    """
+    Kendi müşterilerini ve kargolarını ekler; eklenen teslim edilmemiş kargoları teslimat kuyruğuna atar.
+    """
+    rnd = random.Random(worker_no)
+    base = worker_no * 10_000_000
+    customer_ids = []
+    for i in range(ops):
+        if i % 50 == 0:
+            cid = base + i
+            if system.create_customer(cid, f"Ad{worker_no}", f"Soyad{i}"):
+                counters.add("customers")
+                customer_ids.append(cid)
+        shipment_id = base + 1_000_000 + i
+        status = STATE_DELIVERED if rnd.random() < 0.2 else STATE_UNDELIVERED
+        if system.add_shipment(rnd.choice(customer_ids), shipment_id, 20240101 + rnd.randrange(28),
+                               status, rnd.randrange(10)):
+            counters.add("shipments")
+            if status == STATE_DELIVERED:
+                counters.add("delivered")
+            else:
+                delivered_queue.append(shipment_id)
+
+def delivery_worker(system, worker_no, stop, counters, delivered_queue):
+    """
+    Kuyruktaki kargoları tek tek ya da toplu olarak teslim eder.
+    """
+    rnd = random.Random(1000 + worker_no)
+    while not stop.is_set() or delivered_queue:
+        batch = []
+        while delivered_queue and len(batch) < 20:
+            try:
+                batch.append(delivered_queue.pop())
+            except IndexError:
+                break
+        if not batch:
+            time.sleep(0.001)
+            continue
+        if rnd.random() < 0.5:
+            for shipment_id in batch:
+                sh, _ = system.deliver_shipment(shipment_id)
+                if sh is not None:
+                    counters.add("delivered")
+        else:
+            delivered, _ = system.deliver_shipments_batch(batch)
+            counters.add("delivered", len(delivered))
+
+def clear_worker(system, stop, counters):
+    """
+    Ara sıra tüm teslim edilmemiş kargoları siler (teslimatla yarışır).
+    """
+    while not stop.is_set():
+        time.sleep(0.05)
+        counters.add("cleared", system.drop_undelivered_shipments())
+
+def reader_worker(system, stop, counters):
+    """
+    Panel benzeri okuma yükü: istatistik, öncelik kuyruğu, sıralı liste, rota.
+    """
+    while not stop.is_set():
+        stats = system.stats()
+        if stats["total"] != stats["delivered"] + stats["undelivered"]:
+            counters.add("inconsistent_reads")
+        system.priority_cargos()
+        system.longest_delivered()
+        system.delivery_routes()
+        counters.add("reads")
+
+def check_invariants(system, counters):
+    """
+    Sayımların ve yapıların tutarlılığını doğrular; hata mesajlarının listesini döndürür.
+    """
+    errors = []
+    stats = system.stats()
+    if stats["customers"] != counters.get("customers"):
+        errors.append(f"Müşteri sayısı {stats['customers']} != {counters.get('customers')}")
+    if stats["delivered"] != counters.get("delivered"):
+        errors.append(f"Teslim sayısı {stats['delivered']} != {counters.get('delivered')}")
+    expected_total = counters.get("shipments") - counters.get("cleared")
+    if stats["total"] != expected_total:
+        errors.append(f"Toplam kargo {stats['total']} != {expected_total}")
+    store = system.shipment_store
+    if len(store) != stats["total"]:
+        errors.append("Global index ile listeler uyuşmuyor")
+    pq = system.priority_queue
+    if not (len(pq.heap) == len(pq.position) == stats["undelivered"]):
+        errors.append("Öncelik kuyruğu ile teslim edilmemiş kargolar uyuşmuyor")
+    for i, item in enumerate(pq.heap):
+        if pq.position.get(item[1]) != i:
+            errors.append(f"PQ konum tablosu bozuk (ID={item[1]})")
+            break
+        if i and pq.heap[(i - 1) // 2] > item:
+            errors.append("Heap sırası bozuk")
+            break
+    ids = list(system.delivered_shipments.ids)
+    if ids != sorted(ids) or len(set(ids)) != len(ids):
+        errors.append("Teslim edilmiş index sıralı/tekil değil")
+    for row in store.registered_rows():
+        shipment_id = store.ids[row]
+        state = store.states[row]
+        if state == ShipmentState.DELIVERED and system.delivered_shipments.find(shipment_id) is None:
+            errors.append(f"Teslim edilmiş kargo index'te yok (ID={shipment_id})")
+            break
+        if state == ShipmentState.UNDELIVERED and shipment_id not in pq:
+            errors.append(f"Teslim edilmemiş kargo kuyrukta yok (ID={shipment_id})")
+            break
+    for state in ShipmentState.ALL:
+        rows = store.rows_in_state(state)
+        if len(rows) != store.count(state) or any(store.states[row] != state for row in rows):
+            errors.append(f"Durum listesi/sayacı bozuk ({ShipmentState.label(state)})")
+    if counters.get("inconsistent_reads"):
+        errors.append(f"{counters.get('inconsistent_reads')} tutarsız okuma")
+    return errors
+
+def comparable_state(system):
+    with system.guard(read=system.LOCK_ORDER):
+        state = system.to_snapshot()
+    state.pop("history")
+    return state
+
+def run_stress_test(writers=8, readers=4, deliverers=4, ops=2000, data_dir=None):
+    """
+    Stres testini çalıştırır. data_dir verilirse sistem kalıcı depolamaya bağlanır ve
+    sonunda log replay'inin aynı durumu ürettiği de kontrol edilir.
+    Dönüş: (hata listesi, ölçümler dict)
+    """
+    system = CargoSystem()
+    store = None
+    if data_dir is not None:
+        store = CargoStore(data_dir, snapshot_every=5000)
+        store.load(system)
+    counters = Counters()
+    delivered_queue = []
+    stop = threading.Event()
+    intake = [
+        threading.Thread(target=intake_worker, args=(system, w + 1, ops, counters, delivered_queue))
+        for w in range(writers)
+    ]
+    background = [
+        threading.Thread(target=delivery_worker, args=(system, w, stop, counters, delivered_queue))
+        for w in range(deliverers)
+    ]
+    background.append(threading.Thread(target=clear_worker, args=(system, stop, counters)))
+    background.extend(
+        threading.Thread(target=reader_worker, args=(system, stop, counters)) for _ in range(readers)
+    )
+    start = time.perf_counter()
+    for t in intake + background:
+        t.start()
+    for t in intake:
+        t.join()
+    stop.set()
+    for t in background:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    errors = check_invariants(system, counters)
+    if store is not None:
+        store.close()
+        reloaded = CargoSystem()
+        store = CargoStore(data_dir)
+        store.load(reloaded)
+        store.close()
+        if comparable_state(reloaded) != comparable_state(system):
+            errors.append("Log replay'i bellekteki durumla aynı değil")
+    metrics = {
+        "seconds": elapsed,
+        "shipments": counters.get("shipments"),
+        "delivered": counters.get("delivered"),
+        "cleared": counters.get("cleared"),
+        "reads": counters.get("reads"),
+        "writes_per_sec": counters.get("shipments") / elapsed if elapsed > 0 else 0.0,
+        "reads_per_sec": counters.get("reads") / elapsed if elapsed > 0 else 0.0,
+    }
+    return errors, metrics
+
+##############################################################################
+#                      EK KONTROLLER (REGRESYON)
+##############################################################################
+# Her kontrol hata mesajlarının listesini döndürür; main stres testinden sonra çalıştırır.
+
+def check_flush_latency(data_dir):
+    """
+    flush() ve checkpoint(), fsync_interval dolmasını beklemeden dönmeli.
+    """
+    errors = []
+    interval = 2.0
+    system = CargoSystem()
+    store = CargoStore(data_dir, fsync_interval=interval)
+    store.load(system)
+    try:
+        system.create_customer(1, "Ali", "Kaya")
+        start = time.perf_counter()
+        store.flush()
+        if time.perf_counter() - start > interval / 4:
+            errors.append("flush() fsync_interval'i bekledi")
+        system.add_shipment(1, 1, 20240101, STATE_UNDELIVERED, 3)
+        start = time.perf_counter()
+        store.checkpoint(system)
+        if time.perf_counter() - start > interval / 4:
+            errors.append("checkpoint() fsync_interval'i bekledi")
+    finally:
+        store.close()
+    return errors
+
+def check_route_hours(data_dir):
+    """
+    NaN, sonsuz ve negatif yol süreleri çekirdekte ve sunucuda reddedilmeli.
+    """
+    errors = []
+    system = CargoSystem()
+    for hours in (float("nan"), float("inf"), -1.0):
+        if system.connect_cities(1, 2, hours):
+            errors.append(f"connect_cities {hours} süresini kabul etti")
+        if system.insert_city(1, 900, "Deneme", hours) is not None:
+            errors.append(f"insert_city {hours} süresini kabul etti")
+    server = CargoServer(system)
+    for text in ("NaN", "Infinity", "-1"):
+        body = json.loads('{"city_a": 1, "city_b": 2, "hours": %s}' % text)
+        try:
+            server.dispatch("POST", "/routes", body)
+            errors.append(f"POST /routes hours={text} kabul edildi")
+        except HTTPError as e:
+            if e.status != 400:
+                errors.append(f"POST /routes hours={text} {e.status} döndü")
+    found = system.route_between(1, 2)
+    if found is None or not math.isfinite(found[0]):
+        errors.append("Reddedilen süreler rotayı bozdu")
+    return errors
+
+def check_eta_date_range(data_dir):
+    """
+    Tarih aralığının sonundaki kargonun tahmini varış tarihi hata yerine None olmalı.
+    """
+    errors = []
+    system = CargoSystem()
+    system.create_customer(1, "Ali", "Kaya")
+    system.add_shipment(1, 1, 99991231, STATE_UNDELIVERED, 3, origin_id=1, destination_id=2)
+    try:
+        eta = system.shipment_eta(1)
+    except OverflowError:
+        return ["shipment_eta tarih taşmasında OverflowError verdi"]
+    if eta is None or eta[0] is not None:
+        errors.append(f"Taşan tarih için varış None olmalı: {eta}")
+    return errors
+
+def check_history_cursor(data_dir):
+    """
+    Negatif kargo ID'li müşterinin geçmişi tüm sayfalarıyla gezilebilmeli.
+    """
+    system = CargoSystem()
+    system.create_customer(1, "Ali", "Kaya")
+    expected = list(range(-10, 0))
+    for shipment_id in expected:
+        system.add_shipment(1, shipment_id, 20240101, STATE_UNDELIVERED, 3)
+    server = CargoServer(system)
+    seen = []
+    target = "/customers/1/history?page_size=3"
+    while True:
+        try:
+            _, payload = server.dispatch("GET", target, {})
+        except HTTPError as e:
+            return [f"Geçmiş sayfalama {e.status} döndü: {e.message}"]
+        seen.extend(item["shipment_id"] for item in payload["shipments"])
+        if payload["next_cursor"] is None:
+            break
+        target = f"/customers/1/history?page_size=3&cursor={payload['next_cursor']}"
+    if sorted(seen) != expected:
+        return [f"Geçmiş sayfaları eksik: {seen}"]
+    return []
+
+def check_strict_body_ints(data_dir):
+    """
+    Gövdedeki true ya da 2.7 gibi değerler müşteri ID'si olarak kabul edilmemeli (400).
+    """
+    errors = []
+    server = CargoServer(CargoSystem())
+    for value in (True, 2.7, "2.7", None):
+        body = {"customer_id": value, "name": "Ali", "surname": "Kaya"}
+        try:
+            server.dispatch("POST", "/customers", body)
+            errors.append(f"customer_id={value!r} kabul edildi")
+        except HTTPError as e:
+            if e.status != 400:
+                errors.append(f"customer_id={value!r} {e.status} döndü")
+    status, _ = server.dispatch("POST", "/customers", {"customer_id": 2, "name": "Ali", "surname": "Kaya"})
+    if status != 201:
+        errors.append("Geçerli customer_id reddedildi")
+    return errors
+
+def check_removed_after_restore(data_dir):
+    """
+    Silinmiş kargolar, müşterileri de silinse snapshot'tan açılışta sayılmaya devam etmeli.
+    """
+    system = CargoSystem()
+    store = CargoStore(data_dir)
+    store.load(system)
+    rnd = random.Random(7)
+    for cid in range(1, 21):
+        system.create_customer(cid, "Ali", f"Kaya{cid}")
+        for n in range(10):
+            state = STATE_DELIVERED if rnd.random() < 0.3 else STATE_UNDELIVERED
+            system.add_shipment(cid, cid * 100 + n, 20240101 + n, state, rnd.randint(1, 9))
+    system.drop_undelivered_shipments()
+    for cid in rnd.sample(range(1, 21), 8):
+        system.delete_customer(cid)
+    # Silinip yeniden açılan müşterinin eski kargoları yeni geçmişinde yer almaz
+    system.create_customer(1, "Ayşe", "Demir")
+    expected = system.state_counts()
+    store.checkpoint(system)
+    store.close()
+    reloaded = CargoSystem()
+    store = CargoStore(data_dir)
+    store.load(reloaded)
+    store.close()
+    if reloaded.state_counts() != expected:
+        return [f"Snapshot sonrası durum sayaçları farklı: {reloaded.state_counts()} != {expected}"]
+    return []
+
+def run_checks():
+    """
+    Tüm ek kontrolleri geçici dizinlerde çalıştırır; hata listesini döndürür.
+    """
+    errors = []
+    for check in (check_flush_latency, check_route_hours, check_eta_date_range,
+                  check_history_cursor, check_strict_body_ints,
+                  check_removed_after_restore):
+        data_dir = tempfile.mkdtemp(prefix="kargo_check_")
+        try:
+            errors.extend(check(data_dir))
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description="CargoSystem eşzamanlı erişim stres testi")
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--deliverers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000, help="Yazar başına eklenecek kargo sayısı")
+    parser.add_argument("--no-storage", action="store_true", help="Kalıcı depolama olmadan çalıştır")
+    args = parser.parse_args()
+
+    data_dir = None if args.no_storage else tempfile.mkdtemp(prefix="kargo_stress_")
+    try:
+        errors, metrics = run_stress_test(args.writers, args.readers, args.deliverers, args.ops, data_dir)
+    finally:
+        if data_dir is not None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    errors.extend(run_checks())
+    for key, value in metrics.items():
+        print(f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}")
+    if errors:
+        print("HATALAR:")
+        for e in errors:
+            print(f"  - {e}")
+        raise SystemExit(1)
+    print("Tüm kontroller başarılı: kayıp güncelleme yok.")
+
+if __name__ == "__main__":
+    main()
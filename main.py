@@ -1,6 +1,10 @@
 import PySimpleGUI as sg
-import heapq
-from collections import deque
+import time
+from cargo_core import (
+    CargoStore, CargoSystem, DATA_DIR, DEFAULT_ROUTE_HOURS, HISTORY_PAGE_SIZE, PREDICT_ALL,
+    PREDICT_CUSTOMER, PREDICT_ROUTE, STATE_DELIVERED, STATE_UNDELIVERED, ShipmentState,
+    is_int64, is_route_hours, parse_shipment_state
+)
 
 ##############################################################################
 #                           GENEL AYARLAR
@@ -14,6 +18,13 @@ GENEL_FONT = ("Verdana", 14, "bold")
 # Karmaşıklık ASCII grafikleri için monospaced font
 POPUP_FONT = ("Courier New", 12)
 
+# Teslim süresi tahmininin hangi geçmişten geldiği
+PREDICTION_SOURCES = {
+    PREDICT_ROUTE: "aynı şube çifti",
+    PREDICT_CUSTOMER: "müşterinin geçmişi",
+    PREDICT_ALL: "tüm teslimatlar",
+}
+
 ##############################################################################
 #                   ZAMAN KARMAŞIKLIĞI GÖRSELLEŞTİRME
 ##############################################################################
@@ -24,28 +35,32 @@ def print_complexity(choice):
     zaman karmaşıklığı bilgisini ve basit bir ASCII 'graph' gösterir.
     """
     complexity_map = {
-        '1':  ("O(n)",       "****"),
-        '2':  ("O(n)",       "****"),
+        '1':  ("O(1)",       "*"),
+        '2':  ("O(log n)",   "**"),
         '3':  ("O(log n)",   "**"),
-        '4':  ("O(n)",       "****"),
+        '4':  ("O(log n)",   "**"),
         '5':  ("O(n log n)", "******"),
-        '6':  ("O(n)",       "****"),
+        '6':  ("O(sayfa)",   "**"),
         '7':  ("O(1)",       "*"),
         '8':  ("O(n)",       "****"),
-        '9':  ("O(n)",       "****"),
-        '10': ("O(n)",       "****"),
-        '11': ("O(n)",       "****"),
-        '12': ("O(n)",       "****"),
-        '13': ("O(n log n)", "******"),
-        '14': ("O(n)",       "****"),
-        '15': ("O(n)",       "****"),
-        '16': ("O(n)",       "****"),
-        '17': ("O(n)",       "****"),
-        '18': ("O(n)",       "****"),
+        '9':  ("O(1)",       "*"),
+        '10': ("O(log n)",   "**"),
+        '11': ("O(1)",       "*"),
+        '12': ("O(1)",       "*"),
+        '13': ("O(log n)",   "**"),
+        '14': ("O(log n)",   "**"),
+        '15': ("O(1)",       "*"),
+        '16': ("O(1)",       "*"),
+        '17': ("O(1)",       "*"),
+        '18': ("O(1)",       "*"),
         '19': ("O(n)",       "****"),
         # 20 => Çıkış (buna O(1) denilebilir)
         # 21 => İşlem Geçmişi (buna da O(n) denilebilir)
-        '21': ("O(n)",       "****"),
+        '21': ("O(1)",       "*"),
+        '22': ("O(n)",       "****"),
+        '23': ("O(n)",       "****"),
+        '25': ("O(K log k)", "***"),
+        '26': ("O(1) amortize", "*"),
     }
     if choice in complexity_map:
         comp_str, graph = complexity_map[choice]
@@ -62,341 +77,66 @@ def print_complexity(choice):
             size=(50, 8)
         )
 
-##############################################################################
-#                           VERİ YAPISI SINIFLARI
-##############################################################################
-
-class ShipmentNode:
-    def __init__(self, shipment_id, date, status, delivery_time):
-        self.shipment_id = shipment_id
-        self.date = date
-        self.status = status
-        self.delivery_time = delivery_time
-        self.next = None
-
-class ShipmentLinkedList:
-    def __init__(self):
-        self.head = None
-
-    def insert_sorted(self, shipment_id, date, status, delivery_time):
-        """
-        Yeni gönderiyi tarih bazında sıralı ekler (O(n))
-        """
-        new_node = ShipmentNode(shipment_id, date, status, delivery_time)
-        if self.head is None or date < self.head.date:
-            new_node.next = self.head
-            self.head = new_node
-        else:
-            current = self.head
-            while current.next is not None and current.next.date < date:
-                current = current.next
-            new_node.next = current.next
-            current.next = new_node
-
-    def display(self):
-        """
-        Tüm gönderileri ekrana basar (O(n))
-        """
-        current = self.head
-        if current is None:
-            sg.popup("Gönderim geçmişi boş.", title="Gönderim Geçmişi", font=GENEL_FONT)
-            return
-        message = []
-        while current:
-            msg = (
-                f"Kargo ID: {current.shipment_id}, Tarih: {current.date}, "
-                f"Durum: {current.status}, Süre: {current.delivery_time} gün"
-            )
-            message.append(msg)
-            current = current.next
-        sg.popup_scrolled("\n".join(message), title="Gönderim Geçmişi", font=GENEL_FONT)
-
-    def get_all_shipments(self):
-        """
-        Tüm gönderileri liste olarak döndürür (O(n))
-        """
-        shipments = []
-        current = self.head
-        while current:
-            shipments.append((current.shipment_id, current.date, current.status, current.delivery_time))
-            current = current.next
-        return shipments
-
-class CustomerNode:
-    def __init__(self, customer_id, name, surname):
-        self.customer_id = customer_id
-        self.name = name
-        self.surname = surname
-        self.shipment_history = ShipmentLinkedList()
-        self.last_shipments_stack = []
-        self.next = None
-
-    def push_last_shipment(self, shipment):
-        """
-        Son 5 gönderiyi stack (liste) mantığıyla tutar.
-        """
-        self.last_shipments_stack.append(shipment)
-        if len(self.last_shipments_stack) > 5:
-            self.last_shipments_stack.pop(0)
-
-    def display_last_shipments(self):
-        """
-        Son 5 gönderiyi ters sırada gösterir (stack).
-        """
-        if not self.last_shipments_stack:
-            sg.popup(
-                "Bu müşterinin gönderim geçmişi boş.",
-                title="Son Gönderiler",
-                font=GENEL_FONT
-            )
-            return
-        lines = []
-        for sh in reversed(self.last_shipments_stack):
-            lines.append(
-                f"Kargo ID: {sh[0]}, Tarih: {sh[1]}, Durum: {sh[2]}, Süre: {sh[3]}"
-            )
-        sg.popup_scrolled("\n".join(lines), title="Son Gönderiler", font=GENEL_FONT)
-
-class CustomerLinkedList:
-    def __init__(self):
-        self.head = None
-
-    def add_customer(self, customer_id, name, surname):
-        """
-        Müşteri eklemeden önce ID var mı diye kontrol ediyoruz (O(n))
-        """
-        if self.find_customer(customer_id):
-            sg.popup("Bu müşteri ID zaten mevcut!", title="Hata", font=GENEL_FONT)
-            return
-        new_customer = CustomerNode(customer_id, name, surname)
-        new_customer.next = self.head
-        self.head = new_customer
-
-    def find_customer(self, customer_id):
-        """
-        ID'ye göre müşteri aramak (O(n))
-        """
-        current = self.head
-        while current:
-            if current.customer_id == customer_id:
-                return current
-            current = current.next
-        return None
-
-    def remove_customer(self, customer_id):
-        """
-        Bağlı listeden müşteri silmek (O(n))
-        """
-        current = self.head
-        prev = None
-        while current:
-            if current.customer_id == customer_id:
-                if prev is None:
-                    self.head = current.next
-                else:
-                    prev.next = current.next
-                sg.popup(
-                    f"Müşteri {customer_id} silindi.",
-                    title="Silme Başarılı",
-                    font=GENEL_FONT
-                )
-                return
-            prev = current
-            current = current.next
-        sg.popup("Müşteri bulunamadı, silinemedi.", title="Hata", font=GENEL_FONT)
-
-    def get_all_customers(self):
-        """
-        Tüm müşteri düğümlerini listeye atıp döndürür (O(n))
-        """
-        customers = []
-        current = self.head
-        while current:
-            customers.append(current)
-            current = current.next
-        return customers
-
-    def display_all_customers(self):
-        """
-        Tüm müşterileri ekrana basar (O(n))
-        """
-        current = self.head
-        if current is None:
-            sg.popup(
-                "Sistemde müşteri bulunmuyor.",
-                title="Müşteriler",
-                font=GENEL_FONT
-            )
-            return
-        lines = []
-        while current:
-            msg = f"Müşteri ID: {current.customer_id}, İsim: {current.name} {current.surname}"
-            lines.append(msg)
-            current = current.next
-        sg.popup_scrolled("\n".join(lines), title="Müşteriler", font=GENEL_FONT)
-
-class CargoPriorityQueue:
-    def __init__(self):
-        self.heap = []
-
-    def add_cargo(self, shipment_id, delivery_time, status):
-        """
-        Heap kullanarak O(log n) ekleme
-        """
-        heapq.heappush(self.heap, (delivery_time, shipment_id, status))
-
-    def pop_cargo(self):
-        if not self.heap:
-            return None
-        return heapq.heappop(self.heap)
-
-    def remove_cargo_by_id(self, shipment_id):
-        """
-        Heap içinde ID arayarak silme (O(n))
-        """
-        removed = False
-        temp = []
-        while self.heap:
-            item = heapq.heappop(self.heap)
-            if item[1] == shipment_id:
-                removed = True
-            else:
-                temp.append(item)
-        for t in temp:
-            heapq.heappush(self.heap, t)
-        return removed
-
-    def display_all(self):
-        """
-        Heap'teki tüm kargoları teslim süresine göre artan sırada göster
-        """
-        temp = sorted(self.heap, key=lambda x: x[0])
-        if not temp:
-            sg.popup("Öncelikli kargo bulunmuyor.", title="Priority Queue", font=GENEL_FONT)
-            return
-        lines = []
-        for item in temp:
-            lines.append(f"Kargo ID: {item[1]}, Süre: {item[0]} gün, Durum: {item[2]}")
-        sg.popup_scrolled("\n".join(lines), title="Priority Queue", font=GENEL_FONT)
-
-class CityNode:
-    def __init__(self, city_id, city_name):
-        self.city_id = city_id
-        self.city_name = city_name
-        self.children = []
-
-    def add_child(self, child_node):
-        """
-        Bir şehri diğerinin altına ekler (O(1))
-        """
-        self.children.append(child_node)
-
-def print_tree(root, level=0, lines=None):
-    """
-    Ağaçtaki düğümleri hiyerarşik biçimde yazdırır (O(n))
-    """
-    if lines is None:
-        lines = []
-    lines.append("    " * level + f"{root.city_name} (ID: {root.city_id})")
-    for child in root.children:
-        print_tree(child, level+1, lines)
-    return lines
-
-def shortest_route_depth(root):
-    """
-    BFS ile ağacın en kısa rota derinliğini bulur (O(n))
+def show_paged_window(title, fetch_page):
     """
-    q = deque([(root, 1)])
-    while q:
-        node, depth = q.popleft()
-        if not node.children:
-            return depth
-        for c in node.children:
-            q.append((c, depth+1))
-    return 1
-
-def binary_search_delivered(arr, target_id):
+    Sayfa sayfa gezilebilen bir pencere açar. fetch_page(sayfa_no) ->
+    (satırlar, sonraki sayfa var mı); yalnızca ekrandaki sayfa istenir.
     """
-    ID'ye göre sıralanmış teslim edilmiş kargolar listesinde binary search (O(log n))
-    """
-    low, high = 0, len(arr) - 1
-    while low <= high:
-        mid = (low + high) // 2
-        if arr[mid][0] == target_id:
-            return arr[mid]
-        elif arr[mid][0] < target_id:
-            low = mid + 1
+    page_no = 0
+    lines, has_next = fetch_page(page_no)
+    layout = [
+        [sg.Multiline(size=(80, 20), key="page", disabled=True)],
+        [sg.Text("", key="info")],
+        [sg.Button("Önceki"), sg.Button("Sonraki"), sg.Button("Kapat")]
+    ]
+    window = sg.Window(title, layout, font=GENEL_FONT, finalize=True)
+    while True:
+        window["page"].update("\n".join(lines))
+        window["info"].update(f"Sayfa {page_no + 1}")
+        window["Önceki"].update(disabled=page_no == 0)
+        window["Sonraki"].update(disabled=not has_next)
+        event, values = window.read()
+        if event in (sg.WINDOW_CLOSED, "Kapat"):
+            break
+        if event == "Sonraki" and has_next:
+            page_no += 1
+        elif event == "Önceki" and page_no > 0:
+            page_no -= 1
         else:
-            high = mid - 1
-    return None
-
-def merge_sort_shipments(arr):
-    """
-    Teslim edilmemiş kargoları teslim süresine göre merge sort (O(n log n))
-    """
-    if len(arr) > 1:
-        mid = len(arr)//2
-        left = arr[:mid]
-        right = arr[mid:]
-        merge_sort_shipments(left)
-        merge_sort_shipments(right)
-        i = j = k = 0
-        while i < len(left) and j < len(right):
-            if left[i][3] < right[j][3]:
-                arr[k] = left[i]
-                i += 1
-            else:
-                arr[k] = right[j]
-                j += 1
-            k += 1
-        while i < len(left):
-            arr[k] = left[i]
-            i += 1
-            k += 1
-        while j < len(right):
-            arr[k] = right[j]
-            j += 1
-            k += 1
+            continue
+        lines, has_next = fetch_page(page_no)
+    window.close()
 
 ##############################################################################
-#                          CARGO SYSTEM SINIFI
+#                          ARAYÜZ (CargoSystem istemcisi)
 ##############################################################################
 
-class CargoSystem:
-    def __init__(self):
-        self.customers = CustomerLinkedList()
-        self.priority_queue = CargoPriorityQueue()
-        self.delivered_shipments = []
-        self.undelivered_shipments = []
-        self.transaction_history = []
-        self.root_city = CityNode(0, "Merkez")
-        c1 = CityNode(1, "İstanbul")
-        c2 = CityNode(2, "Ankara")
-        c3 = CityNode(3, "İzmir")
-        c4 = CityNode(4, "Bursa")
-        self.root_city.add_child(c1)
-        self.root_city.add_child(c2)
-        c2.add_child(c3)
-        c3.add_child(c4)
-
-    def add_history(self, message):
-        """
-        İşlem geçmişine yeni bir kayıt ekler.
-        """
-        self.transaction_history.append(message)
+class CargoApp:
+    """
+    PySimpleGUI diyalogları. Tüm iş mantığı cargo_core.CargoSystem'dedir;
+    bu sınıf yalnızca girdileri toplayıp sonuçları gösterir.
+    """
+    def __init__(self, system):
+        self.system = system
 
     def show_history(self):
         """
-        Tüm işlem geçmişini GUI'de gösterir.
+        İşlem geçmişini en yeni kayıtlardan başlayarak sayfa sayfa gösterir.
         """
-        if not self.transaction_history:
+        if not self.system.history_page(0, 1)[0]:
             sg.popup("Henüz herhangi bir işlem yapılmadı.", title="İşlem Geçmişi")
             print_complexity('21')
             return
-        lines = []
-        for idx, h in enumerate(self.transaction_history, start=1):
-            lines.append(f"{idx}. {h}")
-        sg.popup_scrolled("\n".join(lines), title="İşlem Geçmişi")
+
+        def fetch_page(page_no):
+            entries, has_next = self.system.history_page(page_no)
+            lines = [
+                f"{no}. [{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}] {message}"
+                for no, ts, message in entries
+            ]
+            return lines, has_next
+
+        show_paged_window("İşlem Geçmişi", fetch_page)
         print_complexity('21')
 
     def add_customer(self):
@@ -414,11 +154,15 @@ class CargoSystem:
             if event == "Kaydet":
                 try:
                     cid = int(values["cid"])
+                    if not is_int64(cid):
+                        raise ValueError(cid)
                     name = values["name"]
                     surname = values["surname"]
-                    self.customers.add_customer(cid, name, surname)
+                    if not self.system.create_customer(cid, name, surname):
+                        sg.popup("Bu müşteri ID zaten mevcut!", title="Hata", font=GENEL_FONT)
+                        break
                     sg.popup("Müşteri eklendi!", title="Başarılı", font=GENEL_FONT)
-                    self.add_history(f"Müşteri eklendi (ID={cid}, İsim={name}, Soyisim={surname})")
+                    self.system.add_history(f"Müşteri eklendi (ID={cid}, İsim={name}, Soyisim={surname})")
                     print_complexity('1')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir ID giriniz!", title="Hata", font=GENEL_FONT)
@@ -430,8 +174,11 @@ class CargoSystem:
             [sg.Text("Müşteri ID: "), sg.Input(key="cid")],
             [sg.Text("Gönderi ID: "), sg.Input(key="shipment_id")],
             [sg.Text("Gönderi Tarihi (YYYYMMDD): "), sg.Input(key="date")],
-            [sg.Text("Durum: (Teslim Edildi/Teslim Edilmedi)"), sg.Input(key="status")],
-            [sg.Text("Teslim süresi (gün): "), sg.Input(key="delivery_time")],
+            [sg.Text("Durum: "), sg.Combo([STATE_UNDELIVERED, STATE_DELIVERED], default_value=STATE_UNDELIVERED,
+                                          key="status", readonly=True)],
+            [sg.Text("Teslim süresi (gün, boş = geçmişten tahmin): "), sg.Input(key="delivery_time")],
+            [sg.Text("Çıkış şubesi ID (isteğe bağlı): "), sg.Input(key="origin_id")],
+            [sg.Text("Varış şubesi ID (isteğe bağlı): "), sg.Input(key="destination_id")],
             [sg.Button("Ekle"), sg.Button("Vazgeç")]
         ]
         window = sg.Window("Kargo Gönderimi Ekle", layout, font=GENEL_FONT)
@@ -444,21 +191,47 @@ class CargoSystem:
                     cid = int(values["cid"])
                     shipment_id = int(values["shipment_id"])
                     date = int(values["date"])
-                    status = values["status"]
-                    delivery_time = int(values["delivery_time"])
-                    customer = self.customers.find_customer(cid)
-                    if not customer:
+                    state = parse_shipment_state(values["status"])
+                    delivery_time = int(values["delivery_time"]) if values["delivery_time"].strip() else None
+                    origin_id, destination_id = (
+                        int(values[key]) if values[key].strip() else None
+                        for key in ("origin_id", "destination_id")
+                    )
+                    numbers = (cid, shipment_id, date, delivery_time, origin_id, destination_id)
+                    if not all(value is None or is_int64(value) for value in numbers):
+                        raise ValueError(numbers)
+                    if state is None:
+                        sg.popup("Geçersiz durum! (Teslim Edildi/Teslim Edilmedi)", title="Hata", font=GENEL_FONT)
+                        break
+                    status = ShipmentState.label(state)
+                    if self.system.get_customer(cid) is None:
                         sg.popup("Müşteri bulunamadı!", title="Hata", font=GENEL_FONT)
                         break
-                    customer.shipment_history.insert_sorted(shipment_id, date, status, delivery_time)
-                    customer.push_last_shipment((shipment_id, date, status, delivery_time))
-                    if status != "Teslim Edildi":
-                        self.priority_queue.add_cargo(shipment_id, delivery_time, "İşleme Alındı")
-                        self.undelivered_shipments.append((shipment_id, date, status, delivery_time))
-                    else:
-                        self.delivered_shipments.append((shipment_id, date, status, delivery_time))
-                    sg.popup("Gönderi eklendi!", title="Başarılı", font=GENEL_FONT)
-                    self.add_history(f"Kargo eklendi (MüşteriID={cid}, KargoID={shipment_id}, Durum={status})")
+                    if (origin_id is None) != (destination_id is None):
+                        sg.popup("Çıkış ve varış şubesi birlikte girilmeli!", title="Hata", font=GENEL_FONT)
+                        break
+                    if origin_id is not None and (self.system.get_city(origin_id) is None
+                                                  or self.system.get_city(destination_id) is None):
+                        sg.popup("Şube bulunamadı!", title="Hata", font=GENEL_FONT)
+                        break
+                    message = "Gönderi eklendi!"
+                    if delivery_time is None:
+                        prediction = self.system.predict_delivery_time(cid, origin_id, destination_id)
+                        if prediction is None:
+                            sg.popup("Tahmin için teslimat geçmişi yok, teslim süresini girin!",
+                                     title="Hata", font=GENEL_FONT)
+                            break
+                    # Süre boşsa tahmini sistem atar ve kargoyu tahminli olarak işaretler
+                    if not self.system.add_shipment(cid, shipment_id, date, status, delivery_time,
+                                                    origin_id, destination_id):
+                        sg.popup("Bu kargo ID zaten mevcut!", title="Hata", font=GENEL_FONT)
+                        break
+                    if delivery_time is None:
+                        _, source, samples = prediction
+                        predicted_time = self.system.find_shipment(shipment_id).shipment[3]
+                        message += f"\nTahmini teslim süresi: {predicted_time} gün ({PREDICTION_SOURCES[source]}, {samples} teslimat)"
+                    sg.popup(message, title="Başarılı", font=GENEL_FONT)
+                    self.system.add_history(f"Kargo eklendi (MüşteriID={cid}, KargoID={shipment_id}, Durum={status})")
                     print_complexity('2')
                 except ValueError:
                     sg.popup("Lütfen tüm alanları doğru formatta doldurun!", title="Hata", font=GENEL_FONT)
@@ -478,22 +251,21 @@ class CargoSystem:
             if event == "Ara":
                 try:
                     target = int(values["target"])
-                    delivered_sorted = sorted(self.delivered_shipments, key=lambda x: x[0])
-                    result = binary_search_delivered(delivered_sorted, target)
+                    result = self.system.search_delivered(target)
                     if result:
                         sg.popup(
                             f"BULUNDU:\n\nID: {result[0]}, Tarih: {result[1]}, Durum: {result[2]}, Süre: {result[3]} gün",
                             title="Sonuç",
                             font=GENEL_FONT
                         )
-                        self.add_history(f"Kargo durumu sorgulandı (KargoID={target} - Bulundu)")
+                        self.system.add_history(f"Kargo durumu sorgulandı (KargoID={target} - Bulundu)")
                     else:
                         sg.popup(
                             "Bu ID'ye sahip teslim edilmiş kargo bulunamadı.",
                             title="Sonuç",
                             font=GENEL_FONT
                         )
-                        self.add_history(f"Kargo durumu sorgulandı (KargoID={target} - Bulunamadı)")
+                        self.system.add_history(f"Kargo durumu sorgulandı (KargoID={target} - Bulunamadı)")
                     print_complexity('3')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir kargo ID girin!", title="Hata", font=GENEL_FONT)
@@ -503,6 +275,8 @@ class CargoSystem:
     def query_shipment_history(self):
         layout = [
             [sg.Text("Müşteri ID: "), sg.Input(key="cid")],
+            [sg.Text("Başlangıç Tarihi (YYYYMMDD, boş = tümü): "), sg.Input(key="start_date")],
+            [sg.Text("Bitiş Tarihi (YYYYMMDD, boş = tümü): "), sg.Input(key="end_date")],
             [sg.Button("Göster"), sg.Button("Vazgeç")]
         ]
         window = sg.Window("Gönderim Geçmişini Görüntüle", layout, font=GENEL_FONT)
@@ -513,22 +287,47 @@ class CargoSystem:
             if event == "Göster":
                 try:
                     cid = int(values["cid"])
-                    customer = self.customers.find_customer(cid)
-                    if not customer:
+                    start_date = int(values["start_date"]) if values["start_date"].strip() else None
+                    end_date = int(values["end_date"]) if values["end_date"].strip() else None
+                    if self.system.get_customer(cid) is None:
                         sg.popup("Müşteri bulunamadı!", title="Hata", font=GENEL_FONT)
                         break
-                    customer.shipment_history.display()
-                    self.add_history(f"Gönderim geçmişi görüntülendi (MüşteriID={cid})")
+                    self.show_shipment_history(cid, start_date, end_date)
+                    self.system.add_history(f"Gönderim geçmişi görüntülendi (MüşteriID={cid})")
                     print_complexity('4')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir müşteri ID girin!", title="Hata", font=GENEL_FONT)
                 break
         window.close()
 
+    def show_shipment_history(self, cid, start_date=None, end_date=None):
+        """
+        Gönderileri sayfa sayfa gösterir; yalnızca görünen sayfa okunur (O(log n + sayfa boyu))
+        """
+        page, next_cursor = self.system.shipment_history_page(cid, start_date, end_date)
+        if not page:
+            sg.popup("Gönderim geçmişi boş.", title="Gönderim Geçmişi", font=GENEL_FONT)
+            return
+        # Önceki sayfalara dönebilmek için her sayfanın başlangıç cursor'ı saklanır
+        page_cursors = [None]
+
+        def fetch_page(page_no):
+            page, next_cursor = self.system.shipment_history_page(
+                cid, start_date, end_date, HISTORY_PAGE_SIZE, page_cursors[page_no]
+            )
+            del page_cursors[page_no + 1:]
+            if next_cursor is not None:
+                page_cursors.append(next_cursor)
+            lines = [
+                f"Kargo ID: {sh[0]}, Tarih: {sh[1]}, Durum: {sh[2]}, Süre: {sh[3]} gün"
+                for sh in page
+            ]
+            return lines, next_cursor is not None
+
+        show_paged_window("Gönderim Geçmişi", fetch_page)
+
     def list_all_cargos_sorted(self):
-        delivered_sorted = sorted(self.delivered_shipments, key=lambda x: x[0])
-        undelivered_copy = self.undelivered_shipments[:]
-        merge_sort_shipments(undelivered_copy)
+        delivered_sorted, undelivered_copy = self.system.sorted_cargos()
         lines = []
         lines.append("=== Teslim Edilmiş Kargolar (ID'ye göre) ===")
         if not delivered_sorted:
@@ -543,17 +342,96 @@ class CargoSystem:
             for sh in undelivered_copy:
                 lines.append(f"ID: {sh[0]}, Tarih: {sh[1]}, Durum: {sh[2]}, Süre: {sh[3]}")
         sg.popup_scrolled("\n".join(lines), title="Tüm Kargolar", font=GENEL_FONT)
-        self.add_history("Tüm kargolar listelendi.")
+        self.system.add_history("Tüm kargolar listelendi.")
         print_complexity('5')
 
     def show_delivery_routes(self):
-        lines = print_tree(self.root_city)
-        shortest = shortest_route_depth(self.root_city)
-        lines.append(f"\nEn kısa rota derinliği: {shortest}")
-        sg.popup_scrolled("\n".join(lines), title="Teslimat Rotası (Ağaç)", font=GENEL_FONT)
-        self.add_history("Teslimat rotaları görüntülendi.")
+        """
+        Ağacı seçilen şehirden ve derinliğe kadar sayfa sayfa gösterir; yalnızca görünen sayfa
+        kadar satır üretilir, derinlik sınırında kalan şehirlerin yanında alt şehir sayısı yazar.
+        """
+        layout = [
+            [sg.Text("Başlangıç Şehir ID (boş = kök): "), sg.Input(key="root_id")],
+            [sg.Text("Derinlik (boş = tümü): "), sg.Input(key="depth")],
+            [sg.Button("Göster"), sg.Button("Vazgeç")]
+        ]
+        window = sg.Window("Teslimat Rotası (Ağaç)", layout, font=GENEL_FONT)
+        event, values = window.read()
+        window.close()
+        if event in (sg.WINDOW_CLOSED, "Vazgeç"):
+            return
+        try:
+            root_id = int(values["root_id"]) if values["root_id"].strip() else None
+            depth = int(values["depth"]) if values["depth"].strip() else None
+        except ValueError:
+            sg.popup("Lütfen geçerli bir şehir ID ve derinlik girin!", title="Hata", font=GENEL_FONT)
+            return
+        if depth is not None and depth < 0:
+            sg.popup("Derinlik negatif olamaz!", title="Hata", font=GENEL_FONT)
+            return
+        if self.system.route_tree_page(root_id, depth, None, 0, 0) is None:
+            sg.popup("Şehir bulunamadı!", title="Hata", font=GENEL_FONT)
+            return
+
+        def fetch_page(page_no):
+            return self.system.route_tree_page(
+                root_id, depth, None, page_no * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE
+            )
+
+        shortest = self.system.shortest_route()
+        show_paged_window(f"Teslimat Rotası (Ağaç) - En kısa rota derinliği: {shortest}", fetch_page)
+        self.system.add_history("Teslimat rotaları görüntülendi.")
         print_complexity('6')
 
+    def show_route(self):
+        """
+        İki şube arasındaki ya da bir kargonun en kısa süreli rotasını (rota önbelleğinden) ve kargo için
+        tahmini varış tarihini gösterir.
+        """
+        layout = [
+            [sg.Text("Kargo ID: "), sg.Input(key="shipment_id")],
+            [sg.Text("ya da")],
+            [sg.Text("Çıkış şubesi ID: "), sg.Input(key="source_id")],
+            [sg.Text("Varış şubesi ID: "), sg.Input(key="target_id")],
+            [sg.Button("Göster"), sg.Button("Vazgeç")]
+        ]
+        window = sg.Window("Rota ve Tahmini Varış", layout, font=GENEL_FONT)
+        while True:
+            event, values = window.read()
+            if event in (sg.WINDOW_CLOSED, "Vazgeç"):
+                break
+            if event == "Göster":
+                try:
+                    eta = None
+                    if values["shipment_id"].strip():
+                        shipment_id = int(values["shipment_id"])
+                        result = self.system.shipment_eta(shipment_id)
+                        if result is not None:
+                            eta, hours, path = result
+                        subject = f"KargoID={shipment_id}"
+                    else:
+                        source_id = int(values["source_id"])
+                        target_id = int(values["target_id"])
+                        result = self.system.route_between(source_id, target_id)
+                        if result is not None:
+                            hours, path = result
+                        subject = f"{source_id}->{target_id}"
+                except ValueError:
+                    sg.popup("Lütfen geçerli değerler giriniz!", title="Hata", font=GENEL_FONT)
+                    break
+                if result is None:
+                    sg.popup("Rota bulunamadı (kargo/şube yok, rota girilmemiş ya da yol yok).",
+                             title="Bilgi", font=GENEL_FONT)
+                else:
+                    lines = [" -> ".join(name for _, name in path), f"Toplam süre: {hours:g} saat"]
+                    if eta is not None:
+                        lines.append(f"Tahmini varış: {eta}")
+                    sg.popup("\n".join(lines), title="Rota", font=GENEL_FONT)
+                self.system.add_history(f"Rota sorgulandı ({subject})")
+                print_complexity('26')
+                break
+        window.close()
+
     def query_last_five_shipments(self):
         layout = [
             [sg.Text("Müşteri ID: "), sg.Input(key="cid")],
@@ -567,12 +445,23 @@ class CargoSystem:
             if event == "Göster":
                 try:
                     cid = int(values["cid"])
-                    customer = self.customers.find_customer(cid)
-                    if not customer:
+                    shipments = self.system.last_shipments(cid)
+                    if shipments is None:
                         sg.popup("Müşteri bulunamadı!", title="Hata", font=GENEL_FONT)
                         break
-                    customer.display_last_shipments()
-                    self.add_history(f"Son 5 gönderi görüntülendi (MüşteriID={cid})")
+                    if not shipments:
+                        sg.popup(
+                            "Bu müşterinin gönderim geçmişi boş.",
+                            title="Son Gönderiler",
+                            font=GENEL_FONT
+                        )
+                    else:
+                        lines = [
+                            f"Kargo ID: {sh[0]}, Tarih: {sh[1]}, Durum: {sh[2]}, Süre: {sh[3]}"
+                            for sh in shipments
+                        ]
+                        sg.popup_scrolled("\n".join(lines), title="Son Gönderiler", font=GENEL_FONT)
+                    self.system.add_history(f"Son 5 gönderi görüntülendi (MüşteriID={cid})")
                     print_complexity('7')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir ID girin!", title="Hata", font=GENEL_FONT)
@@ -580,8 +469,13 @@ class CargoSystem:
         window.close()
 
     def show_priority_queue(self):
-        self.priority_queue.display_all()
-        self.add_history("Öncelikli kargolar (PQ) görüntülendi.")
+        items = self.system.priority_cargos()
+        if not items:
+            sg.popup("Öncelikli kargo bulunmuyor.", title="Priority Queue", font=GENEL_FONT)
+        else:
+            lines = [f"Kargo ID: {item[1]}, Süre: {item[0]} gün, Durum: {item[2]}" for item in items]
+            sg.popup_scrolled("\n".join(lines), title="Priority Queue", font=GENEL_FONT)
+        self.system.add_history("Öncelikli kargolar (PQ) görüntülendi.")
         print_complexity('8')
 
     def remove_customer_by_id(self):
@@ -597,8 +491,11 @@ class CargoSystem:
             if event == "Sil":
                 try:
                     cid = int(values["cid"])
-                    self.customers.remove_customer(cid)
-                    self.add_history(f"Müşteri silindi (ID={cid})")
+                    if not self.system.delete_customer(cid):
+                        sg.popup("Müşteri bulunamadı, silinemedi.", title="Hata", font=GENEL_FONT)
+                        break
+                    sg.popup(f"Müşteri {cid} silindi.", title="Silme Başarılı", font=GENEL_FONT)
+                    self.system.add_history(f"Müşteri silindi (ID={cid})")
                     print_complexity('9')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir müşteri ID girin!", title="Hata", font=GENEL_FONT)
@@ -618,16 +515,10 @@ class CargoSystem:
             if event == "Teslim Et":
                 try:
                     shipment_id = int(values["shipment_id"])
-                    index = -1
-                    for i, sh in enumerate(self.undelivered_shipments):
-                        if sh[0] == shipment_id:
-                            index = i
-                            break
-                    if index == -1:
+                    delivered, removed = self.system.deliver_shipment(shipment_id)
+                    if delivered is None:
                         sg.popup("Bu ID ile teslim edilmemiş kargo bulunamadı.", title="Hata", font=GENEL_FONT)
                         break
-                    sh = self.undelivered_shipments.pop(index)
-                    removed = self.priority_queue.remove_cargo_by_id(shipment_id)
                     if not removed:
                         sg.popup(
                             "Kargo öncelik kuyruğunda bulunamadı,\n"
@@ -635,21 +526,105 @@ class CargoSystem:
                             title="Bilgi",
                             font=GENEL_FONT
                         )
-                    new_sh = (sh[0], sh[1], "Teslim Edildi", sh[3])
-                    self.delivered_shipments.append(new_sh)
                     sg.popup(f"Kargo {shipment_id} teslim edildi.", title="Başarılı", font=GENEL_FONT)
-                    self.add_history(f"Kargo teslim edildi (KargoID={shipment_id})")
+                    self.system.add_history(f"Kargo teslim edildi (KargoID={shipment_id})")
                     print_complexity('10')
                 except ValueError:
                     sg.popup("Lütfen geçerli bir kargo ID girin!", title="Hata", font=GENEL_FONT)
                 break
         window.close()
 
+    def deliver_cargo_batch(self):
+        """
+        Kuryenin gün sonu tarama dosyasındaki (her satırda bir kargo ID)
+        kargoları toplu olarak teslim eder.
+        """
+        path = sg.popup_get_file(
+            "Tarama dosyasını seçin (her satırda bir kargo ID):",
+            title="Toplu Teslimat",
+            font=GENEL_FONT
+        )
+        if not path:
+            return
+        ids = []
+        invalid = []
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        ids.append(int(line))
+                    except ValueError:
+                        invalid.append(line)
+        except OSError:
+            sg.popup("Dosya okunamadı!", title="Hata", font=GENEL_FONT)
+            return
+        delivered, failed = self.system.deliver_shipments_batch(ids)
+        lines = [f"{len(delivered)} kargo teslim edildi."]
+        if failed or invalid:
+            lines.append("\n=== Teslim Edilemeyenler ===")
+            for shipment_id, reason in failed.items():
+                lines.append(f"Kargo ID: {shipment_id} - {reason}")
+            for line in invalid:
+                lines.append(f"Satır: {line} - Geçersiz kargo ID")
+        sg.popup_scrolled("\n".join(lines), title="Toplu Teslimat", font=GENEL_FONT)
+        self.system.add_history(f"Toplu teslimat yapıldı (Teslim={len(delivered)}, Hatalı={len(failed) + len(invalid)})")
+        print_complexity('22')
+
+    def bulk_load_shipments(self):
+        """
+        CSV/JSONL dosyasından toplu kargo yükler ve yükleme hızını raporlar.
+        """
+        path = sg.popup_get_file(
+            "Kargo dosyasını seçin (CSV veya JSONL):",
+            title="Toplu Kargo Yükle",
+            font=GENEL_FONT
+        )
+        if not path:
+            return
+        try:
+            stats = self.system.load_shipments_from_file(path)
+        except OSError:
+            sg.popup("Dosya okunamadı!", title="Hata", font=GENEL_FONT)
+            return
+        lines = [
+            f"Yüklenen: {stats['loaded']}",
+            f"Reddedilen: {stats['rejected']}",
+            f"Süre: {stats['seconds']:.2f} sn",
+            f"Hız: {stats['rows_per_sec']:.0f} satır/sn",
+        ]
+        if stats["errors"]:
+            lines.append("\n=== Hatalı Satırlar (ilk kayıtlar) ===")
+            lines.extend(stats["errors"])
+        sg.popup_scrolled("\n".join(lines), title="Toplu Kargo Yükle", font=GENEL_FONT)
+        self.system.add_history(f"Toplu kargo yüklendi (Yüklenen={stats['loaded']}, Reddedilen={stats['rejected']})")
+        print_complexity('23')
+
+    def show_storage_stats(self):
+        """
+        Operasyon log'unun yazma hızını ve p99 commit gecikmesini gösterir.
+        """
+        stats = self.system.storage_stats()
+        if stats is None:
+            sg.popup("Kalıcı depolama bağlı değil.", title="Bilgi", font=GENEL_FONT)
+            return
+        sg.popup(
+            f"Yazılan kayıt: {stats['records']}\n"
+            f"fsync sayısı: {stats['fsyncs']}\n"
+            f"Hız: {stats['records_per_sec']:.1f} kayıt/sn\n"
+            f"p99 commit gecikmesi: {stats['p99_commit_ms']:.2f} ms",
+            title="Depolama İstatistikleri",
+            font=GENEL_FONT
+        )
+
     def add_city(self):
         layout = [
             [sg.Text("Hangi şehir ID'nin altına eklenecek? "), sg.Input(key="parent_id")],
             [sg.Text("Yeni şehrin ID: "), sg.Input(key="new_id")],
             [sg.Text("Yeni şehrin adı: "), sg.Input(key="new_name")],
+            [sg.Text("Ebeveyn şehre uzaklık (saat): "), sg.Input(str(DEFAULT_ROUTE_HOURS), key="hours")],
             [sg.Button("Ekle"), sg.Button("Vazgeç")]
         ]
         window = sg.Window("Yeni Şehir Ekle", layout, font=GENEL_FONT)
@@ -662,16 +637,20 @@ class CargoSystem:
                     parent_id = int(values["parent_id"])
                     new_id = int(values["new_id"])
                     new_name = values["new_name"]
-                    parent_node = self.find_city_by_id(self.root_city, parent_id)
-                    if parent_node:
-                        new_node = CityNode(new_id, new_name)
-                        parent_node.add_child(new_node)
+                    hours = float(values["hours"])
+                    if not is_route_hours(hours):
+                        raise ValueError
+                    if self.system.get_city(new_id) is not None:
+                        sg.popup("Bu ID'ye sahip şehir zaten var!", title="Hata", font=GENEL_FONT)
+                        break
+                    parent_name = self.system.insert_city(parent_id, new_id, new_name, hours)
+                    if parent_name is not None:
                         sg.popup(
-                            f"{new_name} şehri {parent_node.city_name} altına eklendi.",
+                            f"{new_name} şehri {parent_name} altına eklendi.",
                             title="Başarılı",
                             font=GENEL_FONT
                         )
-                        self.add_history(f"Yeni şehir eklendi (ParentID={parent_id}, CityID={new_id}, Name={new_name})")
+                        self.system.add_history(f"Yeni şehir eklendi (ParentID={parent_id}, CityID={new_id}, Name={new_name})")
                     else:
                         sg.popup("Belirtilen ID'ye sahip şehir bulunamadı.", title="Hata", font=GENEL_FONT)
                     print_complexity('11')
@@ -680,54 +659,91 @@ class CargoSystem:
                 break
         window.close()
 
-    def find_city_by_id(self, root, city_id):
-        """
-        BFS ile ağaçta city_id değerini arar ve bulursa döndürür (O(n))
-        """
-        q = deque([root])
-        while q:
-            node = q.popleft()
-            if node.city_id == city_id:
-                return node
-            for c in node.children:
-                q.append(c)
-        return None
-
     def find_longest_delivery_time_delivered(self):
-        if not self.delivered_shipments:
+        max_cargo = self.system.longest_delivered()
+        if max_cargo is None:
             sg.popup("Hiç teslim edilmiş kargo yok.", title="Bilgi", font=GENEL_FONT)
             print_complexity('12')
             return
-        max_cargo = max(self.delivered_shipments, key=lambda x: x[3])
         sg.popup(
             f"En uzun teslim süresine sahip teslim edilmiş kargo:\n\n"
             f"ID: {max_cargo[0]}, Tarih: {max_cargo[1]}, Durum: {max_cargo[2]}, Süre: {max_cargo[3]} gün",
             title="Sonuç",
             font=GENEL_FONT
         )
-        self.add_history(f"En uzun teslim süreli kargo görüntülendi (KargoID={max_cargo[0]})")
+        self.system.add_history(f"En uzun teslim süreli kargo görüntülendi (KargoID={max_cargo[0]})")
         print_complexity('12')
 
+    def show_top_deliveries(self):
+        """
+        En uzun ya da en kısa teslim süreli K teslim edilmiş kargoyu sıralı gösterir.
+        """
+        layout = [
+            [sg.Text("Kaç kargo listelensin (K): "), sg.Input("10", key="k")],
+            [sg.Radio("En uzun", "order", default=True, key="slowest"), sg.Radio("En kısa", "order", key="fastest")],
+            [sg.Button("Göster"), sg.Button("Vazgeç")]
+        ]
+        window = sg.Window("En Uzun/En Kısa Teslimatlar", layout, font=GENEL_FONT)
+        while True:
+            event, values = window.read()
+            if event in (sg.WINDOW_CLOSED, "Vazgeç"):
+                break
+            if event == "Göster":
+                try:
+                    k = int(values["k"])
+                    if k <= 0:
+                        raise ValueError
+                except ValueError:
+                    sg.popup("Lütfen pozitif bir sayı girin!", title="Hata", font=GENEL_FONT)
+                    break
+                slowest = bool(values["slowest"])
+                top = self.system.top_deliveries(k, slowest)
+                label = "En uzun" if slowest else "En kısa"
+                if not top:
+                    sg.popup("Hiç teslim edilmiş kargo yok.", title="Bilgi", font=GENEL_FONT)
+                else:
+                    lines = [
+                        f"{rank}. ID: {sh[0]}, Tarih: {sh[1]}, Süre: {sh[3]} gün"
+                        for rank, sh in enumerate(top, start=1)
+                    ]
+                    sg.popup_scrolled("\n".join(lines), title=f"{label} {k} Teslimat", font=GENEL_FONT)
+                self.system.add_history(f"{label} teslim süreli kargolar listelendi (K={k})")
+                print_complexity('25')
+                break
+        window.close()
+
     def list_customers_by_name(self):
-        cust_list = self.customers.get_all_customers()
-        cust_list.sort(key=lambda c: c.name)
-        if not cust_list:
+        """
+        Müşterileri Türkçe alfabetik sırayla sayfa sayfa gösterir; sıralı index hazır
+        tutulduğu için yalnızca görünen sayfa okunur (O(log n + sayfa boyu))
+        """
+        page, next_cursor = self.system.customers_by_name_page(HISTORY_PAGE_SIZE)
+        if not page:
             sg.popup("Hiç müşteri bulunmuyor.", title="Bilgi", font=GENEL_FONT)
             return
-        lines = []
-        for c in cust_list:
-            lines.append(f"Müşteri ID: {c.customer_id}, İsim: {c.name} {c.surname}")
-        sg.popup_scrolled(
-            "\n".join(lines),
-            title="Müşteriler (İsim Sırasına Göre)",
-            font=GENEL_FONT
-        )
-        self.add_history("Müşteriler isim sırasına göre listelendi.")
+        page_cursors = [None]
+
+        def fetch_page(page_no):
+            page, next_cursor = self.system.customers_by_name_page(
+                HISTORY_PAGE_SIZE, page_cursors[page_no]
+            )
+            del page_cursors[page_no + 1:]
+            if next_cursor is not None:
+                page_cursors.append(next_cursor)
+            lines = [
+                f"Müşteri ID: {customer_id}, İsim: {name} {surname}"
+                for customer_id, name, surname in page
+            ]
+            return lines, next_cursor is not None
+
+        show_paged_window("Müşteriler (İsim Sırasına Göre)", fetch_page)
+        self.system.add_history("Müşteriler isim sırasına göre listelendi.")
         print_complexity('13')
 
     def search_customer_by_name(self):
         layout = [
-            [sg.Text("Aradığınız müşteri ismi: "), sg.Input(key="name")],
+            [sg.Text("Aradığınız müşteri adı/soyadı (baş harfleri de olur): "), sg.Input(key="name")],
+            [sg.Checkbox("Yazım hatalarını tolere et", default=True, key="fuzzy")],
             [sg.Button("Ara"), sg.Button("Vazgeç")]
         ]
         window = sg.Window("Müşteri İsmi ile Ara", layout, font=GENEL_FONT)
@@ -737,65 +753,62 @@ class CargoSystem:
                 break
             if event == "Ara":
                 name = values["name"]
-                current = self.customers.head
-                found_any = False
-                lines = []
-                while current:
-                    if current.name == name:
-                        lines.append(
-                            f"Müşteri ID: {current.customer_id}, "
-                            f"İsim: {current.name} {current.surname}"
-                        )
-                        found_any = True
-                    current = current.next
-                if not found_any:
+                lines = [
+                    f"Müşteri ID: {customer_id}, İsim: {c_name} {surname}"
+                    for customer_id, c_name, surname in self.system.search_customers(name, fuzzy=bool(values["fuzzy"]))
+                ]
+                if not lines:
                     sg.popup("Bu isimde müşteri bulunamadı.", title="Sonuç", font=GENEL_FONT)
-                    self.add_history(f"Müşteri ismine göre arama (Name={name}) - Bulunamadı")
+                    self.system.add_history(f"Müşteri ismine göre arama (Name={name}) - Bulunamadı")
                 else:
                     sg.popup_scrolled("\n".join(lines), title="Sonuç", font=GENEL_FONT)
-                    self.add_history(f"Müşteri ismine göre arama (Name={name}) - Bulundu")
+                    self.system.add_history(f"Müşteri ismine göre arama (Name={name}) - Bulundu")
                 print_complexity('14')
                 break
         window.close()
 
     def check_undelivered_cargo_count(self):
-        count = len(self.undelivered_shipments)
+        count = self.system.stats()["undelivered"]
         sg.popup(f"Toplam {count} adet teslim edilmemiş kargo var.", title="Bilgi", font=GENEL_FONT)
-        self.add_history(f"Teslim edilmemiş kargo sayısı sorgulandı (Count={count})")
+        self.system.add_history(f"Teslim edilmemiş kargo sayısı sorgulandı (Count={count})")
         print_complexity('15')
 
     def total_shipment_count(self):
-        total = len(self.delivered_shipments) + len(self.undelivered_shipments)
-        sg.popup(f"Sistemde toplam {total} adet kargo kaydı mevcut.", title="Bilgi", font=GENEL_FONT)
-        self.add_history(f"Toplam kargo sayısı sorgulandı (Toplam={total})")
+        total = self.system.stats()["total"]
+        counts = self.system.state_counts()
+        detail = "\n".join(f"{label}: {count}" for label, count in counts.items())
+        sg.popup(f"Sistemde toplam {total} adet kargo kaydı mevcut.\n\n{detail}", title="Bilgi", font=GENEL_FONT)
+        self.system.add_history(f"Toplam kargo sayısı sorgulandı (Toplam={total})")
         print_complexity('16')
 
     def average_delivery_time(self):
-        if not self.delivered_shipments:
+        stats = self.system.stats()
+        avg_time = stats["average_delivery_time"]
+        if avg_time is None:
             sg.popup("Henüz teslim edilmiş kargo yok, ortalama süre hesaplanamıyor.", title="Bilgi", font=GENEL_FONT)
             print_complexity('17')
             return
-        total_time = 0
-        for sh in self.delivered_shipments:
-            total_time += sh[3]
-        avg_time = total_time / len(self.delivered_shipments)
-        sg.popup(f"Teslim edilmiş kargoların ortalama teslim süresi: {avg_time:.2f} gün", title="Bilgi", font=GENEL_FONT)
-        self.add_history(f"Ortalama teslim süresi hesaplandı (Süre={avg_time:.2f})")
+        sg.popup(
+            f"Teslim edilmiş kargoların ortalama teslim süresi: {avg_time:.2f} gün\n\n"
+            f"En kısa: {stats['min_delivery_time']} gün, En uzun: {stats['max_delivery_time']} gün\n"
+            f"p50: {stats['p50_delivery_time']} gün, p95: {stats['p95_delivery_time']} gün, "
+            f"p99: {stats['p99_delivery_time']} gün",
+            title="Bilgi",
+            font=GENEL_FONT
+        )
+        self.system.add_history(f"Ortalama teslim süresi hesaplandı (Süre={avg_time:.2f})")
         print_complexity('17')
 
     def get_customer_count(self):
-        customers = self.customers.get_all_customers()
-        sg.popup(f"Sistemde toplam {len(customers)} müşteri bulunmaktadır.", title="Bilgi", font=GENEL_FONT)
-        self.add_history(f"Müşteri sayısı sorgulandı (Toplam={len(customers)})")
+        count = self.system.stats()["customers"]
+        sg.popup(f"Sistemde toplam {count} müşteri bulunmaktadır.", title="Bilgi", font=GENEL_FONT)
+        self.system.add_history(f"Müşteri sayısı sorgulandı (Toplam={count})")
         print_complexity('18')
 
     def clear_undelivered_shipments(self):
-        count = len(self.undelivered_shipments)
-        for sh in self.undelivered_shipments:
-            _ = self.priority_queue.remove_cargo_by_id(sh[0])
-        self.undelivered_shipments.clear()
+        count = self.system.drop_undelivered_shipments()
         sg.popup(f"Tüm teslim edilmemiş {count} kargo silindi.", title="Bilgi", font=GENEL_FONT)
-        self.add_history(f"Tüm teslim edilmemiş kargolar silindi (Sayı={count})")
+        self.system.add_history(f"Tüm teslim edilmemiş kargolar silindi (Sayı={count})")
         print_complexity('19')
 
 ##############################################################################
@@ -805,6 +818,9 @@ class CargoSystem:
 def gui_main():
     sg.set_options(font=GENEL_FONT)
     system = CargoSystem()
+    store = CargoStore(DATA_DIR)
+    store.load(system)
+    app = CargoApp(system)
 
     menu_def = [
         [
@@ -830,7 +846,12 @@ def gui_main():
                 '18. Toplam müşteri sayısını göster',
                 '19. Tüm teslim edilmemiş kargoları sil',
                 '20. Çıkış',
-                '21. İşlem Geçmişi'
+                '21. İşlem Geçmişi',
+                '22. Toplu teslimat (tarama dosyasından)',
+                '23. Toplu kargo yükle (CSV/JSONL)',
+                '24. Depolama istatistikleri',
+                '25. En uzun/en kısa K teslimat',
+                '26. Rota ve tahmini varış sorgula'
             ]
         ]
     ]
@@ -868,48 +889,60 @@ def gui_main():
         if event in (None, 'Exit'):
             break
         if event == '1. Yeni müşteri ekle':
-            system.add_customer()
+            app.add_customer()
         elif event == '2. Kargo gönderimi ekle':
-            system.add_shipment_to_customer()
+            app.add_shipment_to_customer()
         elif event == '3. Kargo durumu sorgula':
-            system.search_delivered_cargo_by_id()
+            app.search_delivered_cargo_by_id()
         elif event == '4. Gönderim geçmişini görüntüle':
-            system.query_shipment_history()
+            app.query_shipment_history()
         elif event == '5. Tüm kargoları listele':
-            system.list_all_cargos_sorted()
+            app.list_all_cargos_sorted()
         elif event == '6. Teslimat rotalarını göster':
-            system.show_delivery_routes()
+            app.show_delivery_routes()
         elif event == '7. Bir müşterinin son 5 gönderisini göster':
-            system.query_last_five_shipments()
+            app.query_last_five_shipments()
         elif event == '8. Öncelikli kargoları görüntüle':
-            system.show_priority_queue()
+            app.show_priority_queue()
         elif event == '9. Müşteri sil':
-            system.remove_customer_by_id()
+            app.remove_customer_by_id()
         elif event == '10. Kargoyu Teslim Et (ID ile)':
-            system.deliver_cargo()
+            app.deliver_cargo()
         elif event == '11. Ağaç yapısına yeni şehir ekle':
-            system.add_city()
+            app.add_city()
         elif event == '12. En uzun teslim süreli teslim edilmiş kargoyu göster':
-            system.find_longest_delivery_time_delivered()
+            app.find_longest_delivery_time_delivered()
         elif event == '13. Müşterileri isim sırasına göre listele':
-            system.list_customers_by_name()
+            app.list_customers_by_name()
         elif event == '14. Müşteri ismine göre ara':
-            system.search_customer_by_name()
+            app.search_customer_by_name()
         elif event == '15. Teslim edilmemiş kargo sayısını göster':
-            system.check_undelivered_cargo_count()
+            app.check_undelivered_cargo_count()
         elif event == '16. Toplam kargo sayısını göster':
-            system.total_shipment_count()
+            app.total_shipment_count()
         elif event == '17. Teslim edilmiş kargoların ortalama teslim süresini göster':
-            system.average_delivery_time()
+            app.average_delivery_time()
         elif event == '18. Toplam müşteri sayısını göster':
-            system.get_customer_count()
+            app.get_customer_count()
         elif event == '19. Tüm teslim edilmemiş kargoları sil':
-            system.clear_undelivered_shipments()
+            app.clear_undelivered_shipments()
         elif event == '20. Çıkış':
             break
         elif event == '21. İşlem Geçmişi':
-            system.show_history()
+            app.show_history()
+        elif event == '22. Toplu teslimat (tarama dosyasından)':
+            app.deliver_cargo_batch()
+        elif event == '23. Toplu kargo yükle (CSV/JSONL)':
+            app.bulk_load_shipments()
+        elif event == '24. Depolama istatistikleri':
+            app.show_storage_stats()
+        elif event == '25. En uzun/en kısa K teslimat':
+            app.show_top_deliveries()
+        elif event == '26. Rota ve tahmini varış sorgula':
+            app.show_route()
     window.close()
+    store.checkpoint(system)
+    store.close()
 
 if __name__ == "__main__":
     gui_main()